@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: vectorized column formatting vs per-row Series.apply.
+Runs on a synthetic 1000-row listing shaped like crypto_listings_latest_1000.
+
+Usage: python scripts/dev/benchmark_formatting.py [rows] [repeats]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+from content.formatting import (
+    LARGE_UNIT_BUCKETS, format_usd_units, percent_series, usd_series, usd_units_series
+)
+
+
+def make_listing(rows=1000, seed=7):
+    """Build a listing with market caps spanning every unit bucket and some NULLs."""
+    rng = np.random.default_rng(seed)
+    listing = pd.DataFrame({
+        'price': 10 ** rng.uniform(-4, 5, rows),
+        'market_cap': 10 ** rng.uniform(5, 12.3, rows),
+        'percent_change24h': rng.normal(0, 5, rows),
+    })
+    listing.loc[listing.sample(frac=0.02, random_state=seed).index, 'market_cap'] = np.nan
+    return listing
+
+
+def apply_formatting(listing):
+    """The per-row formatting the scripts used before (Series.apply with lambdas)."""
+    return pd.DataFrame({
+        'market_cap': listing['market_cap'].apply(
+            lambda x: format_usd_units(x, buckets=LARGE_UNIT_BUCKETS)),
+        'price': listing['price'].apply(lambda x: f"${x:.2f}" if not pd.isnull(x) else "N/A"),
+        'percent_change24h': listing['percent_change24h'].apply(
+            lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A"),
+    })
+
+
+def vectorized_formatting(listing):
+    """The same output through the vectorized column formatters."""
+    return pd.DataFrame({
+        'market_cap': usd_units_series(listing['market_cap'], buckets=LARGE_UNIT_BUCKETS),
+        'price': usd_series(listing['price']),
+        'percent_change24h': percent_series(listing['percent_change24h']),
+    })
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    listing = make_listing(rows)
+
+    pd.testing.assert_frame_equal(apply_formatting(listing), vectorized_formatting(listing))
+
+    apply_time = min(timeit.repeat(lambda: apply_formatting(listing), number=1, repeat=repeats))
+    vector_time = min(timeit.repeat(lambda: vectorized_formatting(listing), number=1, repeat=repeats))
+
+    print(f"Formatting {rows} rows x 3 columns (best of {repeats})")
+    print(f"  Series.apply : {apply_time * 1000:8.2f} ms")
+    print(f"  vectorized   : {vector_time * 1000:8.2f} ms")
+    print(f"  speedup      : {apply_time / vector_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
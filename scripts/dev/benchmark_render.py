@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: carousel screenshots at the old 2160x2700 full-size settings
+vs the right-sized carousel render profile (1080x1350 by default).
+Renders the sample slides committed in output_html/ with one shared browser
+and reports render time, file size and image size per setting.
+
+Needs Playwright's Chromium (playwright install chromium).
+
+Usage: python scripts/dev/benchmark_render.py [repeats] [glob]
+"""
+import asyncio
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+from media.browser_pool import browser_session
+from media.render_profiles import CAROUSEL_PROFILE, TEMPLATE_LAYOUTS, RenderProfile, get_render_profile
+from media.screenshot import generate_image_from_html
+
+OUTPUT_HTML_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'output_html')
+
+# The settings every slide used before render profiles: 2160x2700 at scale 1, JPEG quality 95
+LEGACY_PROFILE = RenderProfile('legacy', *TEMPLATE_LAYOUTS[CAROUSEL_PROFILE], output_width=2160, quality=95)
+
+
+async def render_all(profile, html_files, repeats, out_dir):
+    """Render every slide `repeats` times; return per-render seconds, file sizes and the image size."""
+    timings, sizes = [], []
+    image_path = None
+    async with browser_session():
+        # Warm up the browser so launch time is not counted
+        await generate_image_from_html(html_files[0], os.path.join(out_dir, 'warmup.jpg'), profile=profile)
+        for _ in range(repeats):
+            for index, html_file in enumerate(html_files):
+                image_path = os.path.join(out_dir, f"{profile.name}_{index}.jpg")
+                start = time.perf_counter()
+                await generate_image_from_html(html_file, image_path, profile=profile)
+                timings.append(time.perf_counter() - start)
+                sizes.append(os.path.getsize(image_path))
+    with Image.open(image_path) as image:
+        return timings, sizes, image.size
+
+
+async def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pattern = sys.argv[2] if len(sys.argv) > 2 else os.path.join(OUTPUT_HTML_DIR, '[01][0-9]_*_output.html')
+    html_files = sorted(glob.glob(pattern))
+    if not html_files:
+        print(f"No HTML files match {pattern}")
+        return 1
+
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for profile in (LEGACY_PROFILE, get_render_profile(CAROUSEL_PROFILE)):
+            results[profile.name] = await render_all(profile, html_files, repeats, out_dir)
+
+    print(f"\nRendering {len(html_files)} slides x {repeats} (browser warm, one context per render)")
+    for name, (timings, sizes, (width, height)) in results.items():
+        print(f"  {name:9s}: {width}x{height}  "
+              f"{statistics.median(timings) * 1000:7.1f} ms/slide (median)  "
+              f"{statistics.mean(sizes) / 1024:7.1f} KiB/slide")
+
+    legacy, profiled = results['legacy'], results[CAROUSEL_PROFILE]
+    print(f"  speedup   : {statistics.median(legacy[0]) / statistics.median(profiled[0]):.2f}x render time, "
+          f"{statistics.mean(legacy[1]) / statistics.mean(profiled[1]):.2f}x smaller files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: vectorized DMV signal counting vs per-row apply.
+Runs on a synthetic table shaped like FE_DMV_ALL (one row per listed coin,
+identifier columns plus -1/0/1 signal columns with some NULLs).
+
+Usage: python scripts/dev/benchmark_signals.py [rows] [signals] [repeats]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+from data.signals import count_signals, signal_columns
+
+
+def make_dmv_all(rows=1000, signals=45, seed=7):
+    """Build a FE_DMV_ALL-like frame with float signal columns (NULLs make them float)."""
+    rng = np.random.default_rng(seed)
+    scores = rng.choice([-1.0, 0.0, 1.0], size=(rows, signals))
+    scores[rng.random((rows, signals)) < 0.03] = np.nan
+    dmv_all = pd.DataFrame(scores, columns=[f"signal_{i}" for i in range(signals)])
+    dmv_all.insert(0, 'id', np.arange(1, rows + 1))
+    dmv_all.insert(1, 'slug', [f"coin-{i}" for i in range(rows)])
+    dmv_all.insert(2, 'name', [f"Coin {i}" for i in range(rows)])
+    return dmv_all
+
+
+def apply_counting(dmv_all, columns):
+    """The previous approach: three row-wise apply passes plus a row-wise classifier."""
+    signals = dmv_all[columns]
+    result = pd.DataFrame({
+        'bullish_count': signals.apply(lambda row: row.tolist().count(1), axis=1),
+        'bearish_count': signals.apply(lambda row: row.tolist().count(-1), axis=1),
+        'neutral_count': signals.apply(lambda row: row.tolist().count(0), axis=1),
+    })
+
+    def classify_sentiment(row):
+        if row['bullish_count'] > row['bearish_count']:
+            return 'Bullish'
+        elif row['bearish_count'] > row['bullish_count']:
+            return 'Bearish'
+        return 'Neutral'
+
+    result['sentiment'] = result.apply(classify_sentiment, axis=1)
+    return result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    signals = int(sys.argv[2]) if len(sys.argv) > 2 else 45
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    dmv_all = make_dmv_all(rows, signals)
+    columns = signal_columns(dmv_all)
+
+    pd.testing.assert_frame_equal(apply_counting(dmv_all, columns), count_signals(dmv_all), check_dtype=False)
+
+    apply_time = min(timeit.repeat(lambda: apply_counting(dmv_all, columns), number=1, repeat=repeats))
+    vector_time = min(timeit.repeat(lambda: count_signals(dmv_all), number=1, repeat=repeats))
+
+    print(f"Counting signals on {rows} rows x {signals} signal columns (best of {repeats})")
+    print(f"  row-wise apply : {apply_time * 1000:8.2f} ms")
+    print(f"  vectorized     : {vector_time * 1000:8.2f} ms")
+    print(f"  speedup        : {apply_time / vector_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Dump the remote source tables into a local SQLite fixture.
+
+Run against the real database once, then set DB_FIXTURE_PATH to the output
+file to run or profile the carousel pipeline fully offline.
+
+Usage: python scripts/dev/dump_db_fixture.py [output_path] [ohlcv_days]
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+from data.engine import build_engine
+from data.fixture_db import DEFAULT_OHLCV_DAYS, dump_fixture
+from src.config import DatabaseConfig
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'fixture.sqlite')
+
+
+def main():
+    output_path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT)
+    ohlcv_days = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_OHLCV_DAYS
+
+    # Always dump from the remote host, even if DB_FIXTURE_PATH is set in the environment
+    source_config = DatabaseConfig(fixture_path='')
+    source_engine = build_engine(source_config)
+    print(f"🔌 Dumping from {source_config.host}/{source_config.database} to {output_path}")
+
+    try:
+        counts = dump_fixture(source_engine, output_path, ohlcv_days=ohlcv_days)
+    finally:
+        source_engine.dispose()
+
+    print(f"✅ Dumped {sum(counts.values())} rows from {len(counts)} tables")
+    print(f"   export DB_FIXTURE_PATH={output_path}")
+
+
+if __name__ == "__main__":
+    main()
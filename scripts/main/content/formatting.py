@@ -0,0 +1,130 @@
+"""Display formatting for numeric market data.
+
+Fetchers return numeric (float64/int) columns; turning them into strings such
+as "$1.23 T" happens only at render time through the Jinja filters registered
+by register_filters(). Whole columns are formatted with the *_series
+functions: unit buckets and divisors are chosen for the whole array with
+np.select, then the batch is formatted from a plain float list in one pass,
+avoiding the per-row Series.apply overhead.
+"""
+
+import numpy as np
+import pandas as pd
+
+# (threshold, divisor, suffix) from largest to smallest unit
+UNIT_BUCKETS = (
+    (1e12, 1e12, 'T'),
+    (1e9, 1e9, 'B'),
+    (1e6, 1e6, 'M'),
+    (1e3, 1e3, 'K'),
+)
+# Buckets without thousands, as used for market caps in Google Sheets
+LARGE_UNIT_BUCKETS = UNIT_BUCKETS[:3]
+
+MISSING = "N/A"
+
+
+def _to_float(value):
+    """Convert a value to float, or None when it is missing or not numeric."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isnull(number) else number
+
+
+def format_number(value, decimals=2, signed=False):
+    """Format a number with fixed decimals, e.g. 2.345 -> '2.35' ('+2.35' if signed)."""
+    number = _to_float(value)
+    if number is None:
+        return MISSING
+    return f"{number:{'+' if signed else ''}.{decimals}f}"
+
+
+def format_percent(value, decimals=2):
+    """Format a percentage, e.g. 2.345 -> '2.35%'."""
+    number = _to_float(value)
+    if number is None:
+        return MISSING
+    return f"{number:.{decimals}f}%"
+
+
+def format_usd(value, decimals=2):
+    """Format a price in dollars, e.g. 50000.123 -> '$50000.12'."""
+    number = _to_float(value)
+    if number is None:
+        return MISSING
+    return f"${number:.{decimals}f}"
+
+
+def format_usd_units(value, decimals=2, prefix="$", buckets=UNIT_BUCKETS):
+    """Format a large amount with a unit suffix, e.g. 1.23e12 -> '$1.23 T'."""
+    number = _to_float(value)
+    if number is None:
+        return MISSING
+
+    for threshold, divisor, suffix in buckets:
+        if number >= threshold:
+            return f"{prefix}{number / divisor:.{decimals}f} {suffix}"
+    return f"{prefix}{number:.{decimals}f}"
+
+
+def _to_array(values):
+    """Coerce a column to a float64 array (non-numeric -> NaN), keeping its index."""
+    numbers = pd.to_numeric(pd.Series(values), errors='coerce')
+    return numbers.index, numbers.to_numpy(dtype='float64')
+
+
+def _finish(index, text, array, missing):
+    """Wrap formatted strings in a Series, putting the missing marker on NaN rows."""
+    missing_rows = np.isnan(array)
+    if missing_rows.any():
+        text = [missing if is_missing else item for item, is_missing in zip(text, missing_rows.tolist())]
+    return pd.Series(text, index=index, dtype=object)
+
+
+def _format_array(values, pattern, missing):
+    """Format a column with a printf pattern in one batch."""
+    index, array = _to_array(values)
+    return _finish(index, [pattern % number for number in array.tolist()], array, missing)
+
+
+def number_series(values, decimals=2, signed=False, missing=MISSING):
+    """Vectorized format_number for a whole column."""
+    return _format_array(values, f"%{'+' if signed else ''}.{decimals}f", missing)
+
+
+def percent_series(values, decimals=2, missing=MISSING):
+    """Vectorized format_percent for a whole column."""
+    return _format_array(values, f"%.{decimals}f%%", missing)
+
+
+def usd_series(values, decimals=2, missing=MISSING):
+    """Vectorized format_usd for a whole column."""
+    return _format_array(values, f"$%.{decimals}f", missing)
+
+
+def usd_units_series(values, decimals=2, prefix="$", buckets=UNIT_BUCKETS, missing=MISSING):
+    """Vectorized format_usd_units: bucket with np.select, then format the batch."""
+    index, array = _to_array(values)
+
+    conditions = [array >= threshold for threshold, _, _ in buckets]
+    divisors = np.select(conditions, [divisor for _, divisor, _ in buckets], default=1.0)
+    suffixes = np.select(conditions, [f" {suffix}" for _, _, suffix in buckets], default='')
+
+    pattern = f"{prefix}%.{decimals}f%s"
+    text = [pattern % pair for pair in zip((array / divisors).tolist(), suffixes.tolist())]
+    return _finish(index, text, array, missing)
+
+
+def register_filters(env):
+    """Register the formatting filters on a Jinja environment."""
+    env.filters.update({
+        'num': format_number,
+        'pct': format_percent,
+        'usd': format_usd,
+        'usd_units': format_usd_units,
+    })
+    return env
@@ -0,0 +1,254 @@
+"""Local cache of coin logo images for rendering.
+
+Templates used to point <img> tags at remote logo URLs, so Chromium fetched
+every logo over the network during each screenshot. The cache downloads a
+logo once, stores it pre-resized under a content-addressed directory
+(``<sha256>/<size>.webp``) and rewrites template contexts to local
+``file://`` URIs, or inline data URIs when SOCIALS_LOGO_INLINE is set. Logos
+that are missing or fail to download render a locally generated fallback
+image instead of a placeholder service.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import requests
+from PIL import Image, ImageDraw, features
+
+# Environment overrides
+LOGO_ASSET_DIR_ENV_VAR = 'SOCIALS_LOGO_ASSET_DIR'
+LOGO_INLINE_ENV_VAR = 'SOCIALS_LOGO_INLINE'
+
+DEFAULT_ASSET_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.cache', 'logo_assets')
+
+# Pre-resized square variants; 160 covers the largest logo the carousel templates draw
+LOGO_SIZES = (40, 64, 96, 160)
+DEFAULT_RENDER_SIZE = 160
+
+IMAGE_FORMAT = 'webp' if features.check('webp') else 'png'
+MIME_TYPES = {'webp': 'image/webp', 'png': 'image/png'}
+
+DOWNLOAD_TIMEOUT_SECONDS = 10
+MAX_DOWNLOAD_WORKERS = 8
+
+# Content-address of the generated fallback image
+FALLBACK_DIGEST = 'fallback'
+
+
+def is_logo_key(key):
+    """Check whether a context key holds a logo URL (logo, btc_logo, tg_logo, ...)."""
+    return isinstance(key, str) and (key == 'logo' or key.endswith('_logo'))
+
+
+def _is_remote(url):
+    """Check whether a value is a downloadable http(s) URL."""
+    return isinstance(url, str) and url.startswith(('http://', 'https://'))
+
+
+def _square(image, size):
+    """Fit an image into a transparent size x size square, keeping its aspect ratio."""
+    image = image.copy()
+    image.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    canvas.paste(image, ((size - image.width) // 2, (size - image.height) // 2), image)
+    return canvas
+
+
+def _fallback_image(size):
+    """Draw the neutral round '?' logo used when a coin has no usable logo."""
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((0, 0, size - 1, size - 1), fill=(120, 120, 130, 255))
+    draw.text((size / 2, size / 2), '?', fill=(255, 255, 255, 255), anchor='mm', font_size=size // 2)
+    return image
+
+
+class LogoAssetCache:
+    """Download-once, pre-resized logo images addressed by content hash."""
+
+    def __init__(self, asset_dir=None, sizes=LOGO_SIZES, inline=None, session=None,
+                 timeout=DOWNLOAD_TIMEOUT_SECONDS):
+        """Initialize the cache; unset arguments fall back to environment settings."""
+        self.asset_dir = os.path.abspath(asset_dir or os.getenv(LOGO_ASSET_DIR_ENV_VAR, DEFAULT_ASSET_DIR))
+        self.manifest_path = os.path.join(self.asset_dir, 'manifest.json')
+        self.sizes = tuple(sorted(sizes))
+        self.inline = (os.getenv(LOGO_INLINE_ENV_VAR, '0').strip().lower() in ('1', 'true', 'yes', 'on')
+                       if inline is None else inline)
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+        self.hits = 0
+        self.downloads = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._manifest = None
+        # URLs that failed this run; they render the fallback without retrying
+        self._failed = set()
+
+    def _load_manifest(self):
+        """Return the URL -> digest manifest, reading it from disk once."""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        """Persist the manifest atomically."""
+        os.makedirs(self.asset_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def asset_path(self, digest, size):
+        """Return the file holding one size variant of a stored logo."""
+        return os.path.join(self.asset_dir, digest[:2], digest, f"{size}.{IMAGE_FORMAT}")
+
+    def _has_asset(self, digest):
+        """Check whether every size variant of a digest is on disk."""
+        return all(os.path.exists(self.asset_path(digest, size)) for size in self.sizes)
+
+    def _write_variants(self, digest, image):
+        """Write each pre-resized variant, swapping files in atomically."""
+        for size in self.sizes:
+            path = self.asset_path(digest, size)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            _square(image, size).save(tmp_path, format=IMAGE_FORMAT)
+            os.replace(tmp_path, path)
+
+    def store(self, data):
+        """Store raw image bytes as resized variants and return their content digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self._has_asset(digest):
+            with Image.open(BytesIO(data)) as image:
+                self._write_variants(digest, image.convert('RGBA'))
+        return digest
+
+    def fallback_digest(self):
+        """Return the digest of the local fallback logo, drawing it on first use."""
+        if not self._has_asset(FALLBACK_DIGEST):
+            for size in self.sizes:
+                path = self.asset_path(FALLBACK_DIGEST, size)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                _fallback_image(size).save(tmp_path, format=IMAGE_FORMAT)
+                os.replace(tmp_path, path)
+        return FALLBACK_DIGEST
+
+    def fetch(self, url):
+        """Return the digest for a logo URL, downloading it once; None when it cannot be used."""
+        if not _is_remote(url) or url in self._failed:
+            return None
+
+        with self._lock:
+            digest = self._load_manifest().get(url)
+        if digest and self._has_asset(digest):
+            self.hits += 1
+            return digest
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            digest = self.store(response.content)
+        except Exception as e:
+            print(f"⚠️ Logo download failed, using fallback: {url} ({e})")
+            with self._lock:
+                self._failed.add(url)
+                self.failures += 1
+            return None
+
+        with self._lock:
+            self._load_manifest()[url] = digest
+            self._save_manifest()
+            self.downloads += 1
+        return digest
+
+    def prefetch(self, urls):
+        """Download all uncached logos in parallel; returns {url: digest or None}."""
+        urls = sorted({url for url in urls if _is_remote(url)})
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_WORKERS, len(urls))) as pool:
+            return dict(zip(urls, pool.map(self.fetch, urls)))
+
+    def variant_size(self, size):
+        """Pick the smallest stored size that is at least the requested size."""
+        return next((stored for stored in self.sizes if stored >= size), self.sizes[-1])
+
+    def src(self, url, size=DEFAULT_RENDER_SIZE):
+        """Return a local image src for a logo URL; missing or broken logos get the fallback image."""
+        if isinstance(url, str) and url.startswith(('data:', 'file:')):
+            return url
+
+        digest = self.fetch(url) or self.fallback_digest()
+        path = self.asset_path(digest, self.variant_size(size))
+        if self.inline:
+            with open(path, 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode('ascii')
+            return f"data:{MIME_TYPES[IMAGE_FORMAT]};base64,{encoded}"
+        return Path(path).as_uri()
+
+    def localize(self, context, size=DEFAULT_RENDER_SIZE):
+        """Return a copy of a template context with every logo URL replaced by a local src."""
+        urls = []
+        _collect_logos(context, urls)
+        self.prefetch(urls)
+        return _rewrite_logos(context, lambda url: self.src(url, size))
+
+    def stats(self):
+        """Return cache counters for reporting."""
+        return {'hits': self.hits, 'downloads': self.downloads, 'failures': self.failures}
+
+
+def _collect_logos(value, urls):
+    """Gather logo URLs from nested dicts and lists."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if is_logo_key(key):
+                urls.append(item)
+            else:
+                _collect_logos(item, urls)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_logos(item, urls)
+
+
+def _rewrite_logos(value, to_src):
+    """Copy nested dicts and lists, passing every logo value through to_src."""
+    if isinstance(value, dict):
+        return {key: to_src(item) if is_logo_key(key) else _rewrite_logos(item, to_src)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rewrite_logos(item, to_src) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_rewrite_logos(item, to_src) for item in value)
+    return value
+
+
+# Process-wide cache, created on first use
+_logo_cache = None
+_logo_cache_lock = threading.Lock()
+
+
+def get_logo_cache():
+    """Return the shared logo asset cache."""
+    global _logo_cache
+    with _logo_cache_lock:
+        if _logo_cache is None:
+            _logo_cache = LogoAssetCache()
+    return _logo_cache
+
+
+def localize_logos(context, size=DEFAULT_RENDER_SIZE):
+    """Rewrite the logo URLs of a template context to local assets via the shared cache."""
+    return get_logo_cache().localize(context, size)
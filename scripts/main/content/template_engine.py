@@ -1,42 +1,86 @@
 """Template rendering engine using Jinja2 for HTML content generation."""
 
 import os
+from pathlib import Path
+
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 
+from .formatting import register_filters
+from .logo_assets import localize_logos
+
+# Screenshots render from memory; set SOCIALS_KEEP_HTML=1 to also write each page to output_html/
+KEEP_HTML_ENV_VAR = 'SOCIALS_KEEP_HTML'
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'base_templates')
+
+
+def write_html(content, output_path):
+    """Save rendered HTML content to file."""
+    try:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"HTML saved to {output_path}")
+        return True
+    except Exception as e:
+        print(f"Error saving HTML to {output_path}: {e}")
+        return False
+
+
+def keep_html_enabled():
+    """Check whether rendered pages should also be written to disk for debugging."""
+    return os.getenv(KEEP_HTML_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def save_debug_html(content, output_path, template_dir=DEFAULT_TEMPLATE_DIR):
+    """Write rendered HTML to disk when SOCIALS_KEEP_HTML is set; a no-op otherwise.
+
+    A <base> tag pointing at the template directory is added so the file
+    opens with its stylesheets and images without copying CSS next to it.
+    """
+    if not content or not keep_html_enabled():
+        return False
+    base_href = Path(template_dir).resolve().as_uri() + '/'
+    content = content.replace('<head>', f'<head>\n    <base href="{base_href}">', 1)
+    return write_html(content, output_path)
+
+
 class TemplateRenderer:
-    """HTML template renderer with Jinja2."""
+    """HTML template renderer with Jinja2.
+
+    The render_*_page methods return the rendered HTML (falsy on failure);
+    their output_path is only written when SOCIALS_KEEP_HTML is set.
+    """
 
     def __init__(self, template_dir=None):
         """Initialize the template renderer."""
         if template_dir is None:
             # Default to base_templates directory
-            template_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'base_templates')
+            template_dir = DEFAULT_TEMPLATE_DIR
 
         self.template_dir = template_dir
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        self.env = register_filters(Environment(loader=FileSystemLoader(template_dir)))
 
     def render_template(self, template_name, context):
-        """Render a template with given context."""
+        """Render a template with given context, pointing logos at local cached assets."""
         try:
             template = self.env.get_template(template_name)
-            return template.render(**context)
+            return template.render(**localize_logos(context))
         except Exception as e:
             print(f"Error rendering template {template_name}: {e}")
             return ""
 
     def save_rendered_html(self, content, output_path):
         """Save rendered HTML content to file."""
-        try:
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"HTML saved to {output_path}")
-            return True
-        except Exception as e:
-            print(f"Error saving HTML to {output_path}: {e}")
-            return False
+        return write_html(content, output_path)
+
+    def finish_page(self, content, output_path=None):
+        """Return rendered page HTML, keeping a copy on disk when debugging is enabled."""
+        if output_path:
+            save_debug_html(content, output_path, self.template_dir)
+        return content
 
     def get_current_datetime(self):
         """Get formatted current date and time."""
@@ -62,7 +106,7 @@ class TemplateRenderer:
 
         return coins_part1, coins_part2, coins_part3
 
-    def render_coins_page(self, template_name, df, output_path):
+    def render_coins_page(self, template_name, df, output_path=None):
         """Render a cryptocurrency listing page."""
         if df.empty:
             print(f"No data to render for {template_name}")
@@ -81,9 +125,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_gainers_losers_page(self, template_name, gainers_df, losers_df, output_path):
+    def render_gainers_losers_page(self, template_name, gainers_df, losers_df, output_path=None):
         """Render a page with top gainers and losers."""
         gainers_data = gainers_df.to_dict(orient='records') if not gainers_df.empty else []
         losers_data = losers_df.to_dict(orient='records') if not losers_df.empty else []
@@ -97,9 +141,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_trading_opportunities_page(self, template_name, long_df, short_df, output_path):
+    def render_trading_opportunities_page(self, template_name, long_df, short_df, output_path=None):
         """Render a trading opportunities page."""
         long_positions = long_df.to_dict(orient='records') if not long_df.empty else []
         short_positions = short_df.to_dict(orient='records') if not short_df.empty else []
@@ -113,9 +157,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_long_positions_page(self, template_name, long_df, left_positions, right_positions, output_path):
+    def render_long_positions_page(self, template_name, long_df, left_positions, right_positions, output_path=None):
         """Render a long positions only page with 2-column layout."""
         datetime_info = self.get_current_datetime()
 
@@ -127,9 +171,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_short_positions_page(self, template_name, short_df, left_positions, right_positions, output_path):
+    def render_short_positions_page(self, template_name, short_df, left_positions, right_positions, output_path=None):
         """Render a short positions only page with 2-column layout."""
         datetime_info = self.get_current_datetime()
 
@@ -141,9 +185,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_market_overview_page(self, template_name, global_data, btc_data, output_path):
+    def render_market_overview_page(self, template_name, global_data, btc_data, output_path=None):
         """Render market overview page with global data and BTC snapshot."""
         # Get logos for BTC and ETH
         btc_logo = ""
@@ -167,9 +211,9 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
-    def render_btc_snapshot_page(self, template_name, btc_data, news_events, output_path):
+    def render_btc_snapshot_page(self, template_name, btc_data, news_events, output_path=None):
         """Render Bitcoin snapshot page with news and events."""
         datetime_info = self.get_current_datetime()
 
@@ -187,7 +231,7 @@ class TemplateRenderer:
         }
 
         content = self.render_template(template_name, context)
-        return self.save_rendered_html(content, output_path)
+        return self.finish_page(content, output_path)
 
 def get_template_renderer():
     """Factory function to get a configured template renderer."""
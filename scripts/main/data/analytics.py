@@ -0,0 +1,231 @@
+"""In-process analytics over the run's market snapshot.
+
+Ranking and filtering questions asked by several slides and by the Google
+Sheets sync (top movers, long/short candidates, alt-season ratio) are named
+queries on MarketAnalytics instead of per-caller pandas chains or extra
+PostgreSQL round trips. The snapshot frames are registered in DuckDB
+zero-copy and each query is one SQL statement. The same queries exist as
+pandas operations, used when SOCIALS_ANALYTICS_BACKEND=pandas or duckdb
+cannot be imported; both backends return the same frames. Logos come from
+the shared LogoIndex rather than a join against the logo table.
+
+One instance is shared by worker threads (async_database.py, the parallel
+Sheets sync): the DuckDB frames are resolved once under a lock and every
+query runs on its own cursor.
+"""
+
+import os
+import threading
+
+import pandas as pd
+
+from .signals import count_signals
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Backend selection: 'duckdb' (default) or 'pandas'
+ANALYTICS_BACKEND_ENV_VAR = 'SOCIALS_ANALYTICS_BACKEND'
+
+# Stablecoins, wrapped/pegged assets and other coins left out of rankings
+EXCLUDED_SYMBOLS = ('USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'PYUSD', 'PAXG', 'FDUSD', 'USDN', 'MUSD',
+                    'XDC', 'XAUt', 'USDD', 'XEC', 'CRO', 'USDe')
+
+# Share of the top coins that must beat BTC over 90 days to call an alt season
+ALT_SEASON_THRESHOLD = 0.72
+
+SCORE_COLUMNS = ['Durability_Score', 'Momentum_Score', 'Valuation_Score']
+CANDIDATE_LISTING_COLUMNS = ['slug', 'symbol', 'percent_change24h', 'percent_change7d', 'percent_change30d',
+                             'cmc_rank', 'price', 'market_cap']
+
+_TOP_MOVERS_SQL = """
+    SELECT l.*, s."Durability_Score", s."Momentum_Score", s."Valuation_Score"
+    FROM listings l
+    LEFT JOIN dmv_scores s ON s.slug = l.slug
+    WHERE l.cmc_rank <= ? AND l.percent_change24h IS NOT NULL AND {pct_filter}
+    ORDER BY l.percent_change24h {order}, l.cmc_rank
+    LIMIT ?
+"""
+
+_CANDIDATES_SQL = """
+    SELECT c.id, c.slug, c.name, c.bullish, c.bearish, c.logo,
+           l.symbol, l.percent_change24h, l.percent_change7d, l.percent_change30d,
+           l.cmc_rank, l.price, l.market_cap,
+           r.m_rat_alpha, r.d_rat_beta, r.m_rat_omega,
+           s."Durability_Score", s."Momentum_Score", s."Valuation_Score"
+    FROM dmv_counts c
+    JOIN listings l ON l.slug = c.slug
+    JOIN ratios r ON r.slug = c.slug
+    JOIN dmv_scores s ON s.slug = c.slug
+    WHERE l.cmc_rank <= ?
+      AND (TRY_CAST(r.d_rat_beta AS DOUBLE) > ? OR TRY_CAST(r.d_rat_beta AS DOUBLE) IS NULL)
+      AND (TRY_CAST(r.m_rat_omega AS DOUBLE) {omega_op} ? OR TRY_CAST(r.m_rat_omega AS DOUBLE) IS NULL)
+    ORDER BY c.{sort_col} DESC NULLS FIRST
+    LIMIT ?
+"""
+
+_ALT_SEASON_SQL = """
+    WITH btc AS (
+        SELECT percent_change90d AS btc_90d FROM listings WHERE slug = ? LIMIT 1
+    ),
+    universe AS (
+        SELECT l.percent_change90d
+        FROM listings l
+        WHERE l.cmc_rank <= ? AND l.slug <> ? AND l.symbol NOT IN (SELECT * FROM UNNEST(?))
+          AND l.percent_change90d IS NOT NULL
+    )
+    SELECT COUNT(*) FILTER (WHERE u.percent_change90d > btc.btc_90d) AS outperformers,
+           COUNT(*) AS total
+    FROM universe u, btc
+"""
+
+
+def default_backend():
+    """Return the configured backend, falling back to pandas without duckdb."""
+    backend = os.getenv(ANALYTICS_BACKEND_ENV_VAR, 'duckdb').strip().lower()
+    if backend == 'duckdb' and not DUCKDB_AVAILABLE:
+        return 'pandas'
+    return backend
+
+
+class MarketAnalytics:
+    """Named analytical queries over a MarketSnapshot."""
+
+    def __init__(self, snapshot, logos, backend=None):
+        """Initialize over a snapshot and LogoIndex; backend is 'duckdb' or 'pandas' (environment default)."""
+        self.snapshot = snapshot
+        self.logos = logos
+        self.backend = backend or default_backend()
+        if self.backend not in ('duckdb', 'pandas'):
+            raise ValueError(f"Unknown analytics backend: {self.backend}")
+        if self.backend == 'duckdb' and not DUCKDB_AVAILABLE:
+            raise ImportError("duckdb is not installed; use the pandas analytics backend")
+        self._connection = None
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _table(self, name):
+        """Return a snapshot table, adding derived tables on demand."""
+        if name == 'dmv_counts':
+            dmv_all = self.snapshot.table('dmv_all')
+            counts = count_signals(dmv_all).rename(columns={'bullish_count': 'bullish', 'bearish_count': 'bearish'})
+            df = dmv_all[['id', 'slug', 'name']].join(counts[['bullish', 'bearish']])
+            # Candidates need a logo to render; resolved once per run by the index
+            df['logo'] = self.logos.map(df['slug'])
+            return df[df['logo'].notna()]
+        return self.snapshot.table(name)
+
+    def _sql(self, sql, params, tables):
+        """Run a DuckDB query on its own cursor with the snapshot frames it reads registered."""
+        with self._lock:
+            if self._connection is None:
+                self._connection = duckdb.connect()
+            for name in tables:
+                if name not in self._frames:
+                    self._frames[name] = self._table(name)
+            frames = {name: self._frames[name] for name in tables}
+            cursor = self._connection.cursor()
+
+        # Registered frames are per connection, so each cursor registers its own (zero-copy)
+        try:
+            for name, frame in frames.items():
+                cursor.register(name, frame)
+            return cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+
+    def close(self):
+        """Release the DuckDB connection, if one was opened."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._frames.clear()
+
+    # ---- named queries -------------------------------------------------
+
+    def top_movers(self, n=5, min_pct=None, direction='gainers', rank_max=100):
+        """Return the n biggest 24h gainers (or losers) within rank_max, with logo and DMV scores.
+
+        min_pct, when given, keeps only moves beyond +min_pct (gainers) or
+        -min_pct (losers).
+        """
+        if direction not in ('gainers', 'losers'):
+            raise ValueError(f"direction must be 'gainers' or 'losers', not {direction!r}")
+        gainers = direction == 'gainers'
+
+        if self.backend == 'duckdb':
+            if min_pct is None:
+                pct_filter, params = 'TRUE', [rank_max, n]
+            else:
+                pct_filter = 'l.percent_change24h > ?' if gainers else 'l.percent_change24h < ?'
+                params = [rank_max, min_pct if gainers else -min_pct, n]
+            sql = _TOP_MOVERS_SQL.format(pct_filter=pct_filter, order='DESC' if gainers else 'ASC')
+            df = self._sql(sql, params, ('listings', 'dmv_scores'))
+        else:
+            df = pd.merge(self._table('listings'), self._table('dmv_scores')[['slug', *SCORE_COLUMNS]],
+                          on='slug', how='left')
+            df = df[(df['cmc_rank'] <= rank_max) & df['percent_change24h'].notna()]
+            if min_pct is not None:
+                df = df[df['percent_change24h'] > min_pct] if gainers else df[df['percent_change24h'] < -min_pct]
+            df = df.sort_values(['percent_change24h', 'cmc_rank'], ascending=[not gainers, True], kind='stable')
+            df = df.head(n).reset_index(drop=True)
+
+        df['logo'] = self.logos.map(df['slug'])
+        return df
+
+    def long_candidates(self, rank_max=99, beta_min=1.0, omega_min=1.0, limit=15):
+        """Return long candidates: most bullish signals among coins with beta/omega above the floors."""
+        return self._candidates('bullish', rank_max, beta_min, '>', omega_min, limit)
+
+    def short_candidates(self, rank_max=99, beta_min=1.0, omega_max=2.0, limit=15):
+        """Return short candidates: most bearish signals among coins with omega below the cap."""
+        return self._candidates('bearish', rank_max, beta_min, '<', omega_max, limit)
+
+    def _candidates(self, sort_col, rank_max, beta_min, omega_op, omega_bound, limit):
+        """Filter and rank DMV signal counts; missing ratios pass the filters, NULL counts sort first."""
+        if self.backend == 'duckdb':
+            sql = _CANDIDATES_SQL.format(omega_op=omega_op, sort_col=sort_col)
+            return self._sql(sql, [rank_max, beta_min, omega_bound, limit],
+                             ('dmv_counts', 'listings', 'ratios', 'dmv_scores'))
+
+        df = pd.merge(self._table('dmv_counts'), self._table('listings')[CANDIDATE_LISTING_COLUMNS], on='slug')
+        df = pd.merge(df, self._table('ratios'), on='slug')
+        df = pd.merge(df, self._table('dmv_scores'), on='slug')
+
+        beta = pd.to_numeric(df['d_rat_beta'], errors='coerce')
+        omega = pd.to_numeric(df['m_rat_omega'], errors='coerce')
+        omega_ok = (omega > omega_bound) if omega_op == '>' else (omega < omega_bound)
+        df = df[(df['cmc_rank'] <= rank_max) & ((beta > beta_min) | beta.isna()) & (omega_ok | omega.isna())]
+        df = df.sort_values(sort_col, ascending=False, na_position='first', kind='stable')
+        return df.head(limit).reset_index(drop=True)
+
+    def alt_season_ratio(self, rank_max=100, benchmark='bitcoin', excluded_symbols=EXCLUDED_SYMBOLS,
+                         threshold=ALT_SEASON_THRESHOLD):
+        """Share of top coins (excluding the benchmark and stablecoins) beating it over 90 days.
+
+        Returns a dict with outperformers, total, ratio and is_alt_season.
+        """
+        if self.backend == 'duckdb':
+            row = self._sql(_ALT_SEASON_SQL, [benchmark, rank_max, benchmark, list(excluded_symbols)],
+                            ('listings',)).iloc[0]
+            outperformers, total = int(row['outperformers']), int(row['total'])
+        else:
+            listings = self._table('listings')
+            btc = listings.loc[listings['slug'] == benchmark, 'percent_change90d']
+            universe = listings[(listings['cmc_rank'] <= rank_max) & (listings['slug'] != benchmark)
+                                & ~listings['symbol'].isin(excluded_symbols)
+                                & listings['percent_change90d'].notna()]
+            total = len(universe) if not btc.empty else 0
+            outperformers = int((universe['percent_change90d'] > btc.iloc[0]).sum()) if total else 0
+
+        ratio = outperformers / total if total else 0.0
+        return {
+            'outperformers': outperformers,
+            'total': total,
+            'ratio': round(ratio, 4),
+            'is_alt_season': ratio > threshold,
+        }
@@ -0,0 +1,59 @@
+"""Async data-access API mirroring database.py for the pipeline coroutines.
+
+Each fetcher runs its blocking counterpart from database.py on a worker
+thread against the shared connection pool, so the event loop keeps running
+while PostgreSQL answers and independent queries overlap. Results are the
+same DataFrames the synchronous fetchers return.
+"""
+
+import asyncio
+
+from . import database
+from .market_snapshot import SNAPSHOT_QUERIES
+
+
+async def load_market_snapshot(tables=None):
+    """Load snapshot tables concurrently so the wait is the slowest query, not the sum."""
+    snapshot = database.get_market_snapshot()
+    names = [name for name in (tables or SNAPSHOT_QUERIES) if not snapshot.is_loaded(name)]
+
+    results = await asyncio.gather(
+        *(asyncio.to_thread(snapshot.table, name) for name in names),
+        return_exceptions=True
+    )
+
+    # A failed table is retried lazily by the fetcher that needs it, which reports the error
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ Could not preload snapshot table '{name}': {result}")
+    return snapshot
+
+
+async def fetch_crypto_data(query, params=None):
+    """Execute a SQL query with optional bound parameters without blocking the loop."""
+    return await asyncio.to_thread(database.fetch_crypto_data, query, params)
+
+
+async def fetch_top_coins(start_rank=1, end_rank=24):
+    """Fetch top cryptocurrency data by rank range with DMV scores."""
+    return await asyncio.to_thread(database.fetch_top_coins, start_rank, end_rank)
+
+
+async def fetch_btc_snapshot():
+    """Fetch Bitcoin snapshot data with DMV, fear and greed and price history."""
+    return await asyncio.to_thread(database.fetch_btc_snapshot)
+
+
+async def fetch_btc_snapshot_data():
+    """Fetch the Bitcoin snapshot as a BtcSnapshot with its chart history."""
+    return await asyncio.to_thread(database.fetch_btc_snapshot_data)
+
+
+async def fetch_global_market_data():
+    """Fetch global cryptocurrency market data."""
+    return await asyncio.to_thread(database.fetch_global_market_data)
+
+
+async def fetch_trading_opportunities(opportunity_type="long", limit=15):
+    """Fetch long or short trading opportunities."""
+    return await asyncio.to_thread(database.fetch_trading_opportunities, opportunity_type, limit)
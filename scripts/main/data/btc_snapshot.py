@@ -0,0 +1,28 @@
+"""Structured result of the BTC snapshot fetch.
+
+The listing, sentiment and Fear & Greed fields form one flat row; the chart
+history travels next to it as a FearGreedHistory instead of being packed
+into a DataFrame cell and parsed back by the renderers.
+"""
+
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .chart_series import FearGreedHistory
+
+
+@dataclass
+class BtcSnapshot:
+    """Bitcoin slide data: one row of scalar fields plus the chart history."""
+
+    row: dict
+    history: FearGreedHistory = field(default_factory=FearGreedHistory.empty)
+
+    def to_frame(self):
+        """Return the scalar fields as a one-row DataFrame."""
+        return pd.DataFrame([self.row])
+
+    def template_context(self):
+        """Return the fields templates expect, with fear_greed_history as point dicts."""
+        return {**self.row, 'fear_greed_history': self.history.points()}
@@ -0,0 +1,146 @@
+"""Chart series for the Fear & Greed vs BTC price chart.
+
+The two histories come from different tables and need not cover the same
+days, so they are aligned on calendar date rather than list position: the
+Fear & Greed days define the x axis and each day takes that day's BTC close,
+or the last earlier close when the price table has a gap. Days before the
+first known close have no price (NaN) and are skipped by the price line.
+
+The result is a FearGreedHistory of typed NumPy columns; points() turns it
+into the per-day dicts the slide 6 template loops over.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Fear & Greed values are stretched over the padded data range into this band
+SCALED_BAND = (20, 80)
+RANGE_PADDING = 0.2
+
+# Price axis used when there is no price history
+DEFAULT_PRICE_RANGE = (0.0, 120000.0)
+
+
+@dataclass(frozen=True)
+class FearGreedHistory:
+    """Date-aligned Fear & Greed and BTC price columns, oldest day first."""
+
+    date: np.ndarray        # datetime64[D]
+    value: np.ndarray       # int64, scaled into SCALED_BAND for plotting
+    raw_value: np.ndarray   # int64, index as published
+    label: np.ndarray       # str sentiment labels
+    price: np.ndarray       # float64 BTC close, NaN before the first known close
+    price_pct: np.ndarray   # float64 position on the price axis (0-100), NaN with price
+    price_min: float = DEFAULT_PRICE_RANGE[0]
+    price_max: float = DEFAULT_PRICE_RANGE[1]
+    carried_prices: int = 0
+
+    @classmethod
+    def empty(cls):
+        """Return a history with no days (the chart renders without lines)."""
+        return cls(
+            date=np.array([], dtype='datetime64[D]'),
+            value=np.array([], dtype='int64'),
+            raw_value=np.array([], dtype='int64'),
+            label=np.array([], dtype=str),
+            price=np.array([], dtype='float64'),
+            price_pct=np.array([], dtype='float64'),
+        )
+
+    def __len__(self):
+        return len(self.date)
+
+    def latest(self):
+        """Return (raw_value, label) of the most recent day, or None when empty."""
+        if not len(self):
+            return None
+        return int(self.raw_value[-1]), str(self.label[-1])
+
+    def points(self):
+        """Return per-day dicts for template loops (price fields None when unknown)."""
+        def optional(number):
+            return None if np.isnan(number) else float(number)
+
+        return [
+            {
+                'day': day,
+                'date': str(date),
+                'value': int(value),
+                'raw_value': int(raw_value),
+                'label': str(label),
+                'price': optional(price),
+                'price_pct': optional(price_pct),
+            }
+            for day, (date, value, raw_value, label, price, price_pct) in enumerate(
+                zip(self.date, self.value, self.raw_value, self.label, self.price, self.price_pct), start=1)
+        ]
+
+
+def _by_date(df, value_columns):
+    """Index a history frame by calendar date, oldest first, one row per day."""
+    frame = df[['timestamp', *value_columns]].copy()
+    frame['date'] = pd.to_datetime(frame['timestamp']).dt.normalize()
+    if frame['date'].dt.tz is not None:
+        frame['date'] = frame['date'].dt.tz_localize(None)
+    # Keep the latest row of a day when a table has several
+    frame = frame.sort_values('timestamp').drop_duplicates('date', keep='last')
+    return frame.set_index('date')[list(value_columns)].sort_index()
+
+
+def scale_fear_greed(values, band=SCALED_BAND, padding=RANGE_PADDING):
+    """Stretch index values over the padded data range into the chart band."""
+    values = np.asarray(values, dtype='float64')
+    if values.size == 0:
+        return values
+
+    low, high = values.min(), values.max()
+    pad = (high - low) * padding
+    scaled_min, scaled_max = max(0.0, low - pad), min(100.0, high + pad)
+    if scaled_max <= scaled_min:
+        return values
+
+    normalized = (values - scaled_min) / (scaled_max - scaled_min)
+    return band[0] + normalized * (band[1] - band[0])
+
+
+def build_fear_greed_series(fear_greed_df, btc_price_df):
+    """Align both histories by date and scale them into a FearGreedHistory."""
+    if fear_greed_df.empty:
+        return FearGreedHistory.empty()
+
+    days = _by_date(fear_greed_df, ['fear_greed_index', 'sentiment'])
+
+    if btc_price_df.empty:
+        closes = pd.Series(dtype='float64')
+    else:
+        closes = pd.to_numeric(_by_date(btc_price_df, ['close'])['close'], errors='coerce').dropna()
+
+    # Exact-date matches first, then the last earlier close for gaps
+    exact = closes.reindex(days.index)
+    prices = closes.reindex(closes.index.union(days.index)).ffill().reindex(days.index)
+    carried = int((exact.isna() & prices.notna()).sum())
+
+    price = prices.to_numpy(dtype='float64')
+    known = ~np.isnan(price)
+    if known.any():
+        price_min, price_max = float(price[known].min()), float(price[known].max())
+    else:
+        price_min, price_max = DEFAULT_PRICE_RANGE
+
+    span = price_max - price_min
+    price_pct = (price - price_min) / span * 100 if span > 0 else np.where(known, 50.0, np.nan)
+
+    raw = days['fear_greed_index'].to_numpy(dtype='float64')
+    return FearGreedHistory(
+        date=days.index.to_numpy().astype('datetime64[D]'),
+        value=scale_fear_greed(raw).astype('int64'),
+        raw_value=raw.astype('int64'),
+        label=days['sentiment'].to_numpy(dtype=str),
+        price=price,
+        price_pct=np.round(price_pct, 2),
+        price_min=price_min,
+        price_max=price_max,
+        carried_prices=carried,
+    )
@@ -2,31 +2,99 @@
 
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine
 import os
-
-# Database connection configuration
-DB_CONFIG = {
-    'host': '34.55.195.199',        # GCP PostgreSQL instance public IP
-    'database': 'dbcp',             # Database name
-    'user': 'yogass09',             # Username
-    'password': 'jaimaakamakhya',   # Password
-    'port': 5432                    # PostgreSQL default port
-}
+import threading
+
+from .analytics import MarketAnalytics
+from .btc_snapshot import BtcSnapshot
+from .chart_series import FearGreedHistory, build_fear_greed_series
+from .engine import get_engine, dispose_engine
+from .history_store import HistoryStore
+from .logo_index import LogoIndex
+from .market_snapshot import MarketSnapshot, SNAPSHOT_ENV_VAR
+from .query_cache import QueryCache
+from .queries import latency_histogram
+from .signals import count_signals
+from .slide_queries import fetch_slide, use_slide_query
+
+# Listing columns of the BTC snapshot slide
+BTC_SNAPSHOT_COLUMNS = ['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'volume24h',
+                        'market_cap', 'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
 
 def get_gcp_engine():
-    """Create and return a SQLAlchemy engine for the GCP PostgreSQL database."""
-    connection_url = f"postgresql+psycopg2://{DB_CONFIG['user']}:{DB_CONFIG['password']}@" \
-                     f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-    return create_engine(connection_url)
-
-# Initialize the GCP engine
-gcp_engine = get_gcp_engine()
-
-def fetch_crypto_data(query):
-    """Execute a SQL query and return results as DataFrame."""
+    """Return the shared, pooled SQLAlchemy engine for the GCP PostgreSQL database."""
+    return get_engine()
+
+# Process-wide query cache, market snapshot, analytics, history store and logo index, created on first use
+_query_cache = None
+_market_snapshot = None
+_market_analytics = None
+_history_store = None
+_logo_index = None
+# Guards lazy creation when fetchers run on worker threads (see async_database.py)
+_shared_state_lock = threading.Lock()
+
+def get_query_cache():
+    """Return the shared on-disk query cache (honours --no-cache / --refresh)."""
+    global _query_cache
+    with _shared_state_lock:
+        if _query_cache is None:
+            _query_cache = QueryCache()
+    return _query_cache
+
+def get_market_snapshot():
+    """Return the shared market snapshot, reusing a parent run's snapshot file if set."""
+    global _market_snapshot
+    cache = get_query_cache()
+    with _shared_state_lock:
+        if _market_snapshot is None:
+            snapshot_path = os.getenv(SNAPSHOT_ENV_VAR)
+            if snapshot_path and os.path.exists(snapshot_path):
+                _market_snapshot = MarketSnapshot.load(snapshot_path, engine=get_engine(), cache=cache)
+                print(f"📦 Using shared market snapshot: {snapshot_path}")
+            else:
+                _market_snapshot = MarketSnapshot(get_engine(), cache=cache)
+    return _market_snapshot
+
+def get_market_analytics():
+    """Return the shared analytics queries over the current market snapshot."""
+    global _market_analytics
+    snapshot = get_market_snapshot()
+    logos = get_logo_index()
+    with _shared_state_lock:
+        if (_market_analytics is None or _market_analytics.snapshot is not snapshot
+                or _market_analytics.logos is not logos):
+            _market_analytics = MarketAnalytics(snapshot, logos)
+    return _market_analytics
+
+def get_history_store():
+    """Return the shared local store for the Fear & Greed and BTC price histories."""
+    global _history_store
+    with _shared_state_lock:
+        if _history_store is None:
+            _history_store = HistoryStore()
+    return _history_store
+
+def get_logo_index():
+    """Return the shared slug -> logo index."""
+    global _logo_index
+    with _shared_state_lock:
+        if _logo_index is None:
+            _logo_index = LogoIndex(get_engine())
+    return _logo_index
+
+def reset_market_snapshot():
+    """Drop the shared snapshot so the next fetch reloads from the database."""
+    global _market_snapshot, _market_analytics
+    if _market_analytics is not None:
+        _market_analytics.close()
+    _market_snapshot = None
+    _market_analytics = None
+
+def fetch_crypto_data(query, params=None):
+    """Execute a SQL query with optional bound parameters and return results as DataFrame."""
     try:
-        df = pd.read_sql_query(query, gcp_engine)
+        df = get_query_cache().read_sql(query, get_engine(), params=params)
         return df
     except Exception as e:
         print(f"Error executing query: {e}")
@@ -34,33 +102,28 @@ def fetch_crypto_data(query):
 
 def fetch_top_coins(start_rank=1, end_rank=24):
     """Fetch top cryptocurrency data by rank range with DMV scores."""
-    query = f"""
-      SELECT
-        c.slug, c.cmc_rank, c.last_updated, c.symbol, c.price, c.percent_change24h, c.market_cap,
-        d."Durability_Score", d."Momentum_Score", d."Valuation_Score"
-      FROM crypto_listings_latest_1000 c
-      LEFT JOIN "FE_DMV_SCORES" d ON c.slug = d.slug
-      WHERE c.cmc_rank BETWEEN {start_rank} AND {end_rank}
-      """
-
     try:
-        df = pd.read_sql_query(query, gcp_engine)
+        snapshot = get_market_snapshot()
+        if use_slide_query(snapshot, 'top_coins', get_engine()):
+            # Standalone run: one joined, server-rounded statement; logos come from the index
+            df = fetch_slide('top_coins', get_engine(), cache=get_query_cache(),
+                             params={'start_rank': start_rank, 'end_rank': end_rank})
+            df['logo'] = get_logo_index().map(df['slug'])
+            return df
+
+        listings = snapshot.table('listings')
+
+        df = listings[listings['cmc_rank'].between(start_rank, end_rank)]
+        df = df[['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'market_cap']]
+        df = pd.merge(df, snapshot.table('dmv_scores'), on='slug', how='left')
+
         # Convert market_cap to billions and round to 2 decimal places
         df['market_cap'] = (df['market_cap'] / 1_000_000_000).round(2)
         df['price'] = (df['price']).round(2)
         df['percent_change24h'] = (df['percent_change24h']).round(2)
 
-        # Fetch logos
-        slugs = df['slug'].tolist()
-        slugs_placeholder = ', '.join(f"'{slug}'" for slug in slugs)
-
-        query_logos = f"""
-        SELECT logo, slug FROM "FE_CC_INFO_URL"
-        WHERE slug IN ({slugs_placeholder})
-        """
-
-        logos_and_slugs = pd.read_sql_query(query_logos, gcp_engine)
-        df = pd.merge(df, logos_and_slugs, on='slug', how='left')
+        # Attach logos from the index
+        df['logo'] = get_logo_index().map(df['slug'])
         df = df.sort_values(by='cmc_rank', ascending=True)
 
         return df
@@ -69,59 +132,84 @@ def fetch_top_coins(start_rank=1, end_rank=24):
         print(f"Error fetching top coins data: {e}")
         return pd.DataFrame()
 
-def fetch_btc_snapshot():
-    """Fetch comprehensive Bitcoin data including sentiment analysis."""
-    query_top_1 = """
-    SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, volume24h, market_cap, percent_change7d, percent_change30d, ytd_price_change_percentage
-    FROM crypto_listings_latest_1000
-    WHERE cmc_rank < 2
-    """
+def fetch_top_movers(direction="gainers", n=15, min_pct=None, rank_max=100):
+    """Fetch the biggest 24h movers from the snapshot, formatted like fetch_top_coins."""
+    try:
+        df = get_market_analytics().top_movers(n=n, min_pct=min_pct, direction=direction, rank_max=rank_max)
+        df = df[['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'market_cap',
+                 'Durability_Score', 'Momentum_Score', 'Valuation_Score', 'logo']].copy()
+
+        # Convert market_cap to billions and round to 2 decimal places
+        df['market_cap'] = (df['market_cap'] / 1_000_000_000).round(2)
+        df['price'] = (df['price']).round(2)
+        df['percent_change24h'] = (df['percent_change24h']).round(2)
+
+        return df
 
+    except Exception as e:
+        print(f"Error fetching top {direction}: {e}")
+        return pd.DataFrame()
+
+def _btc_snapshot_inputs():
+    """Return the BTC listing, DMV counts, fear and greed history and price history frames."""
+    snapshot = get_market_snapshot()
+    # Histories (newest first) come from the local store, which only fetches new rows
+    history = get_history_store()
+    fear_greed_df = history.window('fear_greed', get_engine())
+    btc_price_df = history.window('btc_ohlcv', get_engine())
+
+    if not use_slide_query(snapshot, 'btc_snapshot', get_engine()):
+        listings = snapshot.table('listings')
+        dmv_all = snapshot.table('dmv_all')
+        return (
+            listings.loc[listings['cmc_rank'] < 2, BTC_SNAPSHOT_COLUMNS].reset_index(drop=True),
+            dmv_all.loc[dmv_all['slug'] == 'bitcoin', ['bullish', 'bearish', 'neutral']].reset_index(drop=True),
+            fear_greed_df,
+            btc_price_df,
+        )
+
+    # Standalone run: listing and DMV counts come back as a single row
+    row = fetch_slide('btc_snapshot', get_engine(), cache=get_query_cache(), params={'slug': 'bitcoin'})
+    return (
+        row[BTC_SNAPSHOT_COLUMNS].reset_index(drop=True),
+        row.loc[row['bullish'].notna(), ['bullish', 'bearish', 'neutral']].reset_index(drop=True),
+        fear_greed_df,
+        btc_price_df,
+    )
+
+def _build_chart_history(fear_greed_df, btc_price_df):
+    """Build the chart history, degrading to an empty chart (never made-up points) on bad input."""
     try:
-        btc_data = pd.read_sql_query(query_top_1, gcp_engine)
-
-        # Format market cap and volume
-        def format_market_cap(market_cap):
-            if pd.isnull(market_cap):
-                return market_cap
-            market_cap = float(market_cap)
-            if market_cap >= 1e12:
-                return f"${market_cap / 1e12:.2f} T"
-            elif market_cap >= 1e9:
-                return f"${market_cap / 1e9:.2f} B"
-            elif market_cap >= 1e6:
-                return f"${market_cap / 1e6:.2f} M"
-            else:
-                return f"${market_cap:.2f}"
-
-        btc_data['market_cap'] = btc_data['market_cap'].apply(format_market_cap)
-        btc_data['volume24h'] = btc_data['volume24h'].apply(format_market_cap)
-
-        # Format percentage changes
-        for col in ['percent_change24h', 'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']:
-            btc_data[col] = btc_data[col].apply(lambda x: f"{x:.2f}" if not pd.isnull(x) else x)
-
-        # Format price
-        btc_data['price'] = btc_data['price'].apply(lambda x: f"${x:.2f}" if not pd.isnull(x) else x)
-
-        # Fetch DMV data for sentiment analysis - get specific sentiment columns
-        dmv_query = """
-        SELECT
-          "bullish",
-          "bearish",
-          "neutral"
-        FROM
-          "public"."FE_DMV_ALL"
-        WHERE
-          "slug" = 'bitcoin'
-        """
-        dmv_bitcoin = pd.read_sql_query(dmv_query, gcp_engine)
+        history = build_fear_greed_series(fear_greed_df, btc_price_df)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"⚠️ Fear & Greed chart unavailable, rendering without history: {e}")
+        return FearGreedHistory.empty()
+
+    if not len(history):
+        print("⚠️ No Fear & Greed history; rendering the chart without lines")
+    elif history.carried_prices:
+        print(f"⚠️ BTC close missing for {history.carried_prices} chart day(s); carried the previous close forward")
+    print(f"📊 Fear & Greed chart: {len(history)} days, "
+          f"BTC range ${history.price_min:.0f}-${history.price_max:.0f}")
+    return history
+
+def fetch_btc_snapshot_data():
+    """Fetch Bitcoin data with sentiment analysis and chart history as a BtcSnapshot (None on error)."""
+    try:
+        btc_data, dmv_bitcoin, fear_greed_df, btc_price_df = _btc_snapshot_inputs()
 
+        # Prices, caps and changes stay numeric; templates format them with the
+        # usd / usd_units / num filters from content/formatting.py
+        numeric_cols = ['price', 'percent_change24h', 'volume24h', 'market_cap',
+                        'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
+        btc_data[numeric_cols] = btc_data[numeric_cols].apply(pd.to_numeric, errors='coerce').astype('float64')
+
+        # DMV sentiment columns for Bitcoin
         if not dmv_bitcoin.empty:
-            # The columns now directly contain the sentiment values
-            bullish_count = int(dmv_bitcoin.iloc[0]['bullish'])
-            bearish_count = int(dmv_bitcoin.iloc[0]['bearish'])
-            neutral_count = int(dmv_bitcoin.iloc[0]['neutral'])
+            counts = count_signals(dmv_bitcoin).iloc[0]
+            bullish_count = int(counts['bullish_count'])
+            bearish_count = int(counts['bearish_count'])
+            neutral_count = int(counts['neutral_count'])
 
             # Reduce neutral by 11 as requested (hardcoded adjustment)
             neutral_count = neutral_count - 11 if neutral_count > 11 else 0
@@ -162,110 +250,12 @@ def fetch_btc_snapshot():
 
             print(f"DEBUG 6-Category Trend: bullish={bullish_count}, bearish={bearish_count}, diff={bullish_count - bearish_count}, trend={trend_value}")
 
-        # Fetch real Fear & Greed Index data from database
-        def get_fear_greed_label(value):
-            if value <= 25:
-                return "Extreme Fear"
-            elif value <= 45:
-                return "Fear"
-            elif value <= 55:
-                return "Neutral"
-            elif value <= 75:
-                return "Greed"
-            else:
-                return "Extreme Greed"
-
-        # Get historical Fear & Greed Index data from database (last 30 days)
-        fear_greed_query = '''
-        SELECT
-            timestamp,
-            fear_greed_index,
-            sentiment
-        FROM "FE_FEAR_GREED_CMC"
-        ORDER BY timestamp DESC
-        LIMIT 30
-        '''
-
-        fear_greed_df = pd.read_sql_query(fear_greed_query, gcp_engine)
-
-        # Fetch Bitcoin historical price data (last 31 days - to match Fear & Greed data)
-        btc_price_query = '''
-        SELECT
-          "timestamp",
-          "slug",
-          "name",
-          "close"
-        FROM
-          "public"."1K_coins_ohlcv"
-        WHERE
-          "slug" = 'bitcoin'
-        ORDER BY
-          "timestamp" DESC
-        LIMIT
-          31
-        '''
-
-        btc_price_df = pd.read_sql_query(btc_price_query, gcp_engine)
-        print(f"🔍 Debug: btc_price_history has {len(btc_price_df)} entries")
-
-        # Convert to the format expected by the template (reverse order for chronological display)
-        fear_greed_history = []
-        # Process Bitcoin price data (reverse to match chronological order)
-        if not btc_price_df.empty:
-            btc_price_df = btc_price_df.iloc[::-1].reset_index(drop=True)  # Reverse for chronological order
-
-            # Calculate price scaling for secondary y-axis
-            btc_prices = [float(row['close']) for _, row in btc_price_df.iterrows()]
-            btc_min_price = min(btc_prices)
-            btc_max_price = max(btc_prices)
-            print(f"💰 BTC price range: ${btc_min_price:.0f}-${btc_max_price:.0f}")
-
-        if not fear_greed_df.empty:
-            # Reverse to get chronological order (oldest to newest)
-            fear_greed_df = fear_greed_df.iloc[::-1].reset_index(drop=True)
-
-            # Calculate min/max for dynamic scaling
-            min_val = fear_greed_df['fear_greed_index'].min()
-            max_val = fear_greed_df['fear_greed_index'].max()
-
-            # Add some padding to the range for better visualization
-            range_padding = (max_val - min_val) * 0.2
-            scaled_min = max(0, min_val - range_padding)  # Don't go below 0
-            scaled_max = min(100, max_val + range_padding)  # Don't go above 100
-
-            print(f"📊 Fear & Greed data range: {min_val}-{max_val}, scaled: {scaled_min:.1f}-{scaled_max:.1f}")
-
-            for i, row in fear_greed_df.iterrows():
-                # Scale value to use full chart height (0-100 range mapped to 0-300px)
-                raw_value = int(row['fear_greed_index'])
-
-                # Map the actual data range to the full 0-100 display range for better visualization
-                if scaled_max > scaled_min:
-                    # Normalize to 0-1, then scale to utilize more of the chart space
-                    normalized = (raw_value - scaled_min) / (scaled_max - scaled_min)
-                    # Map to 20-80 range instead of 0-100 for better visual impact
-                    scaled_value = 20 + (normalized * 60)
-                else:
-                    scaled_value = raw_value
-
-                # Get corresponding Bitcoin price for this data point (if available)
-                btc_price = 0
-                if not btc_price_df.empty and i < len(btc_price_df):
-                    btc_price = float(btc_price_df.iloc[i]['close'])
-
-                fear_greed_history.append({
-                    'day': i + 1,
-                    'value': int(scaled_value),  # Use scaled value for chart positioning
-                    'raw_value': raw_value,     # Keep original for reference
-                    'price': btc_price,         # Bitcoin price for this data point
-                    'label': row['sentiment']   # Use actual sentiment from database
-                })
+        # Fear & Greed and BTC closes aligned by date, scaled for the dual-axis chart
+        history = _build_chart_history(fear_greed_df, btc_price_df)
 
         # Get current fear/greed index (most recent)
-        if not fear_greed_df.empty:
-            latest_fear_greed = fear_greed_df.iloc[-1]  # Last row after reversal = most recent
-            current_fear_greed = int(latest_fear_greed['fear_greed_index'])
-            current_fear_greed_label = latest_fear_greed['sentiment']
+        if len(history):
+            current_fear_greed, current_fear_greed_label = history.latest()
         else:
             # If no data available, use defaults (but this shouldn't happen)
             current_fear_greed = 50
@@ -274,89 +264,37 @@ def fetch_btc_snapshot():
         btc_data.loc[0, 'fear_greed_index'] = current_fear_greed
         btc_data.loc[0, 'fear_greed_label'] = current_fear_greed_label
 
-        # Store fear_greed_history as a column (will be handled properly in template)
-        # Note: We can't use DataFrame.attrs as they get lost in pandas operations
-        btc_data.loc[0, 'fear_greed_history_json'] = str(fear_greed_history)
-
-        # Add Bitcoin price scaling data for dual-axis chart
-        if not btc_price_df.empty:
-            btc_data.loc[0, 'btc_min_price'] = btc_min_price
-            btc_data.loc[0, 'btc_max_price'] = btc_max_price
-        else:
-            # Default values if no price data
-            btc_data.loc[0, 'btc_min_price'] = 0
-            btc_data.loc[0, 'btc_max_price'] = 120000
+        # Bitcoin price axis for the dual-axis chart
+        btc_data.loc[0, 'btc_min_price'] = history.price_min
+        btc_data.loc[0, 'btc_max_price'] = history.price_max
 
         # Remove synthetic altseason data - use real data or remove entirely
         # For now, setting to neutral values
         btc_data.loc[0, 'altseason_gauge'] = 90  # Neutral value
         btc_data.loc[0, 'altseason_status'] = "No"
 
-        # Fetch logo
-        logo_query = "SELECT logo, slug FROM \"FE_CC_INFO_URL\" WHERE slug = 'bitcoin'"
-        logo_data = pd.read_sql_query(logo_query, gcp_engine)
-        btc_data = pd.merge(btc_data, logo_data, on='slug', how='left')
+        # Attach logo from the index
+        btc_data['logo'] = get_logo_index().map(btc_data['slug'])
 
-        return btc_data
+        return BtcSnapshot(row=btc_data.iloc[0].to_dict(), history=history)
 
     except Exception as e:
         print(f"Error fetching BTC snapshot: {e}")
-        return pd.DataFrame()
+        return None
+
+def fetch_btc_snapshot():
+    """Fetch comprehensive Bitcoin data including sentiment analysis as a one-row DataFrame."""
+    snapshot = fetch_btc_snapshot_data()
+    return snapshot.to_frame() if snapshot is not None else pd.DataFrame()
 
 def fetch_global_market_data():
     """Fetch global cryptocurrency market data."""
-    query = """
-    SELECT
-        total_market_cap,
-        total_volume24h_reported,
-        altcoin_volume24h_reported,
-        altcoin_market_cap,
-        total_market_cap_yesterday_percentage_change,
-        total_volume24h_yesterday_percentage_change,
-        derivatives_volume24h_reported,
-        derivatives24h_percentage_change,
-        active_crypto_currencies,
-        total_crypto_currencies,
-        active_exchanges,
-        total_exchanges,
-        stablecoin_volume24h_reported,
-        stablecoin_market_cap,
-        stablecoin24h_percentage_change,
-        defi_volume24h_reported,
-        defi_market_cap,
-        defi24h_percentage_change,
-        btc_dominance24h_percentage_change,
-        eth_dominance24h_percentage_change,
-        btc_dominance,
-        eth_dominance
-    FROM
-        crypto_global_latest
-    """
-
     try:
-        global_data = pd.read_sql_query(query, gcp_engine)
-
-        # Format large numbers
-        def format_large_number(value, include_dollar=True):
-            if pd.isnull(value):
-                return value
-            value = float(value)
-            prefix = "$" if include_dollar else ""
-
-            if value >= 1e12:
-                return f"{prefix}{value / 1e12:.2f} T"
-            elif value >= 1e9:
-                return f"{prefix}{value / 1e9:.2f} B"
-            elif value >= 1e6:
-                return f"{prefix}{value / 1e6:.2f} M"
-            elif value >= 1e3:
-                return f"{prefix}{value / 1e3:.2f} K"
-            else:
-                return f"{prefix}{value:.2f}"
+        global_data = get_market_snapshot().table('global')
 
-        # Apply formatting
+        # Totals stay numeric; templates format them with the usd_units filter
         for col in ['total_market_cap', 'total_volume24h_reported', 'derivatives_volume24h_reported', 'defi_volume24h_reported']:
-            global_data[col] = global_data[col].apply(lambda x: format_large_number(x, include_dollar=False))
+            global_data[col] = pd.to_numeric(global_data[col], errors='coerce').astype('float64')
 
         # Convert to billions for other columns
         for col in ['altcoin_volume24h_reported', 'altcoin_market_cap', 'stablecoin_volume24h_reported', 'stablecoin_market_cap', 'defi_market_cap']:
@@ -377,103 +315,12 @@ def fetch_global_market_data():
 
 def fetch_trading_opportunities(opportunity_type="long", limit=15):
     """Fetch trading opportunities based on sentiment analysis."""
-    if opportunity_type == "long":
-        query = f"""
-        SELECT
-          "FE_DMV_ALL"."id",
-          "FE_DMV_ALL"."slug",
-          "FE_DMV_ALL"."name",
-          "FE_DMV_ALL"."bullish",
-          "FE_DMV_ALL"."bearish",
-          "crypto_listings_latest_1000"."symbol",
-          "crypto_listings_latest_1000"."percent_change24h",
-          "crypto_listings_latest_1000"."percent_change7d",
-          "crypto_listings_latest_1000"."percent_change30d",
-          "crypto_listings_latest_1000"."cmc_rank",
-          "crypto_listings_latest_1000"."price",
-          "crypto_listings_latest_1000"."market_cap",
-          "FE_CC_INFO_URL"."logo",
-          "FE_RATIOS"."m_rat_alpha",
-          "FE_RATIOS"."d_rat_beta",
-          "FE_RATIOS"."m_rat_omega",
-          d."Durability_Score",
-          d."Momentum_Score",
-          d."Valuation_Score"
-        FROM
-          "FE_DMV_ALL"
-        JOIN
-          "crypto_listings_latest_1000"
-        ON
-          "FE_DMV_ALL"."slug" = "crypto_listings_latest_1000"."slug"
-        JOIN
-          "FE_CC_INFO_URL"
-        ON
-          "FE_DMV_ALL"."slug" = "FE_CC_INFO_URL"."slug"
-        JOIN
-          "FE_RATIOS"
-        ON
-          "FE_DMV_ALL"."slug" = "FE_RATIOS"."slug"
-        JOIN
-          "FE_DMV_SCORES" d ON "FE_DMV_ALL"."slug" = d.slug
-        WHERE
-          "crypto_listings_latest_1000"."cmc_rank" < 100
-          AND ("FE_RATIOS"."d_rat_beta" > 1 OR "FE_RATIOS"."d_rat_beta" IS NULL)
-          AND ("FE_RATIOS"."m_rat_omega" > 1 OR "FE_RATIOS"."m_rat_omega" IS NULL)
-        ORDER BY
-          "FE_DMV_ALL"."bullish" DESC
-        LIMIT
-          {limit};
-        """
-    else:  # short opportunities
-        query = f"""
-        SELECT
-          "FE_DMV_ALL"."id",
-          "FE_DMV_ALL"."slug",
-          "FE_DMV_ALL"."name",
-          "FE_DMV_ALL"."bullish",
-          "FE_DMV_ALL"."bearish",
-          "crypto_listings_latest_1000"."symbol",
-          "crypto_listings_latest_1000"."percent_change24h",
-          "crypto_listings_latest_1000"."percent_change7d",
-          "crypto_listings_latest_1000"."percent_change30d",
-          "crypto_listings_latest_1000"."cmc_rank",
-          "crypto_listings_latest_1000"."price",
-          "crypto_listings_latest_1000"."market_cap",
-          "FE_CC_INFO_URL"."logo",
-          "FE_RATIOS"."m_rat_alpha",
-          "FE_RATIOS"."d_rat_beta",
-          "FE_RATIOS"."m_rat_omega",
-          d."Durability_Score",
-          d."Momentum_Score",
-          d."Valuation_Score"
-        FROM
-          "FE_DMV_ALL"
-        JOIN
-          "crypto_listings_latest_1000"
-        ON
-          "FE_DMV_ALL"."slug" = "crypto_listings_latest_1000"."slug"
-        JOIN
-          "FE_CC_INFO_URL"
-        ON
-          "FE_DMV_ALL"."slug" = "FE_CC_INFO_URL"."slug"
-        JOIN
-          "FE_RATIOS"
-        ON
-          "FE_DMV_ALL"."slug" = "FE_RATIOS"."slug"
-        JOIN
-          "FE_DMV_SCORES" d ON "FE_DMV_ALL"."slug" = d.slug
-        WHERE
-          "crypto_listings_latest_1000"."cmc_rank" < 100
-          AND ("FE_RATIOS"."d_rat_beta" > 1 OR "FE_RATIOS"."d_rat_beta" IS NULL)
-          AND ("FE_RATIOS"."m_rat_omega" < 2 OR "FE_RATIOS"."m_rat_omega" IS NULL)
-        ORDER BY
-          "FE_DMV_ALL"."bearish" DESC
-        LIMIT
-          {limit};
-        """
-
     try:
-        df = pd.read_sql_query(query, gcp_engine)
+        analytics = get_market_analytics()
+        if opportunity_type == "long":
+            df = analytics.long_candidates(rank_max=99, beta_min=1.0, omega_min=1.0, limit=limit)
+        else:  # short opportunities
+            df = analytics.short_candidates(rank_max=99, beta_min=1.0, omega_max=2.0, limit=limit)
 
         # Convert and format numeric columns with error handling
         numeric_cols = ['market_cap', 'price', 'percent_change24h', 'percent_change7d', 'percent_change30d',
@@ -503,7 +350,18 @@ def fetch_trading_opportunities(opportunity_type="long", limit=15):
 def close_connection():
     """Close the database connection."""
     try:
-        gcp_engine.dispose()
+        if _query_cache is not None:
+            stats = _query_cache.stats()
+            print(f"🗄️ Query cache: {stats['hits']} hits, {stats['misses']} misses")
+        if _history_store is not None:
+            stats = _history_store.stats()
+            print(f"📈 History store: {stats['syncs']} syncs, {stats['rows_fetched']} rows fetched")
+        if _logo_index is not None:
+            stats = _logo_index.stats()
+            print(f"🖼️ Logo index: {stats['hits']} hits, {stats['misses']} misses, {stats['rows_fetched']} rows fetched")
+        latency_histogram.report()
+        dispose_engine()
+        reset_market_snapshot()
         print("Database connection closed.")
     except Exception as e:
         print(f"Error closing connection: {e}")
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Shared SQLAlchemy engine factory driven by src.config.DatabaseConfig.
+
+Every database user in the scripts imports get_engine() instead of calling
+create_engine() itself, so a process holds one connection pool to the remote
+host. Connections are opened on first use, pre-pinged before checkout,
+recycled before the server drops them and capped by a statement timeout.
+
+With DB_FIXTURE_PATH set, the engine points at a local SQLite dump of the
+source tables instead (see fixture_db.py), so the pipeline can run and be
+profiled without network latency.
+"""
+
+import os
+import sys
+import threading
+from sqlalchemy import create_engine, event
+
+# Project root on the path so src.config resolves when scripts run directly
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.config import DatabaseConfig
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def build_fixture_engine(path):
+    """Create an engine on a local SQLite fixture that accepts the PostgreSQL table names."""
+    path = os.path.abspath(path)
+    engine = create_engine(f"sqlite:///{path}", connect_args={'check_same_thread': False})
+
+    @event.listens_for(engine, 'connect')
+    def _attach_public_schema(dbapi_connection, connection_record):
+        # Queries name some tables "public"."<table>"; alias the file as that schema
+        dbapi_connection.execute('ATTACH DATABASE ? AS public', (path,))
+
+    return engine
+
+
+def build_engine(db_config=None):
+    """Create a pooled engine from a DatabaseConfig (environment defaults if omitted)."""
+    db_config = db_config or DatabaseConfig()
+
+    if db_config.uses_fixture:
+        return build_fixture_engine(db_config.fixture_path)
+
+    connect_args = {
+        'connect_timeout': db_config.connection_timeout,
+        'sslmode': db_config.ssl_mode,
+        'options': f"-c statement_timeout={db_config.statement_timeout}",
+    }
+
+    return create_engine(
+        db_config.get_connection_url(),
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_timeout=db_config.connection_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_pre_ping=db_config.pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+def get_engine():
+    """Return the process-wide engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = build_engine()
+    return _engine
+
+
+def dispose_engine():
+    """Close pooled connections and drop the shared engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
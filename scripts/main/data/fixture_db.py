@@ -0,0 +1,60 @@
+"""Local SQLite dump of the source tables for offline runs and load tests.
+
+dump_fixture() copies every table the pipeline reads from the remote
+PostgreSQL database into one SQLite file. Setting DB_FIXTURE_PATH to that
+file makes get_engine() connect to it (see engine.build_fixture_engine), and
+database.py, the market snapshot and the history store run unchanged against
+it, so benchmarks and profiles are not skewed by network latency.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from .queries import run_query
+
+# Days of OHLCV kept in a dump; the full table is far larger than any chart needs
+DEFAULT_OHLCV_DAYS = 90
+
+# Source table -> dump query (:since bounds the OHLCV history)
+FIXTURE_TABLES = {
+    'crypto_listings_latest_1000': 'SELECT * FROM crypto_listings_latest_1000',
+    'FE_DMV_ALL': 'SELECT * FROM "public"."FE_DMV_ALL"',
+    'FE_DMV_SCORES': 'SELECT * FROM "FE_DMV_SCORES"',
+    'FE_RATIOS': 'SELECT * FROM "FE_RATIOS"',
+    'FE_CC_INFO_URL': 'SELECT * FROM "FE_CC_INFO_URL"',
+    'FE_FEAR_GREED_CMC': 'SELECT * FROM "FE_FEAR_GREED_CMC"',
+    '1K_coins_ohlcv': 'SELECT * FROM "public"."1K_coins_ohlcv" WHERE "timestamp" >= :since',
+    'crypto_global_latest': 'SELECT * FROM crypto_global_latest',
+}
+
+
+def dump_fixture(source_engine, path, tables=None, ohlcv_days=DEFAULT_OHLCV_DAYS):
+    """Copy the source tables into a fresh SQLite file and return row counts per table."""
+    tables = list(tables or FIXTURE_TABLES)
+    since = (datetime.now() - timedelta(days=ohlcv_days)).strftime('%Y-%m-%d')
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    counts = {}
+
+    try:
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            for table in tables:
+                sql = FIXTURE_TABLES[table]
+                params = {'since': since} if ':since' in sql else None
+                started = time.perf_counter()
+                df = run_query(source_engine, sql, params, name=f"fixture.{table}")
+                df.to_sql(table, conn, index=False, if_exists='replace')
+                counts[table] = len(df)
+                print(f"📦 {table}: {len(df)} rows ({time.perf_counter() - started:.1f}s)")
+            conn.commit()
+        # Swap in atomically so a running pipeline never reads a half-written dump
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return counts
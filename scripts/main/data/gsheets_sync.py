@@ -1,58 +1,72 @@
-import os
-import json
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import pandas as pd
-import numpy as np
-import mysql.connector
-import gspread
-import psycopg2
-import gspread_dataframe as gd
-from datetime import date, datetime, timedelta
-import time
+"""Google Sheets sync for the market dashboards.
 
-# Load the Google credentials JSON from the environment variable
-gcp_credentials_json = os.getenv('GCP_CREDENTIALS')
+SheetSync builds one DataFrame per worksheet from the run's shared market
+snapshot and pushes it through a sheets backend. Every sheet is an
+independent stage, so a single sheet can be rebuilt or pushed on its own,
+stages can run in parallel, and the built frames stay available in-process
+via ``SheetSync.frames``. Importing this module has no side effects; run it
+as a script to sync everything:
 
-# Define the required scope for Google Sheets API
-scope = ['https://spreadsheets.google.com/feeds']
+    python scripts/main/data/gsheets_sync.py [--sheets Top50Coins,MarketOverview] [--dry-run] [--parallel]
+"""
 
-# Ensure the environment variable is set
-if gcp_credentials_json:
-    try:
-        # Load credentials from the environment variable JSON
-        credentials_dict = json.loads(gcp_credentials_json)
-        credentials = ServiceAccountCredentials.from_json_keyfile_dict(credentials_dict, scope)
-        print("Credentials successfully loaded.")
-    except Exception as e:
-        print(f"Error: Failed to parse credentials from environment variable. {e}")
-        exit(1)
-else:
-    print("Error: GCP_CREDENTIALS environment variable is not set.")
-    exit(1)
-
-# Authorize the credentials
-gc = gspread.authorize(credentials)
-
-# Connect to PostgreSQL database
-con = psycopg2.connect(
-        host="34.55.195.199",
-        database="dbcp",
-        user="yogass09",
-        password="jaimaakamakhya",
-        port=5432
-    )
-
-# Execute a query to get a list of tables
-with con.cursor() as cur:
-    cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'")
-    tables = cur.fetchall()
-
-# Convert the list of tuples to a list of strings
-table_names = [table[0] for table in tables]
-
-# Print the list of table names
-print("Available tables:", table_names)
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dateutil.parser import parse as parse_datetime
+
+# Add the repository root to the path so the scripts.main packages resolve,
+# and src/ so its modules can import their siblings (as tests/conftest.py does)
+REPO_ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from scripts.main.content.formatting import (
+    LARGE_UNIT_BUCKETS, percent_series, usd_series, usd_units_series
+)
+from scripts.main.data.analytics import EXCLUDED_SYMBOLS
+from scripts.main.data.database import (
+    close_connection, get_gcp_engine, get_logo_index, get_market_analytics, get_market_snapshot
+)
+from scripts.main.data.query_cache import apply_cache_flags
+from scripts.main.data.queries import run_query
+from scripts.main.data.signals import count_signals
+from src.retry_utils import RetryConfig, RetryManager, RetryStrategy
+
+# Spreadsheet the dashboards read from; CRYPTO_SPREADSHEET_KEY overrides it
+SPREADSHEET_KEY = '1Ppif1y284fLPVIIoRzAXbPi9eUXzAyjOBr5DR-6XjSM'
+SPREADSHEET_KEY_ENV_VAR = 'CRYPTO_SPREADSHEET_KEY'
+
+# Scope required for the Google Sheets API
+SHEETS_SCOPE = ['https://spreadsheets.google.com/feeds']
+
+# Worksheet name -> SheetSync stage method, in push order
+SHEETS = {
+    'Top50Coins': 'build_top_coins',
+    'TopGainer/TopLosers': 'build_gainers_losers',
+    'BTC_SNAPSHOT': 'build_btc_snapshot',
+    'ShortOpportunities': 'build_short_opportunities',
+    'LongOpportunities': 'build_long_opportunities',
+    'MarketOverview': 'build_market_overview',
+}
+
+MAX_STAGE_WORKERS = 4
+
+# Sheets API quotas (requests per minute per user); overridable for other projects
+WRITES_PER_MINUTE_ENV_VAR = 'SOCIALS_SHEETS_WRITES_PER_MINUTE'
+READS_PER_MINUTE_ENV_VAR = 'SOCIALS_SHEETS_READS_PER_MINUTE'
+DEFAULT_REQUESTS_PER_MINUTE = 60
+# Requests allowed back to back before the limiter starts spacing them out
+QUOTA_BURST = 10
 
 # ==================== UTILITY FUNCTIONS ====================
 
@@ -133,22 +147,9 @@ def color_code_yes_no(value):
     else:
         return '/#808080'  # Gray for other values
 
-def format_market_cap(market_cap):
-    """Formats market cap with units (Million, Billion, Trillion)."""
-    if pd.isnull(market_cap):
-        return market_cap
-    try:
-        market_cap = float(market_cap)
-        if market_cap >= 1e12:
-            return f"${market_cap / 1e12:.2f} T"
-        elif market_cap >= 1e9:
-            return f"${market_cap / 1e9:.2f} B"
-        elif market_cap >= 1e6:
-            return f"${market_cap / 1e6:.2f} M"
-        else:
-            return f"${market_cap:.2f}"
-    except (ValueError, TypeError):
-        return str(market_cap)
+def format_market_cap(values):
+    """Formats a market cap column with units (Million, Billion, Trillion); blanks stay blank."""
+    return usd_units_series(values, buckets=LARGE_UNIT_BUCKETS, missing='')
 
 def clean_dataframe_for_gsheets(df):
     """
@@ -171,245 +172,8 @@ def clean_dataframe_for_gsheets(df):
     
     return df_cleaned
 
-def safe_push_to_gsheet(df, sheet_name, spreadsheet_key):
-    """Safely push DataFrame to Google Sheets with error handling"""
-    try:
-        # Clean the DataFrame
-        df_cleaned = clean_dataframe_for_gsheets(df)
-        
-        # Push to Google Sheets
-        sh = gc.open_by_key(spreadsheet_key)
-        worksheet = sh.worksheet(sheet_name)
-        worksheet.clear()
-        gd.set_with_dataframe(worksheet, df_cleaned)
-        
-        print(f"✓ Successfully pushed data to {sheet_name}")
-        return True
-        
-    except Exception as e:
-        print(f"✗ Error pushing data to {sheet_name}: {e}")
-        return False
-
-# ==================== TOP 50 COINS ====================
-
-print("Processing Top 50 coins...")
-
-query_top_100 = """
-SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap
-FROM crypto_listings_latest_1000
-WHERE cmc_rank < 50
-"""
-top_100_cc = pd.read_sql_query(query_top_100, con)
-
-# Create a list of slugs from the top_100_crypto DataFrame
-slugs = top_100_cc['slug'].tolist()
-
-# Construct the SQL query for logos
-query = """
-SELECT logo, slug FROM "FE_CC_INFO_URL"
-"""
-
-# Execute the query and fetch the data into a DataFrame
-logos_and_slugs = pd.read_sql_query(query, con)
-
-# Merge the two DataFrames on the 'slug' column
-df_top_100_daily = pd.merge(top_100_cc, logos_and_slugs, on='slug', how='left')
-
-# Convert 'price' column to numeric, handling potential errors
-df_top_100_daily['price'] = pd.to_numeric(df_top_100_daily['price'], errors='coerce')
-
-# Format the 'price' column with '$' and 2 decimal places
-df_top_100_daily['price_usd'] = df_top_100_daily['price'].apply(lambda x: f"${x:.2f}" if not pd.isnull(x) else "N/A")
-
-# Convert 'percent_change24h' column to numeric, handling potential errors
-df_top_100_daily['percent_change24h'] = pd.to_numeric(df_top_100_daily['percent_change24h'], errors='coerce')
-
-# Format the 'percent_change24h' column with 2 decimal places and add '%'
-df_top_100_daily['pct_1d'] = df_top_100_daily['percent_change24h'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-
-# Add color coding for percentage change
-df_top_100_daily['colour'] = df_top_100_daily['percent_change24h'].apply(color_code_percentage)
-
-# Apply the formatting function to the 'market_cap' column
-df_top_100_daily['mcap_units'] = df_top_100_daily['market_cap'].apply(format_market_cap)
-
-# Select specific columns from the DataFrame
-df_gsheet = df_top_100_daily[['logo','slug', 'cmc_rank', 'price_usd', 'pct_1d', 'mcap_units', 'symbol', 'colour']]
-
-# Sort by cmc_rank ascending
-df_gsheet = df_gsheet.sort_values('cmc_rank', ascending=True)
-
-# Add date time 
-df_gsheet['last_updated'] = date.today()
-
-print("Top 50 coins processed successfully")
-
-# ==================== TOP GAINERS AND LOSERS ====================
-
-print("Processing Top Gainers and Losers...")
-
-# Top 5 gainers
-query_top_gainers = """
-SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap
-FROM crypto_listings_latest_1000
-WHERE cmc_rank < 300
-ORDER BY percent_change24h DESC
-LIMIT 5
-"""
-top_5_cc = pd.read_sql_query(query_top_gainers, con)
-
-# Top 5 losers
-query_top_losers = """
-SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap
-FROM crypto_listings_latest_1000
-WHERE cmc_rank < 300
-ORDER BY percent_change24h ASC
-LIMIT 5
-"""
-bottom_5_cc = pd.read_sql_query(query_top_losers, con)
-
-# Rename columns with prefixes
-top_5_cc_renamed = top_5_cc.add_prefix('tg_')
-bottom_5_cc_renamed = bottom_5_cc.add_prefix('tl_')
-
-# Merge the two DataFrames
-top_gainers_losers = pd.merge(top_5_cc_renamed, bottom_5_cc_renamed, left_index=True, right_index=True, how='outer')
-
-# Fetch DMV data
-tg_slugs = top_gainers_losers['tg_slug'].dropna().tolist()
-tl_slugs = top_gainers_losers['tl_slug'].dropna().tolist()
-all_slugs = tg_slugs + tl_slugs
-
-# Get DMV scores
-query_dmv = """
-SELECT *
-FROM "FE_DMV_SCORES"
-"""
-tgtl_dmv_scores = pd.read_sql_query(query_dmv, con)
-
-# Merge DMV data
-merged_df = pd.merge(top_gainers_losers, tgtl_dmv_scores, left_on='tg_slug', right_on='slug', how='left')
-merged_df = merged_df.drop('slug', axis=1)
-merged_df = pd.merge(merged_df, tgtl_dmv_scores, left_on='tl_slug', right_on='slug', how='left', suffixes=('_tg', '_tl'))
-merged_df = merged_df.drop('slug', axis=1)
-
-# Clean numeric columns first
-numeric_cols = ['Durability_Score_tg', 'Momentum_Score_tg', 'Valuation_Score_tg',
-                'Durability_Score_tl', 'Momentum_Score_tl', 'Valuation_Score_tl',
-                'tg_percent_change24h', 'tl_percent_change24h']
-
-for col in numeric_cols:
-    if col in merged_df.columns:
-        merged_df[col] = pd.to_numeric(merged_df[col], errors='coerce')
-
-# DMV color coding
-merged_df['colours_tg_d'] = merged_df['Durability_Score_tg'].apply(color_code_dmv)
-merged_df['colours_tg_m'] = merged_df['Momentum_Score_tg'].apply(color_code_dmv)
-merged_df['colours_tg_v'] = merged_df['Valuation_Score_tg'].apply(color_code_dmv)
-merged_df['colours_tl_d'] = merged_df['Durability_Score_tl'].apply(color_code_dmv)
-merged_df['colours_tl_m'] = merged_df['Momentum_Score_tl'].apply(color_code_dmv)
-merged_df['colours_tl_v'] = merged_df['Valuation_Score_tl'].apply(color_code_dmv)
-
-# Percentage change color coding
-merged_df['colours_tg_pct'] = merged_df['tg_percent_change24h'].apply(color_code_percentage)
-merged_df['colours_tl_pct'] = merged_df['tl_percent_change24h'].apply(color_code_percentage)
-
-# Format percentage changes
-merged_df['tg_percent_change24h'] = merged_df['tg_percent_change24h'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-merged_df['tl_percent_change24h'] = merged_df['tl_percent_change24h'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-
-# Format numeric columns to 2 decimal places
-for column in merged_df.columns:
-    if pd.api.types.is_numeric_dtype(merged_df[column]):
-        merged_df[column] = merged_df[column].apply(lambda x: round(x, 2) if not pd.isnull(x) else x)
-
-# Add $ sign to prices
-if 'tl_price' in merged_df.columns:
-    merged_df['tl_price'] = '$' + merged_df['tl_price'].astype(str)
-if 'tg_price' in merged_df.columns:
-    merged_df['tg_price'] = '$' + merged_df['tg_price'].astype(str)
-
-# Format market caps
-if 'tg_market_cap' in merged_df.columns:
-    merged_df['tg_market_cap'] = merged_df['tg_market_cap'].apply(format_market_cap)
-if 'tl_market_cap' in merged_df.columns:
-    merged_df['tl_market_cap'] = merged_df['tl_market_cap'].apply(format_market_cap)
-
-# Add logos
-merged_df = pd.merge(merged_df, logos_and_slugs, left_on='tg_slug', right_on='slug', how='left')
-merged_df = merged_df.rename(columns={'logo': 'tg_logo'})
-merged_df = merged_df.drop('slug', axis=1)
-
-merged_df = pd.merge(merged_df, logos_and_slugs, left_on='tl_slug', right_on='slug', how='left')
-merged_df = merged_df.rename(columns={'logo': 'tl_logo'})
-merged_df = merged_df.drop('slug', axis=1)
-
-print("Top Gainers and Losers processed successfully")
-
-# ==================== BTC OVERVIEW ====================
-
-print("Processing BTC Overview...")
-
-query_top_1 = """
-SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, volume24h, market_cap, percent_change7d, percent_change30d, ytd_price_change_percentage
-FROM crypto_listings_latest_1000
-WHERE cmc_rank < 2
-"""
-top_1_cc = pd.read_sql_query(query_top_1, con)
-
-# Clean numeric columns
-numeric_btc_cols = ['price', 'percent_change24h', 'volume24h', 'market_cap', 
-                    'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
-
-for col in numeric_btc_cols:
-    if col in top_1_cc.columns:
-        top_1_cc[col] = pd.to_numeric(top_1_cc[col], errors='coerce')
-
-# Format market cap and volume
-top_1_cc['market_cap'] = top_1_cc['market_cap'].apply(format_market_cap)
-top_1_cc['volume24h'] = top_1_cc['volume24h'].apply(format_market_cap)
-
-# Color code for percentage changes
-top_1_cc['colour_percent_change24h'] = top_1_cc['percent_change24h'].apply(color_code_percentage)
-top_1_cc['colour_percent_change7d'] = top_1_cc['percent_change7d'].apply(color_code_percentage)
-top_1_cc['colour_percent_change30d'] = top_1_cc['percent_change30d'].apply(color_code_percentage)
-top_1_cc['colour_ytd_price_change_percentage'] = top_1_cc['ytd_price_change_percentage'].apply(color_code_percentage)
-
-# Format percentage columns
-top_1_cc['percent_change24h'] = top_1_cc['percent_change24h'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-top_1_cc['percent_change7d'] = top_1_cc['percent_change7d'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-top_1_cc['percent_change30d'] = top_1_cc['percent_change30d'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-top_1_cc['ytd_price_change_percentage'] = top_1_cc['ytd_price_change_percentage'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-
-# Format price
-top_1_cc['price'] = top_1_cc['price'].apply(lambda x: f"${x:.2f}" if not pd.isnull(x) else "N/A")
-
-# Fetch DMV values for Bitcoin
-query_dmv_btc = """
-SELECT *
-FROM "FE_DMV_ALL"
-WHERE slug = 'bitcoin'
-"""
-dmv_bitcoin = pd.read_sql_query(query_dmv_btc, con)
-
-# Count bullish, bearish, neutral signals
-if not dmv_bitcoin.empty:
-    dmv_bitcoin_first_row = dmv_bitcoin.iloc[0].tolist()
-    bullish_count = dmv_bitcoin_first_row.count(1)
-    bearish_count = dmv_bitcoin_first_row.count(-1)
-    neutral_count = dmv_bitcoin_first_row.count(0)
-else:
-    bullish_count = bearish_count = neutral_count = 0
-
-# Add counts to DataFrame
-top_1_cc['bullish'] = bullish_count
-top_1_cc['bearish'] = bearish_count
-top_1_cc['neutral'] = neutral_count
-
-# Calculate sentiment difference and trend
-top_1_cc['sentiment_diff'] = top_1_cc['bullish'] - top_1_cc['bearish']
-
 def classify_trend(sentiment_diff):
+    """Classify the bullish - bearish signal difference into a trend label."""
     try:
         sentiment_diff = float(sentiment_diff)
         if sentiment_diff > 4:
@@ -421,245 +185,579 @@ def classify_trend(sentiment_diff):
     except (ValueError, TypeError):
         return "Consolidating"
 
-top_1_cc['Trend'] = top_1_cc['sentiment_diff'].apply(classify_trend)
-top_1_cc['Trend_color'] = top_1_cc['Trend'].apply(trend_color)
-
-print("BTC Overview processed successfully")
-
-# ==================== LONG AND SHORT OPPORTUNITIES ====================
-
-print("Processing Long and Short Opportunities...")
-
-# Get all DMV data
-query_dmv_all = """
-SELECT *
-FROM "FE_DMV_ALL"
-"""
-dmv_all = pd.read_sql_query(query_dmv_all, con)
-
-# Get listing data for DMV
-query_for_dmv_all = """
-SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap, turnover, percent_change7d, percent_change30d
-FROM crypto_listings_latest_1000
-"""
-listing_for_dmv_all = pd.read_sql_query(query_for_dmv_all, con)
-
-# Calculate sentiment counts for each row
-dmv_all['bullish_count'] = dmv_all.apply(lambda row: row.tolist().count(1), axis=1)
-dmv_all['bearish_count'] = dmv_all.apply(lambda row: row.tolist().count(-1), axis=1)
-dmv_all['neutral_count'] = dmv_all.apply(lambda row: row.tolist().count(0), axis=1)
+def round_numeric(df):
+    """Round every numeric column to 2 decimal places, leaving blanks as they are."""
+    for column in df.columns:
+        if pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].apply(lambda x: round(x, 2) if not pd.isnull(x) else x)
+    return df
+
+def todays_date_string(today=None):
+    """Format a date as e.g. '1st Jan, 2025'."""
+    today = today or date.today()
+    day_number = today.strftime("%d")
+    day_suffix = "th" if 11 <= int(day_number) <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(int(day_number) % 10, "th")
+    return f"{day_number}{day_suffix} {today.strftime('%b, %Y')}"
+
+# ==================== SHEETS BACKENDS ====================
+
+class SheetsQuotaExceeded(Exception):
+    """Raised when the Sheets API answers 429 Too Many Requests."""
+
+# 429 responses are retried with exponential backoff until the quota window frees up
+sheets_retry_config = RetryConfig(
+    max_attempts=5,
+    base_delay=5.0,
+    max_delay=60.0,
+    strategy=RetryStrategy.EXPONENTIAL,
+    retryable_exceptions=[SheetsQuotaExceeded]
+)
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a request fits the quota."""
+
+    def __init__(self, rate_per_second, capacity, clock=time.monotonic, sleep=time.sleep):
+        """Initialize a full bucket refilled continuously at rate_per_second."""
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def for_quota(cls, per_minute, burst=QUOTA_BURST, **kwargs):
+        """Build a limiter for a per-minute quota.
+
+        The refill rate leaves room for the burst, so no 60 second window
+        sees more than per_minute requests.
+        """
+        burst = min(burst, per_minute - 1)
+        return cls((per_minute - burst) / 60.0, burst, **kwargs)
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until enough have been refilled."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+                self.waited_seconds += wait
+            self._sleep(wait)
+
+def load_credentials():
+    """Load service account credentials from the GCP_CREDENTIALS environment variable."""
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    gcp_credentials_json = os.getenv('GCP_CREDENTIALS')
+    if not gcp_credentials_json:
+        raise ValueError("GCP_CREDENTIALS environment variable is not set")
 
-def classify_sentiment(row):
     try:
-        bullish_count = int(row['bullish_count'])
-        bearish_count = int(row['bearish_count'])
-        
-        if bullish_count > bearish_count:
-            return 'Bullish'
-        elif bearish_count > bullish_count:
-            return 'Bearish'
-        else:
-            return 'Neutral'
-    except (ValueError, TypeError):
-        return 'Neutral'
-
-dmv_all['sentiment'] = dmv_all.apply(classify_sentiment, axis=1)
-
-# Merge with listing data
-dmv_all = pd.merge(listing_for_dmv_all, dmv_all, on='slug', how='left')
-
-# Clean numeric columns
-dmv_numeric_cols = ['price', 'percent_change24h', 'percent_change7d', 'percent_change30d', 'market_cap']
-for col in dmv_numeric_cols:
-    if col in dmv_all.columns:
-        dmv_all[col] = pd.to_numeric(dmv_all[col], errors='coerce')
-
-# Apply formatting
-dmv_all['market_cap'] = dmv_all['market_cap'].apply(format_market_cap)
-
-# Color code percentages
-dmv_all['colour_percent_change24h'] = dmv_all['percent_change24h'].apply(color_code_percentage)
-dmv_all['colour_percent_change7d'] = dmv_all['percent_change7d'].apply(color_code_percentage)
-dmv_all['colour_percent_change30d'] = dmv_all['percent_change30d'].apply(color_code_percentage)
-
-# Format percentages
-dmv_all['percent_change24h'] = dmv_all['percent_change24h'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-dmv_all['percent_change7d'] = dmv_all['percent_change7d'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-dmv_all['percent_change30d'] = dmv_all['percent_change30d'].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-
-# Format price
-dmv_all['price'] = dmv_all['price'].apply(lambda x: f"${x:.4f}" if not pd.isnull(x) else "N/A")
-
-# Select desired columns
-dmv_all_reduced = dmv_all[['slug', 'bullish_count', 'bearish_count', 'neutral_count', 'sentiment',
-                          'cmc_rank','price', 'percent_change24h' , 'percent_change7d', 'percent_change30d',  
-                          'market_cap','symbol','turnover','colour_percent_change30d', 'colour_percent_change7d', 
-                          'colour_percent_change24h']]
-
-# Filter by rank and remove stablecoins
-dmv_all_filtered = dmv_all_reduced[dmv_all_reduced['cmc_rank'] < 199]
-
-symbols_to_remove = ['USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'PYUSD', 'PAXG', 'FDUSD', 'USDN', 'MUSD', 'XDC', 'XAUt', 'USDD','XEC','CRO',"USDe"]
-dmv_all_filtered = dmv_all_filtered[~dmv_all_filtered['symbol'].isin(symbols_to_remove)]
-
-# Get top 10 bullish and bearish
-top_10_bullish = dmv_all_filtered.sort_values('bullish_count', ascending=False).head(10)
-top_10_bearish = dmv_all_filtered.sort_values('bearish_count', ascending=False).head(10)
-
-# Get ratios data
-query_ratios = """
-SELECT m_rat_alpha, d_rat_beta, m_rat_omega, slug
-FROM "FE_RATIOS"
-"""
-ratios_df = pd.read_sql_query(query_ratios, con)
-
-# Format ratios to 2 decimal places
-for column in ratios_df.columns:
-    if pd.api.types.is_numeric_dtype(ratios_df[column]):
-        ratios_df[column] = ratios_df[column].apply(lambda x: round(x, 2) if not pd.isnull(x) else x)
-
-# Add ratios and logos to bullish/bearish dataframes
-logos_only = logos_and_slugs[['slug', 'logo']]
-
-top_10_bullish = pd.merge(top_10_bullish, ratios_df, on='slug', how='left')
-top_10_bullish = pd.merge(top_10_bullish, logos_only, on='slug', how='left')
-
-top_10_bearish = pd.merge(top_10_bearish, ratios_df, on='slug', how='left')
-top_10_bearish = pd.merge(top_10_bearish, logos_only, on='slug', how='left')
-
-print("Long and Short Opportunities processed successfully")
-
-# ==================== GLOBAL LISTINGS LATEST ====================
+        credentials_dict = json.loads(gcp_credentials_json)
+    except ValueError as e:
+        raise ValueError(f"Failed to parse credentials from GCP_CREDENTIALS: {e}") from e
 
-print("Processing Market Overview...")
+    credentials = ServiceAccountCredentials.from_json_keyfile_dict(credentials_dict, SHEETS_SCOPE)
+    print("✅ Credentials successfully loaded.")
+    return credentials
 
-query_gll = """
-SELECT *
-FROM crypto_global_latest
-"""
-gll = pd.read_sql_query(query_gll, con)
-
-# Select only desired columns
-gll = gll[[
-    'total_market_cap', 'total_volume24h_reported', 'altcoin_volume24h_reported',
-    'altcoin_market_cap', 'total_market_cap_yesterday_percentage_change',
-    'total_volume24h_yesterday_percentage_change', 'derivatives_volume24h_reported',
-    'derivatives24h_percentage_change', 'active_crypto_currencies', 'total_crypto_currencies',
-    'active_exchanges', 'total_exchanges', 'stablecoin_volume24h_reported',
-    'stablecoin_market_cap', 'stablecoin24h_percentage_change', 'defi_volume24h_reported',
-    'defi_market_cap', 'defi24h_percentage_change', 'btc_dominance24h_percentage_change',
-    'eth_dominance24h_percentage_change', 'btc_dominance', 'eth_dominance'
-]]
-
-# Clean numeric columns
-gll_numeric_cols = [col for col in gll.columns if gll[col].dtype in ['float64', 'int64']]
-for col in gll_numeric_cols:
-    gll[col] = pd.to_numeric(gll[col], errors='coerce')
-
-# Apply color coding to percentage change columns
-percentage_change_columns = [col for col in gll.columns if 'percentage_change' in col]
-for col in percentage_change_columns:
-    gll[f'colours_{col}'] = gll[col].apply(color_code_percentage)
-
-# Format numeric values to 2 decimal places
-for column in gll.columns:
-    if pd.api.types.is_numeric_dtype(gll[column]):
-        gll[column] = gll[column].apply(lambda x: round(x, 2) if not pd.isnull(x) else x)
-
-# Format percentage columns
-for column in gll.columns:
-    if column.endswith('percentage_change') and pd.api.types.is_numeric_dtype(gll[column]):
-        gll[column] = gll[column].apply(lambda x: f"{x:.2f}%" if not pd.isnull(x) else "N/A")
-
-# Format market cap and volume columns
-columns_to_format = [
-    'total_market_cap', 'defi_market_cap', 'stablecoin_market_cap',
-    'total_volume24h_reported', 'defi_volume24h_reported', 'altcoin_volume24h_reported',
-    'stablecoin_volume24h_reported', 'altcoin_market_cap', 'derivatives_volume24h_reported'
-]
-
-for column in columns_to_format:
-    if column in gll.columns:
-        gll[column] = gll[column].apply(format_market_cap)
-
-# Add date and time information
-today = date.today()
-day_number = today.strftime("%d")
-day_suffix = "th" if 11 <= int(day_number) <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(int(day_number) % 10, "th")
-todays_date_str = f"{day_number}{day_suffix} {today.strftime('%b, %Y')}"
-today_day_name = date.today().strftime("%A")
-current_time = datetime.now().strftime("%H:%M:%S")
-
-gll['Todays_Date'] = todays_date_str
-gll['Todays_Day'] = today_day_name
-gll['Current_Time'] = current_time
-
-# Convert to strings
-gll['Todays_Date'] = gll['Todays_Date'].astype(str)
-gll['Todays_Day'] = gll['Todays_Day'].astype(str)
-gll['Current_Time'] = gll['Current_Time'].astype(str)
-
-# Alt season calculation
-query_seasons = """
-SELECT slug, cmc_rank, percent_change90d
-FROM crypto_listings_latest_1000
-WHERE cmc_rank < 101
-"""
-seasons_df = pd.read_sql_query(query_seasons, con)
+def dataframe_to_grid(df):
+    """Convert a DataFrame to the header + rows grid of strings a worksheet holds."""
+    rows = df.astype(object).where(df.notna(), '').values.tolist()
+    return [[str(value) for value in row] for row in [list(df.columns)] + rows]
 
-# Remove stablecoins
-seasons_df = seasons_df[~seasons_df['slug'].isin(symbols_to_remove)]
+def _same_cell(current, new):
+    """Compare a cell read from a sheet with the value about to be written.
 
-# Get Bitcoin's 24h percentage change
-try:
-    bitcoin_return_str = top_1_cc['percent_change24h'].iloc[0]
-    if isinstance(bitcoin_return_str, str) and '%' in bitcoin_return_str:
-        bitcoin_return = float(bitcoin_return_str.replace('%', ''))
-    else:
-        bitcoin_return = float(bitcoin_return_str)
-except (ValueError, TypeError, IndexError):
-    bitcoin_return = 0
-
-def compare_returns(row):
+    Sheets renders numbers, dates and times in its own way (e.g. "1.0" is
+    shown as "1" and "2025-01-31" as "1/31/2025"), so such cells compare by
+    value rather than by text.
+    """
+    if current == new:
+        return True
     try:
-        coin_return = float(row['percent_change90d'])
-        if coin_return > bitcoin_return:
-            return 1
-        else:
-            return -1
-    except (ValueError, TypeError):
-        return 0
-
-seasons_df['vs_bitcoin_90d'] = seasons_df.apply(compare_returns, axis=1)
-
-# Count altcoin season indicator
-count_1 = seasons_df['vs_bitcoin_90d'].value_counts().get(1, 0)
-count_minus_1 = seasons_df['vs_bitcoin_90d'].value_counts().get(-1, 0)
-
-alt_season_value = 'YES' if count_1 > 72 else 'NO'
-gll['alt_season'] = alt_season_value
-gll['colour_alt_season'] = color_code_yes_no(alt_season_value)
+        return float(current) == float(new)
+    except ValueError:
+        pass
+    if not (any(ch.isdigit() for ch in current) and any(ch.isdigit() for ch in new)):
+        return False
+    try:
+        return parse_datetime(current) == parse_datetime(new)
+    except (ValueError, OverflowError):
+        return False
 
-print("Market Overview processed successfully")
+def diff_grid(current, grid):
+    """Plan a diff write of grid over the current worksheet values.
 
-# ==================== PUSH TO GOOGLE SHEETS ====================
+    Returns (updates, unchanged) where updates holds one batch_update entry
+    per run of changed cells in a row, or None when the shape differs and
+    the worksheet needs a full rewrite.
+    """
+    from gspread.utils import rowcol_to_a1
 
-print("\nPushing data to Google Sheets...")
+    width = len(grid[0]) if grid else 0
+    if (not current or len(current) != len(grid) or len(current[0]) != width
+            or any(len(row) > width for row in current)):
+        return None
 
-spreadsheet_key = '1Ppif1y284fLPVIIoRzAXbPi9eUXzAyjOBr5DR-6XjSM'
+    updates = []
+    unchanged = 0
+    for row_number, (old_row, new_row) in enumerate(zip(current, grid), start=1):
+        # get_all_values() drops trailing blank cells; pad them back
+        old_row = old_row + [''] * (width - len(old_row))
+        run_start = None
+        for col_number in range(1, width + 2):
+            changed = col_number <= width and not _same_cell(old_row[col_number - 1], new_row[col_number - 1])
+            if changed and run_start is None:
+                run_start = col_number
+            elif not changed and run_start is not None:
+                updates.append({
+                    'range': f"{rowcol_to_a1(row_number, run_start)}:{rowcol_to_a1(row_number, col_number - 1)}",
+                    'values': [new_row[run_start - 1:col_number - 1]],
+                })
+                run_start = None
+            if col_number <= width and not changed:
+                unchanged += 1
+    return updates, unchanged
+
+def _is_quota_error(error):
+    """Check whether a gspread APIError carries a 429 response."""
+    return getattr(getattr(error, 'response', None), 'status_code', None) == 429
+
+def _quota_from_env(name):
+    """Read a per-minute request quota from the environment."""
+    return int(os.getenv(name, DEFAULT_REQUESTS_PER_MINUTE))
+
+class GspreadBackend:
+    """Writes worksheets of one spreadsheet through gspread.
+
+    The spreadsheet and its worksheet list are fetched once and shared by
+    concurrent writes. Every API request first takes a token from the read or
+    write limiter, and 429 responses are retried through a RetryManager.
+    """
 
-# Push all dataframes to their respective sheets
-safe_push_to_gsheet(df_gsheet, 'Top50Coins', spreadsheet_key)
-safe_push_to_gsheet(merged_df, 'TopGainer/TopLosers', spreadsheet_key)
-safe_push_to_gsheet(top_1_cc, 'BTC_SNAPSHOT', spreadsheet_key)
-safe_push_to_gsheet(top_10_bearish, 'ShortOpportunities', spreadsheet_key)
-safe_push_to_gsheet(top_10_bullish, 'LongOpportunities', spreadsheet_key)
-safe_push_to_gsheet(gll, 'MarketOverview', spreadsheet_key)
+    def __init__(self, spreadsheet_key=None, client=None, read_limiter=None, write_limiter=None,
+                 retry_manager=None):
+        """Initialize the backend; the client is authorized on first write when not given."""
+        self.spreadsheet_key = spreadsheet_key or os.getenv(SPREADSHEET_KEY_ENV_VAR) or SPREADSHEET_KEY
+        self._client = client
+        self._worksheets = None
+        self._lock = threading.Lock()
+        self.read_limiter = read_limiter or TokenBucket.for_quota(_quota_from_env(READS_PER_MINUTE_ENV_VAR))
+        self.write_limiter = write_limiter or TokenBucket.for_quota(_quota_from_env(WRITES_PER_MINUTE_ENV_VAR))
+        self.retry_manager = retry_manager or RetryManager(sheets_retry_config, "gsheets")
+
+        self.cells_written = 0
+        self.cells_unchanged = 0
+        self.full_rewrites = 0
+
+    def _request(self, limiter, func, *args, tokens=1, **kwargs):
+        """Make one rate-limited API call, raising SheetsQuotaExceeded on 429."""
+        limiter.acquire(tokens)
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if _is_quota_error(e):
+                raise SheetsQuotaExceeded(str(e)) from e
+            raise
+
+    def worksheet(self, sheet_name):
+        """Return a worksheet, opening the spreadsheet and listing its worksheets once."""
+        with self._lock:
+            if self._worksheets is None:
+                if self._client is None:
+                    import gspread
+                    self._client = gspread.authorize(load_credentials())
+                spreadsheet = self._request(self.read_limiter, self._client.open_by_key, self.spreadsheet_key)
+                self._worksheets = {ws.title: ws for ws in self._request(self.read_limiter, spreadsheet.worksheets)}
+        if sheet_name not in self._worksheets:
+            raise ValueError(f"Worksheet '{sheet_name}' not found in spreadsheet {self.spreadsheet_key}")
+        return self._worksheets[sheet_name]
+
+    def write(self, sheet_name, df):
+        """Write a DataFrame to a worksheet, sending only the cells that changed.
+
+        The current values are read once and compared cell by cell; changed
+        runs go out in a single batch_update. The worksheet is cleared and
+        rewritten only when the shape differs. Quota errors are retried.
+        Returns the write counters.
+        """
+        stats = self.retry_manager.execute_sync(self._write_once, sheet_name, df)
+
+        with self._lock:
+            self.cells_written += stats['cells_written']
+            self.cells_unchanged += stats['cells_unchanged']
+            self.full_rewrites += stats['full_rewrite']
+        return stats
+
+    def _write_once(self, sheet_name, df):
+        """Read, diff and write one worksheet."""
+        worksheet = self.worksheet(sheet_name)
+        grid = dataframe_to_grid(df)
+        plan = diff_grid(self._request(self.read_limiter, worksheet.get_all_values), grid)
+
+        if plan is None:
+            import gspread_dataframe as gd
+
+            self._request(self.write_limiter, worksheet.clear)
+            # set_with_dataframe may resize the worksheet before writing the cells
+            self._request(self.write_limiter, gd.set_with_dataframe, worksheet, df, tokens=2)
+            return {'cells_written': sum(len(row) for row in grid), 'cells_unchanged': 0, 'full_rewrite': True}
+
+        updates, unchanged = plan
+        if updates:
+            self._request(self.write_limiter, worksheet.batch_update, updates, value_input_option='USER_ENTERED')
+        return {'cells_written': sum(len(update['values'][0]) for update in updates),
+                'cells_unchanged': unchanged, 'full_rewrite': False}
+
+    def stats(self):
+        """Return write counters across all worksheets."""
+        return {'cells_written': self.cells_written, 'cells_unchanged': self.cells_unchanged,
+                'full_rewrites': self.full_rewrites}
+
+class MemorySheetsBackend:
+    """Keeps written worksheets in a dict, for dry runs and tests."""
+
+    def __init__(self):
+        """Initialize an empty set of sheets."""
+        self.sheets = {}
+
+    def write(self, sheet_name, df):
+        """Store a copy of the DataFrame under the worksheet name."""
+        self.sheets[sheet_name] = df.copy()
+        return {'cells_written': df.size + len(df.columns), 'cells_unchanged': 0, 'full_rewrite': True}
+
+# ==================== SHEET SYNC PIPELINE ====================
+
+class SheetSync:
+    """Builds and pushes the dashboard worksheets as independent stages."""
+
+    def __init__(self, backend=None, engine=None, snapshot=None, analytics=None, logo_index=None):
+        """Initialize the pipeline; unset sources fall back to the run's shared instances."""
+        self.backend = backend if backend is not None else GspreadBackend()
+        self._engine = engine
+        self._snapshot = snapshot
+        self._analytics = analytics
+        self._logo_index = logo_index
+
+        # Built DataFrames by worksheet name, reusable in-process
+        self.frames = {}
+        self._frames_lock = threading.Lock()
+        self._dmv_signals = None
+        self._dmv_signals_lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        """Return the market snapshot the stages read from."""
+        return self._snapshot if self._snapshot is not None else get_market_snapshot()
+
+    @property
+    def analytics(self):
+        """Return the named analytics queries over the snapshot."""
+        return self._analytics if self._analytics is not None else get_market_analytics()
+
+    @property
+    def logo_index(self):
+        """Return the slug -> logo index."""
+        return self._logo_index if self._logo_index is not None else get_logo_index()
+
+    @property
+    def engine(self):
+        """Return the database engine used for queries outside the snapshot."""
+        return self._engine if self._engine is not None else get_gcp_engine()
+
+    def listings(self):
+        """Return a copy of the latest listings."""
+        return self.snapshot.table('listings').copy()
+
+    def dmv_signals(self):
+        """Return every FE_DMV_ALL row with its signal columns, read once per pipeline."""
+        with self._dmv_signals_lock:
+            if self._dmv_signals is None:
+                # The snapshot keeps only the signal counts; count_signals needs the raw columns
+                self._dmv_signals = run_query(self.engine, 'SELECT * FROM "FE_DMV_ALL"', name='gsheets.dmv_all')
+            return self._dmv_signals
+
+    # ---------- stages ----------
+
+    def build_top_coins(self):
+        """Build the Top50Coins sheet."""
+        listings = self.listings()
+        df = listings[listings['cmc_rank'] < 50][
+            ['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'market_cap']
+        ].copy()
+        df['logo'] = self.logo_index.map(df['slug'])
+
+        df['price'] = pd.to_numeric(df['price'], errors='coerce')
+        df['price_usd'] = usd_series(df['price'])
+        df['percent_change24h'] = pd.to_numeric(df['percent_change24h'], errors='coerce')
+        df['pct_1d'] = percent_series(df['percent_change24h'])
+        df['colour'] = df['percent_change24h'].apply(color_code_percentage)
+        df['mcap_units'] = format_market_cap(df['market_cap'])
+
+        df = df[['logo', 'slug', 'cmc_rank', 'price_usd', 'pct_1d', 'mcap_units', 'symbol', 'colour']]
+        df = df.sort_values('cmc_rank', ascending=True).reset_index(drop=True)
+        df['last_updated'] = date.today()
+        return df
+
+    def build_gainers_losers(self):
+        """Build the TopGainer/TopLosers sheet from the top 5 movers each way of the top 300."""
+        mover_cols = ['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'market_cap']
+        gainers = self.analytics.top_movers(n=5, direction='gainers', rank_max=299)[mover_cols].reset_index(drop=True)
+        losers = self.analytics.top_movers(n=5, direction='losers', rank_max=299)[mover_cols].reset_index(drop=True)
+
+        movers = pd.merge(gainers.add_prefix('tg_'), losers.add_prefix('tl_'),
+                          left_index=True, right_index=True, how='outer')
+
+        # DMV scores for the gainers and losers only
+        slugs = movers['tg_slug'].dropna().tolist() + movers['tl_slug'].dropna().tolist()
+        dmv_scores = self.snapshot.table('dmv_scores')
+        dmv_scores = dmv_scores[dmv_scores['slug'].isin(slugs)]
+
+        df = pd.merge(movers, dmv_scores, left_on='tg_slug', right_on='slug', how='left').drop('slug', axis=1)
+        df = pd.merge(df, dmv_scores, left_on='tl_slug', right_on='slug', how='left',
+                      suffixes=('_tg', '_tl')).drop('slug', axis=1)
+
+        numeric_cols = ['Durability_Score_tg', 'Momentum_Score_tg', 'Valuation_Score_tg',
+                        'Durability_Score_tl', 'Momentum_Score_tl', 'Valuation_Score_tl',
+                        'tg_percent_change24h', 'tl_percent_change24h']
+        for col in numeric_cols:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        for side in ('tg', 'tl'):
+            df[f'colours_{side}_d'] = df[f'Durability_Score_{side}'].apply(color_code_dmv)
+            df[f'colours_{side}_m'] = df[f'Momentum_Score_{side}'].apply(color_code_dmv)
+            df[f'colours_{side}_v'] = df[f'Valuation_Score_{side}'].apply(color_code_dmv)
+        df['colours_tg_pct'] = df['tg_percent_change24h'].apply(color_code_percentage)
+        df['colours_tl_pct'] = df['tl_percent_change24h'].apply(color_code_percentage)
+
+        df['tg_percent_change24h'] = percent_series(df['tg_percent_change24h'])
+        df['tl_percent_change24h'] = percent_series(df['tl_percent_change24h'])
+
+        df = round_numeric(df)
+
+        for side in ('tg', 'tl'):
+            df[f'{side}_price'] = '$' + df[f'{side}_price'].astype(str)
+            df[f'{side}_market_cap'] = format_market_cap(df[f'{side}_market_cap'])
+            df[f'{side}_logo'] = self.logo_index.map(df[f'{side}_slug'])
+        return df
+
+    def build_btc_snapshot(self):
+        """Build the BTC_SNAPSHOT sheet."""
+        listings = self.listings()
+        df = listings[listings['cmc_rank'] < 2][
+            ['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h', 'volume24h',
+             'market_cap', 'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
+        ].reset_index(drop=True)
+
+        numeric_cols = ['price', 'percent_change24h', 'volume24h', 'market_cap',
+                        'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
+        for col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        df['market_cap'] = format_market_cap(df['market_cap'])
+        df['volume24h'] = format_market_cap(df['volume24h'])
+
+        pct_cols = ['percent_change24h', 'percent_change7d', 'percent_change30d', 'ytd_price_change_percentage']
+        for col in pct_cols:
+            df[f'colour_{col}'] = df[col].apply(color_code_percentage)
+        for col in pct_cols:
+            df[col] = percent_series(df[col])
+        df['price'] = usd_series(df['price'])
+
+        # Signal counts for Bitcoin, from the shared FE_DMV_ALL read
+        dmv_all = self.dmv_signals()
+        dmv_bitcoin = dmv_all[dmv_all['slug'] == 'bitcoin'].reset_index(drop=True)
+        if not dmv_bitcoin.empty:
+            btc_counts = count_signals(dmv_bitcoin).iloc[0]
+            bullish_count = int(btc_counts['bullish_count'])
+            bearish_count = int(btc_counts['bearish_count'])
+            neutral_count = int(btc_counts['neutral_count'])
+        else:
+            bullish_count = bearish_count = neutral_count = 0
+
+        df['bullish'] = bullish_count
+        df['bearish'] = bearish_count
+        df['neutral'] = neutral_count
+        df['sentiment_diff'] = df['bullish'] - df['bearish']
+        df['Trend'] = df['sentiment_diff'].apply(classify_trend)
+        df['Trend_color'] = df['Trend'].apply(trend_color)
+        return df
+
+    def _opportunities(self, count_column):
+        """Return the top 10 coins of the top 200 by a signal count, with ratios and logos."""
+        dmv_all = self.dmv_signals()
+        dmv_all = dmv_all.join(count_signals(dmv_all))
+
+        listing_cols = ['slug', 'cmc_rank', 'last_updated', 'symbol', 'price', 'percent_change24h',
+                        'market_cap', 'turnover', 'percent_change7d', 'percent_change30d']
+        df = pd.merge(self.listings()[listing_cols], dmv_all, on='slug', how='left')
+
+        for col in ['price', 'percent_change24h', 'percent_change7d', 'percent_change30d', 'market_cap']:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        df['market_cap'] = format_market_cap(df['market_cap'])
+        pct_cols = ['percent_change24h', 'percent_change7d', 'percent_change30d']
+        for col in pct_cols:
+            df[f'colour_{col}'] = df[col].apply(color_code_percentage)
+        for col in pct_cols:
+            df[col] = percent_series(df[col])
+        df['price'] = usd_series(df['price'], decimals=4)
+
+        df = df[['slug', 'bullish_count', 'bearish_count', 'neutral_count', 'sentiment',
+                 'cmc_rank', 'price', 'percent_change24h', 'percent_change7d', 'percent_change30d',
+                 'market_cap', 'symbol', 'turnover', 'colour_percent_change30d', 'colour_percent_change7d',
+                 'colour_percent_change24h']]
+
+        # Top 200 by rank, stablecoins removed
+        df = df[df['cmc_rank'] < 199]
+        df = df[~df['symbol'].isin(EXCLUDED_SYMBOLS)]
+        df = df.sort_values(count_column, ascending=False).head(10)
+
+        ratios = round_numeric(self.snapshot.table('ratios')[['m_rat_alpha', 'd_rat_beta', 'm_rat_omega', 'slug']].copy())
+        df = pd.merge(df, ratios, on='slug', how='left')
+        df['logo'] = self.logo_index.map(df['slug'])
+        return df
+
+    def build_long_opportunities(self):
+        """Build the LongOpportunities sheet: the 10 coins with the most bullish signals."""
+        return self._opportunities('bullish_count')
+
+    def build_short_opportunities(self):
+        """Build the ShortOpportunities sheet: the 10 coins with the most bearish signals."""
+        return self._opportunities('bearish_count')
+
+    def build_market_overview(self):
+        """Build the MarketOverview sheet from the global metrics and the alt season check."""
+        df = self.snapshot.table('global').copy()
+
+        numeric_cols = [col for col in df.columns if df[col].dtype in ['float64', 'int64']]
+        for col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        for col in [col for col in df.columns if 'percentage_change' in col]:
+            df[f'colours_{col}'] = df[col].apply(color_code_percentage)
+
+        df = round_numeric(df)
+
+        for column in df.columns:
+            if column.endswith('percentage_change') and pd.api.types.is_numeric_dtype(df[column]):
+                df[column] = percent_series(df[column])
+
+        columns_to_format = [
+            'total_market_cap', 'defi_market_cap', 'stablecoin_market_cap',
+            'total_volume24h_reported', 'defi_volume24h_reported', 'altcoin_volume24h_reported',
+            'stablecoin_volume24h_reported', 'altcoin_market_cap', 'derivatives_volume24h_reported'
+        ]
+        for column in columns_to_format:
+            if column in df.columns:
+                df[column] = format_market_cap(df[column])
+
+        df['Todays_Date'] = todays_date_string()
+        df['Todays_Day'] = date.today().strftime("%A")
+        df['Current_Time'] = datetime.now().strftime("%H:%M:%S")
+
+        # Alt season: share of the top 100 (excluding stablecoins) beating BTC over 90 days
+        alt_season = self.analytics.alt_season_ratio(rank_max=100)
+        print(f"Alt season: {alt_season['outperformers']}/{alt_season['total']} coins beat BTC over 90d")
+
+        alt_season_value = 'YES' if alt_season['is_alt_season'] else 'NO'
+        df['alt_season'] = alt_season_value
+        df['colour_alt_season'] = color_code_yes_no(alt_season_value)
+        return df
+
+    # ---------- orchestration ----------
+
+    def build(self, sheet_name):
+        """Return the DataFrame for one worksheet, building it on first use."""
+        if sheet_name not in SHEETS:
+            raise ValueError(f"Unknown sheet '{sheet_name}'. Expected one of: {', '.join(SHEETS)}")
+
+        with self._frames_lock:
+            if sheet_name in self.frames:
+                return self.frames[sheet_name]
+
+        print(f"Processing {sheet_name}...")
+        df = getattr(self, SHEETS[sheet_name])()
+        with self._frames_lock:
+            self.frames[sheet_name] = df
+        print(f"{sheet_name} processed successfully")
+        return df
+
+    def build_all(self, sheets=None, parallel=False):
+        """Build the selected worksheets (all by default), optionally in parallel threads."""
+        sheets = list(sheets or SHEETS)
+        if parallel and len(sheets) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_STAGE_WORKERS, len(sheets))) as pool:
+                frames = list(pool.map(self.build, sheets))
+        else:
+            frames = [self.build(sheet) for sheet in sheets]
+        return dict(zip(sheets, frames))
+
+    def push(self, sheet_name):
+        """Build one worksheet if needed and write it through the backend."""
+        try:
+            stats = self.backend.write(sheet_name, clean_dataframe_for_gsheets(self.build(sheet_name)))
+            mode = "full rewrite" if stats['full_rewrite'] else "diff"
+            print(f"✓ Successfully pushed data to {sheet_name} "
+                  f"({mode}: {stats['cells_written']} cells written, {stats['cells_unchanged']} unchanged)")
+            return True
+        except Exception as e:
+            print(f"✗ Error pushing data to {sheet_name}: {e}")
+            return False
+
+    def run(self, sheets=None, parallel=False):
+        """Build and push the selected worksheets; returns {sheet name: pushed successfully}."""
+        sheets = list(sheets or SHEETS)
+        print("\nPushing data to Google Sheets...")
+        if parallel and len(sheets) > 1:
+            # Each worker builds and pushes one sheet; the backend's limiter paces the API calls
+            with ThreadPoolExecutor(max_workers=min(MAX_STAGE_WORKERS, len(sheets))) as pool:
+                return dict(zip(sheets, pool.map(self.push, sheets)))
+        return {sheet: self.push(sheet) for sheet in sheets}
+
+def main(argv=None):
+    """Sync the dashboard worksheets; returns a process exit code."""
+    argv = apply_cache_flags(list(sys.argv[1:] if argv is None else argv))
+
+    parser = argparse.ArgumentParser(description="Sync market data to the Google Sheets dashboards")
+    parser.add_argument('--sheets', help="Comma-separated worksheet names (default: all)")
+    parser.add_argument('--dry-run', action='store_true', help="Build the sheets without writing to Google Sheets")
+    parser.add_argument('--parallel', action='store_true', help="Build and push the sheets concurrently")
+    args = parser.parse_args(argv)
+
+    sheets = [name.strip() for name in args.sheets.split(',')] if args.sheets else None
+    unknown = [name for name in sheets or [] if name not in SHEETS]
+    if unknown:
+        parser.error(f"unknown sheets: {', '.join(unknown)}")
 
-print("\n" + "="*50)
-print("ALL PROCESSING COMPLETED SUCCESSFULLY")
-print("="*50)
+    try:
+        backend = MemorySheetsBackend() if args.dry_run else GspreadBackend()
+        results = SheetSync(backend=backend).run(sheets, parallel=args.parallel)
+        if isinstance(backend, GspreadBackend):
+            stats = backend.stats()
+            print(f"📊 Sheets writes: {stats['cells_written']} cells written, "
+                  f"{stats['cells_unchanged']} unchanged, {stats['full_rewrites']} full rewrites")
+    finally:
+        # Report query latency and dispose of the engine
+        close_connection()
+
+    failed = [sheet for sheet, ok in results.items() if not ok]
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"SYNC FINISHED WITH {len(failed)} FAILED SHEET(S): {', '.join(failed)}")
+    else:
+        print("ALL PROCESSING COMPLETED SUCCESSFULLY")
+    print("=" * 50)
+    return 1 if failed else 0
 
-# Close database connection
-con.close()
-print("Database connection closed.")
+if __name__ == '__main__':
+    sys.exit(main())
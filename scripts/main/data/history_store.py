@@ -0,0 +1,159 @@
+"""Local append-only store for daily history series.
+
+The BTC slides chart the last 30 days of Fear & Greed and 31 daily BTC closes.
+Those rows never change once the day is over, so instead of re-reading the
+window from PostgreSQL on every call the store keeps them in a local SQLite
+file and only fetches rows at or after its high-water mark (the newest stored
+timestamp is re-read so an in-progress day is updated). History windows are
+then served from disk; after the first sync of the day a run costs no remote
+query until the sync interval passes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from .query_cache import CACHE_DISABLED_ENV_VAR, CACHE_REFRESH_ENV_VAR, _env_flag
+from .queries import run_query
+
+# Environment overrides
+HISTORY_DIR_ENV_VAR = 'SOCIALS_HISTORY_DIR'
+HISTORY_SYNC_INTERVAL_ENV_VAR = 'SOCIALS_HISTORY_SYNC_INTERVAL'
+
+DEFAULT_HISTORY_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.cache', 'history')
+DEFAULT_SYNC_INTERVAL_SECONDS = 3600
+
+# Lower bound for the first sync of an empty series
+EPOCH = '1970-01-01 00:00:00'
+
+# Series name -> stored columns, served window size and delta query.
+# Delta queries take :since (high-water mark) and :limit (window size); rows
+# older than the newest window are never needed, so LIMIT keeps catch-up small.
+HISTORY_SERIES = {
+    'fear_greed': {
+        'columns': ('timestamp', 'fear_greed_index', 'sentiment'),
+        'window': 30,
+        'sql': """
+            SELECT timestamp, fear_greed_index, sentiment
+            FROM "FE_FEAR_GREED_CMC"
+            WHERE timestamp >= :since
+            ORDER BY timestamp DESC
+            LIMIT :limit
+        """,
+        'params': {},
+    },
+    'btc_ohlcv': {
+        'columns': ('timestamp', 'slug', 'name', 'close'),
+        'window': 31,
+        'sql': """
+            SELECT "timestamp", "slug", "name", "close"
+            FROM "public"."1K_coins_ohlcv"
+            WHERE "slug" = :slug AND "timestamp" >= :since
+            ORDER BY "timestamp" DESC
+            LIMIT :limit
+        """,
+        'params': {'slug': 'bitcoin'},
+    },
+}
+
+
+def _timestamp_text(values):
+    """Normalize timestamps to sortable 'YYYY-MM-DD HH:MM:SS' text (UTC if tz-aware)."""
+    stamps = pd.to_datetime(values)
+    if stamps.dt.tz is not None:
+        stamps = stamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return stamps.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class HistoryStore:
+    """SQLite-backed time-series store with high-water-mark delta sync."""
+
+    def __init__(self, history_dir=None, sync_interval=None, enabled=None, refresh=None):
+        """Initialize the store; unset arguments fall back to environment settings."""
+        self.history_dir = os.path.abspath(history_dir or os.getenv(HISTORY_DIR_ENV_VAR, DEFAULT_HISTORY_DIR))
+        self.path = os.path.join(self.history_dir, 'history.sqlite')
+        self.sync_interval = float(sync_interval if sync_interval is not None
+                                   else os.getenv(HISTORY_SYNC_INTERVAL_ENV_VAR, DEFAULT_SYNC_INTERVAL_SECONDS))
+        # Shares the query cache switches: --no-cache bypasses the store, --refresh forces a sync
+        self.enabled = (not _env_flag(CACHE_DISABLED_ENV_VAR)) if enabled is None else enabled
+        self.refresh = _env_flag(CACHE_REFRESH_ENV_VAR) if refresh is None else refresh
+
+        self.syncs = 0
+        self.rows_fetched = 0
+        self._lock = threading.Lock()
+        self._synced_this_run = set()
+
+    def _connect(self):
+        """Open the store, creating the series tables on first use."""
+        os.makedirs(self.history_dir, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE IF NOT EXISTS sync_state (series TEXT PRIMARY KEY, synced_at REAL)')
+        for name, spec in HISTORY_SERIES.items():
+            columns = ', '.join(f'"{column}"' for column in spec['columns'])
+            conn.execute(f'CREATE TABLE IF NOT EXISTS "{name}" ({columns}, PRIMARY KEY ("timestamp"))')
+        return conn
+
+    def high_water_mark(self, name):
+        """Return the newest stored timestamp of a series, or None when empty."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(f'SELECT MAX("timestamp") FROM "{name}"').fetchone()
+        return row[0]
+
+    def _needs_sync(self, conn, name):
+        """Check whether a series is due for a delta fetch."""
+        if self.refresh:
+            return name not in self._synced_this_run
+        row = conn.execute('SELECT synced_at FROM sync_state WHERE series = ?', (name,)).fetchone()
+        return row is None or time.time() - row[0] > self.sync_interval
+
+    def sync(self, name, engine, force=False):
+        """Fetch rows at or after the high-water mark and upsert them; returns rows fetched."""
+        spec = HISTORY_SERIES[name]
+        with self._lock, closing(self._connect()) as conn:
+            if not force and not self._needs_sync(conn, name):
+                return 0
+
+            since = conn.execute(f'SELECT MAX("timestamp") FROM "{name}"').fetchone()[0] or EPOCH
+            params = {**spec['params'], 'since': since, 'limit': spec['window']}
+            rows = run_query(engine, spec['sql'], params, name=f"history.{name}")
+
+            if not rows.empty:
+                rows = rows[list(spec['columns'])].copy()
+                rows['timestamp'] = _timestamp_text(rows['timestamp'])
+                placeholders = ', '.join('?' for _ in spec['columns'])
+                conn.executemany(f'INSERT OR REPLACE INTO "{name}" VALUES ({placeholders})',
+                                 rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None))
+
+            conn.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (name, time.time()))
+            conn.commit()
+
+            self._synced_this_run.add(name)
+            self.syncs += 1
+            self.rows_fetched += len(rows)
+            return len(rows)
+
+    def window(self, name, engine, size=None):
+        """Return the newest rows of a series (newest first), syncing first when due."""
+        spec = HISTORY_SERIES[name]
+        size = size or spec['window']
+
+        if not self.enabled:
+            params = {**spec['params'], 'since': EPOCH, 'limit': size}
+            return run_query(engine, spec['sql'], params, name=f"history.{name}")
+
+        self.sync(name, engine)
+        columns = ', '.join(f'"{column}"' for column in spec['columns'])
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f'SELECT {columns} FROM "{name}" ORDER BY "timestamp" DESC LIMIT ?', (size,)).fetchall()
+
+        df = pd.DataFrame(rows, columns=list(spec['columns']))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    def stats(self):
+        """Return sync counters for reporting."""
+        return {'syncs': self.syncs, 'rows_fetched': self.rows_fetched}
@@ -0,0 +1,145 @@
+"""Persistent slug -> logo URL index.
+
+Logo URLs in FE_CC_INFO_URL almost never change, yet every slide used to
+join or re-read that table. The index loads the full table once, keeps it in
+a local JSON file and answers lookups from an in-memory dict. Between full
+refreshes (weekly by default) only slugs it has never seen are fetched, in
+one batched query per lookup, so new coins pick up their logo without
+re-reading the table.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from .query_cache import CACHE_DISABLED_ENV_VAR, CACHE_REFRESH_ENV_VAR, _env_flag
+from .queries import run_query
+
+# Environment overrides
+LOGO_INDEX_DIR_ENV_VAR = 'SOCIALS_LOGO_INDEX_DIR'
+LOGO_INDEX_REFRESH_INTERVAL_ENV_VAR = 'SOCIALS_LOGO_INDEX_REFRESH_INTERVAL'
+
+DEFAULT_LOGO_INDEX_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.cache', 'logos')
+DEFAULT_REFRESH_INTERVAL_SECONDS = 7 * 24 * 3600
+
+FULL_SQL = 'SELECT slug, logo FROM "FE_CC_INFO_URL"'
+# IN with an expanding bind parameter runs on PostgreSQL and on the SQLite fixture
+DELTA_SQL = 'SELECT slug, logo FROM "FE_CC_INFO_URL" WHERE slug IN :slugs'
+
+
+class LogoIndex:
+    """In-memory slug -> logo map backed by a local file, refreshed incrementally."""
+
+    def __init__(self, engine=None, index_dir=None, refresh_interval=None, enabled=None, refresh=None,
+                 logos=None):
+        """Initialize the index; logos preloads a mapping (no database or file access)."""
+        self.engine = engine
+        self.index_dir = os.path.abspath(index_dir or os.getenv(LOGO_INDEX_DIR_ENV_VAR, DEFAULT_LOGO_INDEX_DIR))
+        self.path = os.path.join(self.index_dir, 'logo_index.json')
+        self.refresh_interval = float(refresh_interval if refresh_interval is not None
+                                      else os.getenv(LOGO_INDEX_REFRESH_INTERVAL_ENV_VAR,
+                                                     DEFAULT_REFRESH_INTERVAL_SECONDS))
+        # Shares the query cache switches: --no-cache keeps the index in memory only, --refresh reloads it
+        self.enabled = (not _env_flag(CACHE_DISABLED_ENV_VAR)) if enabled is None else enabled
+        self.refresh = _env_flag(CACHE_REFRESH_ENV_VAR) if refresh is None else refresh
+
+        self.hits = 0
+        self.misses = 0
+        self.rows_fetched = 0
+        self._lock = threading.Lock()
+        self._logos = dict(logos) if logos is not None else {}
+        self._loaded = logos is not None
+        self._synced_at = time.time() if logos is not None else None
+        # Slugs looked up this run with no logo row; not retried until the next run
+        self._unknown = set()
+
+    def _read_file(self):
+        """Load the persisted index; returns False when absent or unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._logos = dict(data['logos'])
+            self._synced_at = float(data['synced_at'])
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _write_file(self):
+        """Persist the index atomically so concurrent runs never read a partial file."""
+        if not self.enabled:
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'synced_at': self._synced_at, 'logos': self._logos}, f)
+        os.replace(tmp_path, self.path)
+
+    def _full_sync(self):
+        """Replace the index with the whole logo table."""
+        rows = run_query(self.engine, FULL_SQL, name='logo_index.full')
+        rows = rows[rows['logo'].notna()]
+        self._logos = dict(zip(rows['slug'], rows['logo']))
+        self._synced_at = time.time()
+        self.rows_fetched += len(rows)
+        self._write_file()
+
+    def _ensure_loaded(self):
+        """Load the index once per run: from disk when fresh, otherwise from the database."""
+        if self._loaded:
+            return
+        fresh = (self.enabled and not self.refresh and self._read_file()
+                 and time.time() - self._synced_at <= self.refresh_interval)
+        if not fresh:
+            self._full_sync()
+        self._loaded = True
+
+    def _fetch_missing(self, slugs):
+        """Fetch logos for slugs not in the index with one batched query."""
+        missing = sorted({slug for slug in slugs
+                          if slug not in self._logos and slug not in self._unknown and pd.notna(slug)})
+        if not missing or self.engine is None:
+            return
+
+        rows = run_query(self.engine, DELTA_SQL, {'slugs': missing}, name='logo_index.delta', expanding=('slugs',))
+        rows = rows[rows['logo'].notna()]
+        found = dict(zip(rows['slug'], rows['logo']))
+        self._logos.update(found)
+        self._unknown.update(slug for slug in missing if slug not in found)
+        self.rows_fetched += len(rows)
+        if found:
+            self._write_file()
+
+    def resolve(self, slugs):
+        """Return {slug: logo} for the given slugs, fetching unseen slugs in one query."""
+        slugs = list(slugs)
+        with self._lock:
+            self._ensure_loaded()
+            self._fetch_missing(slugs)
+            result = {slug: self._logos.get(slug) for slug in slugs}
+            found = sum(logo is not None for logo in result.values())
+            self.hits += found
+            self.misses += len(result) - found
+        return result
+
+    def get(self, slug, default=None):
+        """Return the logo URL for one slug."""
+        logo = self.resolve([slug])[slug]
+        return default if logo is None else logo
+
+    def map(self, slugs):
+        """Return logos aligned with a Series of slugs (NaN where unknown)."""
+        return slugs.map(self.resolve(slugs.unique()))
+
+    def frame(self):
+        """Return every indexed logo as a slug/logo DataFrame."""
+        with self._lock:
+            self._ensure_loaded()
+            items = list(self._logos.items())
+        return pd.DataFrame(items, columns=['slug', 'logo'])
+
+    def stats(self):
+        """Return lookup and fetch counters for reporting."""
+        return {'hits': self.hits, 'misses': self.misses, 'rows_fetched': self.rows_fetched}
@@ -0,0 +1,125 @@
+"""Single-snapshot market data loader shared by all slide generators.
+
+Each source table is read from PostgreSQL at most once per run, with one
+round trip per table. Slide data is then derived from the cached
+DataFrames in memory instead of re-querying the database per slide.
+"""
+
+import os
+import threading
+import pandas as pd
+
+from .queries import run_query
+
+# Environment variable pointing at a snapshot saved by a parent process
+# (e.g. post_mega_carousel.py) so generator subprocesses can reuse it.
+SNAPSHOT_ENV_VAR = 'SOCIALS_MARKET_SNAPSHOT'
+
+# One query per source table; every slide is derived from these frames.
+# Daily history series are served by history_store.HistoryStore and logos by
+# logo_index.LogoIndex instead.
+SNAPSHOT_QUERIES = {
+    'listings': """
+        SELECT
+          slug, cmc_rank, last_updated, symbol, price, percent_change24h, volume24h,
+          market_cap, percent_change7d, percent_change30d, percent_change90d,
+          ytd_price_change_percentage, turnover
+        FROM crypto_listings_latest_1000
+    """,
+    'dmv_scores': """
+        SELECT slug, "Durability_Score", "Momentum_Score", "Valuation_Score"
+        FROM "FE_DMV_SCORES"
+    """,
+    'dmv_all': """
+        SELECT id, slug, name, bullish, bearish, neutral
+        FROM "public"."FE_DMV_ALL"
+    """,
+    'ratios': """
+        SELECT slug, m_rat_alpha, d_rat_beta, m_rat_omega
+        FROM "FE_RATIOS"
+    """,
+    'global': """
+        SELECT
+          total_market_cap, total_volume24h_reported, altcoin_volume24h_reported,
+          altcoin_market_cap, total_market_cap_yesterday_percentage_change,
+          total_volume24h_yesterday_percentage_change, derivatives_volume24h_reported,
+          derivatives24h_percentage_change, active_crypto_currencies, total_crypto_currencies,
+          active_exchanges, total_exchanges, stablecoin_volume24h_reported,
+          stablecoin_market_cap, stablecoin24h_percentage_change, defi_volume24h_reported,
+          defi_market_cap, defi24h_percentage_change, btc_dominance24h_percentage_change,
+          eth_dominance24h_percentage_change, btc_dominance, eth_dominance
+        FROM crypto_global_latest
+    """,
+}
+
+
+class MarketSnapshot:
+    """Lazily loaded, run-scoped copy of the market tables."""
+
+    def __init__(self, engine=None, frames=None, cache=None):
+        """Initialize the snapshot with an engine, optional preloaded frames and query cache."""
+        self.engine = engine
+        self.cache = cache
+        self._frames = dict(frames or {})
+        self.query_count = 0
+        # One lock per table so concurrent loads of different tables overlap
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _table_lock(self, name):
+        """Return the lock that serializes loading of one table."""
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _read_table(self, name):
+        """Read one table, going to the database only when the cache misses."""
+        sql = SNAPSHOT_QUERIES[name]
+        if self.cache is not None:
+            cached = self.cache.get(sql)
+            if cached is not None:
+                return cached
+
+        df = run_query(self.engine, sql, name=f"snapshot.{name}")
+        with self._locks_guard:
+            self.query_count += 1
+
+        if self.cache is not None:
+            self.cache.put(sql, df)
+        return df
+
+    def table(self, name):
+        """Return a copy of a snapshot table, loading it on first access."""
+        if name not in SNAPSHOT_QUERIES:
+            raise KeyError(f"Unknown snapshot table: {name}")
+
+        if name not in self._frames:
+            with self._table_lock(name):
+                if name not in self._frames:
+                    if self.engine is None:
+                        raise RuntimeError(f"Snapshot table '{name}' is not loaded and no engine is configured")
+                    self._frames[name] = self._read_table(name)
+
+        # Callers mutate their frames freely, so never hand out the cached one
+        return self._frames[name].copy()
+
+    def is_loaded(self, name):
+        """Check whether a table is already held in memory."""
+        return name in self._frames
+
+    def load_all(self):
+        """Load every snapshot table that is not yet in memory."""
+        for name in SNAPSHOT_QUERIES:
+            if name not in self._frames:
+                self.table(name)
+        return self
+
+    def save(self, path):
+        """Persist the loaded tables so other processes in the run can reuse them."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pd.to_pickle(self._frames, path)
+        return path
+
+    @classmethod
+    def load(cls, path, engine=None, cache=None):
+        """Restore a snapshot saved with save(); missing tables load lazily from engine."""
+        return cls(engine=engine, frames=pd.read_pickle(path), cache=cache)
@@ -0,0 +1,101 @@
+"""Parameterized query layer with a compiled-statement cache and latency histogram.
+
+All SQL goes through run_query() with bound parameters (``:name`` style,
+``ANY(:slugs)`` for lists, or ``IN :slugs`` with ``expanding=('slugs',)`` when
+the query must also run on the SQLite fixture) instead of string
+interpolation, so the statement text is constant across calls and
+SQLAlchemy's compiled cache can reuse it.
+"""
+
+import re
+import threading
+import time
+from functools import lru_cache
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+# Upper bounds (ms) of the latency histogram buckets; slower queries land in '+inf'
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Per-query latency histogram with fixed millisecond buckets.
+
+    Queries run on worker threads (async_database.py, the parallel Sheets
+    sync), so updates and reads hold a lock.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        """Initialize an empty histogram with the given bucket bounds."""
+        self.buckets = tuple(sorted(buckets))
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, elapsed_ms):
+        """Record one query execution time."""
+        bucket = next((str(bound) for bound in self.buckets if elapsed_ms <= bound), '+inf')
+        with self._lock:
+            stats = self._stats.setdefault(name, {
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'buckets': {**{str(bound): 0 for bound in self.buckets}, '+inf': 0},
+            })
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['buckets'][bucket] += 1
+
+    def summary(self):
+        """Return a copy of the per-query statistics with mean latency added."""
+        with self._lock:
+            return {
+                name: {**stats, 'buckets': dict(stats['buckets']),
+                       'mean_ms': round(stats['total_ms'] / stats['count'], 2)}
+                for name, stats in self._stats.items()
+            }
+
+    def report(self):
+        """Print a compact latency table, slowest total first."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print("⏱️ Query latency:")
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+            print(f"   {name}: {stats['count']}x, mean {stats['mean_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+
+    def reset(self):
+        """Clear all recorded timings."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Shared histogram for the whole process
+latency_histogram = LatencyHistogram()
+
+
+@lru_cache(maxsize=256)
+def prepare(sql, *expanding):
+    """Return a cached SQLAlchemy text() statement; names in expanding bind lists for IN."""
+    statement = text(sql)
+    if expanding:
+        statement = statement.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return statement
+
+
+def query_label(sql):
+    """Derive a short histogram label from the first table a query reads."""
+    match = re.search(r'\bFROM\s+("?[\w.]+"?(?:\."?[\w]+"?)?)', sql, re.IGNORECASE)
+    return match.group(1).replace('"', '') if match else 'query'
+
+
+def run_query(engine, sql, params=None, name=None, expanding=()):
+    """Execute a parameterized query and return a DataFrame, recording its latency."""
+    statement = prepare(sql, *expanding)
+    start = time.perf_counter()
+    try:
+        return pd.read_sql_query(statement, engine, params=params)
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        latency_histogram.record(name or query_label(sql), elapsed_ms)
@@ -0,0 +1,183 @@
+"""On-disk query result cache with TTL and content-hashed keys.
+
+Results are stored as Parquet when pyarrow is installed (pickle otherwise),
+keyed by a hash of the normalized SQL text plus its parameters. The upstream
+tables refresh on a fixed cadence, so re-runs and retries within the TTL are
+served from disk instead of the remote database.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import pandas as pd
+
+from .queries import run_query
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Environment overrides; also set by the --no-cache / --refresh flags
+CACHE_DIR_ENV_VAR = 'SOCIALS_QUERY_CACHE_DIR'
+CACHE_TTL_ENV_VAR = 'SOCIALS_QUERY_CACHE_TTL'
+CACHE_DISABLED_ENV_VAR = 'SOCIALS_QUERY_CACHE_DISABLED'
+CACHE_REFRESH_ENV_VAR = 'SOCIALS_QUERY_CACHE_REFRESH'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.cache', 'queries')
+DEFAULT_TTL_SECONDS = 300
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so reformatted copies of a query share a key."""
+    return re.sub(r'\s+', ' ', str(sql)).strip().rstrip(';').strip()
+
+
+def make_cache_key(sql, params=None):
+    """Hash normalized SQL plus parameters into a stable cache key."""
+    payload = json.dumps({'sql': normalize_sql(sql), 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _env_flag(name):
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, '0').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def apply_cache_flags(argv=None):
+    """Consume --no-cache / --refresh from argv and export them for child processes."""
+    argv = sys.argv if argv is None else argv
+
+    if '--no-cache' in argv:
+        os.environ[CACHE_DISABLED_ENV_VAR] = '1'
+    if '--refresh' in argv:
+        os.environ[CACHE_REFRESH_ENV_VAR] = '1'
+
+    argv[:] = [arg for arg in argv if arg not in ('--no-cache', '--refresh')]
+    return argv
+
+
+class QueryCache:
+    """Persistent DataFrame cache for SQL query results."""
+
+    def __init__(self, cache_dir=None, ttl_seconds=None, enabled=None, refresh=None):
+        """Initialize the cache; unset arguments fall back to environment settings."""
+        self.cache_dir = os.path.abspath(cache_dir or os.getenv(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR))
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None
+                                 else os.getenv(CACHE_TTL_ENV_VAR, DEFAULT_TTL_SECONDS))
+        self.enabled = (not _env_flag(CACHE_DISABLED_ENV_VAR)) if enabled is None else enabled
+        # Refresh skips reads but still writes, so later runs see the fresh data
+        self.refresh = _env_flag(CACHE_REFRESH_ENV_VAR) if refresh is None else refresh
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _paths(self, key):
+        """Return the candidate file paths for a cache key."""
+        base = os.path.join(self.cache_dir, key)
+        return base + '.parquet', base + '.pkl'
+
+    def _is_fresh(self, path):
+        """Check whether a cache file exists and is within the TTL."""
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return False
+        return age <= self.ttl_seconds
+
+    def get(self, sql, params=None):
+        """Return a cached DataFrame, or None on a miss."""
+        if not self.enabled or self.refresh:
+            self.misses += 1
+            return None
+
+        parquet_path, pickle_path = self._paths(make_cache_key(sql, params))
+        try:
+            if PARQUET_AVAILABLE and self._is_fresh(parquet_path):
+                df = pd.read_parquet(parquet_path)
+            elif self._is_fresh(pickle_path):
+                df = pd.read_pickle(pickle_path)
+            else:
+                df = None
+        except Exception as e:
+            # A corrupt entry is just a miss; the next put() overwrites it
+            print(f"⚠️ Ignoring unreadable cache entry: {e}")
+            df = None
+
+        if df is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return df
+
+    def put(self, sql, df, params=None):
+        """Store a DataFrame under the query's cache key."""
+        if not self.enabled:
+            return False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        parquet_path, pickle_path = self._paths(make_cache_key(sql, params))
+
+        try:
+            if PARQUET_AVAILABLE:
+                try:
+                    self._atomic_write(parquet_path, lambda tmp: df.to_parquet(tmp, index=False))
+                    self.writes += 1
+                    return True
+                except (TypeError, ValueError, ImportError):
+                    # Mixed-type object columns cannot go to Parquet; pickle them instead
+                    pass
+            self._atomic_write(pickle_path, lambda tmp: df.to_pickle(tmp))
+            self.writes += 1
+            return True
+        except OSError as e:
+            print(f"⚠️ Could not write query cache entry: {e}")
+            return False
+
+    @staticmethod
+    def _atomic_write(path, writer):
+        """Write through a temp file so readers never see a partial entry."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def read_sql(self, sql, engine, params=None, name=None):
+        """Run a query through the cache, hitting the database only on a miss."""
+        df = self.get(sql, params)
+        if df is not None:
+            return df
+
+        df = run_query(engine, sql, params=params, name=name)
+        self.put(sql, df, params)
+        return df
+
+    def clear(self):
+        """Delete every cached entry."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.parquet', '.pkl')):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+    def stats(self):
+        """Return hit/miss counters for reporting."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,66 @@
+"""DMV signal aggregation.
+
+FE_DMV_ALL holds one row per coin with many signal columns scored +1
+(bullish), -1 (bearish) or 0 (neutral), next to identifier columns and the
+precomputed bullish/bearish/neutral totals. count_signals() tallies all three
+outcomes in a single comparison pass over the signal columns only and labels
+each row's sentiment, replacing per-row ``row.tolist().count(...)`` applies.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Signal outcome -> score stored in FE_DMV_ALL
+SIGNAL_SCORES = {
+    'bullish': 1,
+    'bearish': -1,
+    'neutral': 0,
+}
+
+# Precomputed totals selected by the snapshot and slide queries
+SUMMARY_COLUMNS = tuple(SIGNAL_SCORES)
+
+# Numeric columns that are not signals and must never be counted
+NON_SIGNAL_COLUMNS = frozenset({'id', 'cmc_rank', *SUMMARY_COLUMNS,
+                                *(f"{outcome}_count" for outcome in SIGNAL_SCORES)})
+
+
+def signal_columns(df):
+    """Return the numeric signal columns of a FE_DMV_ALL frame."""
+    return [
+        column for column in df.columns
+        if column not in NON_SIGNAL_COLUMNS
+        and pd.api.types.is_numeric_dtype(df[column])
+        and not pd.api.types.is_bool_dtype(df[column])
+    ]
+
+
+def sentiment_labels(bullish_count, bearish_count):
+    """Label rows Bullish, Bearish or Neutral by comparing their counts."""
+    bullish = np.asarray(bullish_count, dtype='float64')
+    bearish = np.asarray(bearish_count, dtype='float64')
+    return np.select([bullish > bearish, bearish > bullish], ['Bullish', 'Bearish'], default='Neutral')
+
+
+def count_signals(df, columns=None):
+    """Count bullish, bearish and neutral signals per row and label the sentiment.
+
+    Returns a frame with bullish_count, bearish_count, neutral_count and
+    sentiment on the input's index. Frames without raw signal columns (the
+    narrow snapshot and slide queries) fall back to the precomputed totals.
+    """
+    columns = signal_columns(df) if columns is None else list(columns)
+
+    if columns:
+        # NaN never equals a score, so missing signals are simply not counted
+        values = df[columns].to_numpy(dtype='float64')
+        counts = {f"{outcome}_count": (values == score).sum(axis=1) for outcome, score in SIGNAL_SCORES.items()}
+    elif set(SUMMARY_COLUMNS).issubset(df.columns):
+        counts = {f"{outcome}_count": pd.to_numeric(df[outcome], errors='coerce').to_numpy()
+                  for outcome in SIGNAL_SCORES}
+    else:
+        raise KeyError("Frame has neither DMV signal columns nor bullish/bearish/neutral totals")
+
+    result = pd.DataFrame(counts, index=df.index)
+    result['sentiment'] = sentiment_labels(result['bullish_count'], result['bearish_count'])
+    return result
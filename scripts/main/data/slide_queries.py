@@ -0,0 +1,61 @@
+"""Slide query layer: each slide's full dataset in one SQL statement.
+
+The SQL lives in versioned files under data/sql/ named ``<slide>.v<N>.sql``.
+Joins and rounding happen in PostgreSQL, so a standalone generator run needs
+a single round trip instead of one query per source table. When the shared
+MarketSnapshot already holds a slide's tables (full runs), the fetchers in
+database.py derive the slide from memory instead.
+"""
+
+import os
+from functools import lru_cache
+
+from .queries import run_query
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), 'sql')
+
+# Pinned version per slide; add a new <slide>.v<N>.sql file and bump here to change a query
+SLIDE_QUERY_VERSIONS = {
+    'top_coins': 2,
+    'btc_snapshot': 3,
+}
+
+# Snapshot tables that can answer each slide without touching the database
+SLIDE_SNAPSHOT_TABLES = {
+    'top_coins': ('listings', 'dmv_scores'),
+    'btc_snapshot': ('listings', 'dmv_all'),
+}
+
+
+@lru_cache(maxsize=None)
+def load_slide_sql(name, version=None):
+    """Read the SQL for a slide, defaulting to its pinned version."""
+    if name not in SLIDE_QUERY_VERSIONS:
+        raise KeyError(f"Unknown slide query: {name}")
+
+    version = version or SLIDE_QUERY_VERSIONS[name]
+    path = os.path.join(SQL_DIR, f"{name}.v{version}.sql")
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def fetch_slide(name, engine, params=None, cache=None):
+    """Run a slide query, through the query cache when one is given."""
+    sql = load_slide_sql(name)
+    if cache is not None:
+        return cache.read_sql(sql, engine, params=params, name=f"slide.{name}")
+    return run_query(engine, sql, params, name=f"slide.{name}")
+
+
+def snapshot_covers(snapshot, name):
+    """Check whether a snapshot already holds every table a slide is built from."""
+    return all(snapshot.is_loaded(table) for table in SLIDE_SNAPSHOT_TABLES[name])
+
+
+def use_slide_query(snapshot, name, engine):
+    """Decide whether to run a slide's SQL instead of deriving it from the snapshot.
+
+    The slide SQL is PostgreSQL-specific (casts, json_agg), so against a local
+    fixture database the snapshot tables are always used; they load locally.
+    """
+    return engine.dialect.name == 'postgresql' and not snapshot_covers(snapshot, name)
@@ -0,0 +1,53 @@
+-- btc_snapshot v1
+-- One row - the rank 1 listing with DMV counts, logo and the fear and greed
+-- and close price histories aggregated as JSON arrays (newest first).
+-- Params - slug (DMV and OHLCV source, normally 'bitcoin')
+WITH btc AS (
+    SELECT
+        slug, cmc_rank, last_updated, symbol,
+        ROUND(price::numeric, 2)::float8 AS price,
+        ROUND(percent_change24h::numeric, 2)::float8 AS percent_change24h,
+        volume24h,
+        market_cap,
+        ROUND(percent_change7d::numeric, 2)::float8 AS percent_change7d,
+        ROUND(percent_change30d::numeric, 2)::float8 AS percent_change30d,
+        ROUND(ytd_price_change_percentage::numeric, 2)::float8 AS ytd_price_change_percentage
+    FROM crypto_listings_latest_1000
+    WHERE cmc_rank < 2
+),
+dmv AS (
+    SELECT slug, bullish, bearish, neutral
+    FROM "public"."FE_DMV_ALL"
+    WHERE slug = :slug
+),
+fear_greed AS (
+    SELECT timestamp, fear_greed_index, sentiment
+    FROM "FE_FEAR_GREED_CMC"
+    ORDER BY timestamp DESC
+    LIMIT 30
+),
+price_history AS (
+    SELECT "timestamp", "close"
+    FROM "public"."1K_coins_ohlcv"
+    WHERE "slug" = :slug
+    ORDER BY "timestamp" DESC
+    LIMIT 31
+)
+SELECT
+    btc.*,
+    dmv.bullish,
+    dmv.bearish,
+    dmv.neutral,
+    u.logo,
+    (SELECT json_agg(json_build_object(
+                'timestamp', f.timestamp,
+                'fear_greed_index', f.fear_greed_index,
+                'sentiment', f.sentiment) ORDER BY f.timestamp DESC)
+     FROM fear_greed f) AS fear_greed_history,
+    (SELECT json_agg(json_build_object(
+                'timestamp', p."timestamp",
+                'close', p."close") ORDER BY p."timestamp" DESC)
+     FROM price_history p) AS btc_price_history
+FROM btc
+LEFT JOIN dmv ON dmv.slug = btc.slug
+LEFT JOIN "FE_CC_INFO_URL" u ON u.slug = btc.slug
@@ -0,0 +1,32 @@
+-- btc_snapshot v2
+-- One row - the rank 1 listing with DMV counts and logo. The fear and greed
+-- and close price histories now come from the local history store
+-- (history_store.py), so they are no longer aggregated here.
+-- Params - slug (DMV source, normally 'bitcoin')
+WITH btc AS (
+    SELECT
+        slug, cmc_rank, last_updated, symbol,
+        ROUND(price::numeric, 2)::float8 AS price,
+        ROUND(percent_change24h::numeric, 2)::float8 AS percent_change24h,
+        volume24h,
+        market_cap,
+        ROUND(percent_change7d::numeric, 2)::float8 AS percent_change7d,
+        ROUND(percent_change30d::numeric, 2)::float8 AS percent_change30d,
+        ROUND(ytd_price_change_percentage::numeric, 2)::float8 AS ytd_price_change_percentage
+    FROM crypto_listings_latest_1000
+    WHERE cmc_rank < 2
+),
+dmv AS (
+    SELECT slug, bullish, bearish, neutral
+    FROM "public"."FE_DMV_ALL"
+    WHERE slug = :slug
+)
+SELECT
+    btc.*,
+    dmv.bullish,
+    dmv.bearish,
+    dmv.neutral,
+    u.logo
+FROM btc
+LEFT JOIN dmv ON dmv.slug = btc.slug
+LEFT JOIN "FE_CC_INFO_URL" u ON u.slug = btc.slug
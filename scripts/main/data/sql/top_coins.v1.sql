@@ -0,0 +1,24 @@
+-- top_coins v1
+-- Coins in a rank range with DMV scores and logo, rounded server-side.
+-- Params - start_rank, end_rank (inclusive)
+WITH ranked AS (
+    SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap
+    FROM crypto_listings_latest_1000
+    WHERE cmc_rank BETWEEN :start_rank AND :end_rank
+)
+SELECT
+    r.slug,
+    r.cmc_rank,
+    r.last_updated,
+    r.symbol,
+    ROUND(r.price::numeric, 2)::float8 AS price,
+    ROUND(r.percent_change24h::numeric, 2)::float8 AS percent_change24h,
+    ROUND((r.market_cap / 1e9)::numeric, 2)::float8 AS market_cap,
+    d."Durability_Score",
+    d."Momentum_Score",
+    d."Valuation_Score",
+    u.logo
+FROM ranked r
+LEFT JOIN "FE_DMV_SCORES" d ON d.slug = r.slug
+LEFT JOIN "FE_CC_INFO_URL" u ON u.slug = r.slug
+ORDER BY r.cmc_rank ASC
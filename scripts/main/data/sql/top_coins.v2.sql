@@ -0,0 +1,23 @@
+-- top_coins v2
+-- Coins in a rank range with DMV scores, rounded server-side. Logos are
+-- attached from the local logo index (logo_index.py) instead of a join.
+-- Params - start_rank, end_rank (inclusive)
+WITH ranked AS (
+    SELECT slug, cmc_rank, last_updated, symbol, price, percent_change24h, market_cap
+    FROM crypto_listings_latest_1000
+    WHERE cmc_rank BETWEEN :start_rank AND :end_rank
+)
+SELECT
+    r.slug,
+    r.cmc_rank,
+    r.last_updated,
+    r.symbol,
+    ROUND(r.price::numeric, 2)::float8 AS price,
+    ROUND(r.percent_change24h::numeric, 2)::float8 AS percent_change24h,
+    ROUND((r.market_cap / 1e9)::numeric, 2)::float8 AS market_cap,
+    d."Durability_Score",
+    d."Momentum_Score",
+    d."Valuation_Score"
+FROM ranked r
+LEFT JOIN "FE_DMV_SCORES" d ON d.slug = r.slug
+ORDER BY r.cmc_rank ASC
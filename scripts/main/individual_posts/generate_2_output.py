@@ -7,7 +7,6 @@ Individual post generator for Template 2
 import os
 import sys
 import asyncio
-import shutil
 from datetime import datetime
 
 # Add parent directories to path for imports
@@ -15,7 +14,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from data.database import fetch_top_coins
 from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from media.screenshot import render_html_to_image
 
 def generate_2_output():
     """Generate Template 2: Extended Cryptocurrencies"""
@@ -37,20 +36,11 @@ def generate_2_output():
         output_path = os.path.join(output_dir, "13_top_cryptos_25_48_output.html")
 
         # Render template
-        success = renderer.render_coins_page('2.html', df, output_path)
+        html = renderer.render_coins_page('2.html', df, output_path)
 
-        if success:
-            print(f"✅ Template 2 HTML generated: {output_path}")
-
-            # Copy CSS file to output_html directory (always copy to get latest changes)
-            template_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'base_templates')
-            css_source = os.path.join(template_dir, 'style2.css')
-            css_dest = os.path.join(output_dir, 'style2.css')
-            if os.path.exists(css_source):
-                shutil.copy2(css_source, css_dest)
-                print(f"📁 Copied style2.css to output_html directory")
-
-            return True
+        if html:
+            print("✅ Template 2 HTML rendered")
+            return html
         else:
             print("❌ Template 2 rendering failed")
             return False
@@ -63,19 +53,17 @@ async def generate_2_with_screenshot():
     """Generate Template 2 with screenshot"""
     print("📸 Generating Template 2 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_2_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_2_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "13_top_cryptos_25_48_output.html")
         image_path = os.path.join(image_dir, "13_top_cryptos_25_48_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 2 screenshot generated: {image_path}")
         return True
 
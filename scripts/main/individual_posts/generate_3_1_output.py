@@ -7,31 +7,29 @@ Individual post generator for Template 3.1
 import os
 import sys
 import asyncio
-import shutil
 from datetime import datetime
 
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from data.database import fetch_top_coins
-from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from data.database import fetch_top_movers
+from content.template_engine import get_template_renderer, save_debug_html
+from content.logo_assets import localize_logos
+from media.screenshot import render_html_to_image
 
 def generate_3_1_output():
     """Generate Template 3.1: Top Gainers (+2% or more)"""
     print("🚀 Generating Template 3.1: Top Gainers (+2% or more)")
 
     try:
-        # Fetch data for top 100 coins for analysis
-        df = fetch_top_coins(1, 100)
+        # Top 15 gainers of the top 100 coins moving +2% or more, ranked in the run's snapshot
+        gainers_df = fetch_top_movers("gainers", n=15, min_pct=2.0, rank_max=100)
 
-        if df.empty:
+        # An error yields a bare DataFrame(); a quiet market an empty one with columns
+        if gainers_df.columns.empty:
             print("❌ No data available for Template 3.1")
             return False
 
-        # Filter for gainers with >2% increase
-        gainers_df = df[df['percent_change24h'] > 2.0].nlargest(15, 'percent_change24h')
-
         # Get template renderer
         renderer = get_template_renderer()
 
@@ -39,11 +37,6 @@ def generate_3_1_output():
         output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         output_path = os.path.join(output_dir, "09_movers_gainers_output.html")
 
-        # Fix logo handling - replace nan/null values with placeholder
-        if not gainers_df.empty:
-            gainers_df['logo'] = gainers_df['logo'].fillna('https://via.placeholder.com/40x40?text=?')
-            gainers_df['logo'] = gainers_df['logo'].replace('nan', 'https://via.placeholder.com/40x40?text=?')
-
         # Split gainers into two columns (5 left, 5 right)
         if not gainers_df.empty:
             total_gainers = len(gainers_df)
@@ -68,22 +61,14 @@ def generate_3_1_output():
         env = Environment(loader=FileSystemLoader(template_dir))
         template = env.get_template('3_1.html')
 
-        html_content = template.render(**template_data)
-
-        # Write HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Logos render from the local asset cache; missing ones get the local fallback image
+        html_content = template.render(**localize_logos(template_data))
 
-        print(f"✅ Template 3.1 HTML generated: {output_path}")
+        # Keep the HTML on disk only when debugging
+        save_debug_html(html_content, output_path, template_dir)
 
-        # Copy CSS file to output_html directory (always copy to get latest changes)
-        css_source = os.path.join(template_dir, 'style3.css')
-        css_dest = os.path.join(output_dir, 'style3.css')
-        if os.path.exists(css_source):
-            shutil.copy2(css_source, css_dest)
-            print(f"📁 Copied style3.css to output_html directory")
-
-        return True
+        print("✅ Template 3.1 HTML rendered")
+        return html_content
 
     except Exception as e:
         print(f"❌ Template 3.1 generation error: {str(e)}")
@@ -93,19 +78,17 @@ async def generate_3_1_with_screenshot():
     """Generate Template 3.1 with screenshot"""
     print("📸 Generating Template 3.1 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_3_1_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_3_1_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "09_movers_gainers_output.html")
         image_path = os.path.join(image_dir, "09_movers_gainers_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 3.1 screenshot generated: {image_path}")
         return True
 
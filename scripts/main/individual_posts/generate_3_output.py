@@ -14,7 +14,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from data.database import fetch_top_coins, close_connection
 from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from media.screenshot import render_html_to_image
 
 def generate_3_output():
     """Generate Template 3: Top Gainers and Losers"""
@@ -40,11 +40,11 @@ def generate_3_output():
         losers_df = df[df['percent_change24h'] < 0].nsmallest(10, 'percent_change24h')
 
         # Render template
-        success = renderer.render_gainers_losers_page('3.html', gainers_df, losers_df, output_path)
+        html = renderer.render_gainers_losers_page('3.html', gainers_df, losers_df, output_path)
 
-        if success:
-            print(f"✅ Template 3 HTML generated: {output_path}")
-            return True
+        if html:
+            print("✅ Template 3 HTML rendered")
+            return html
         else:
             print("❌ Template 3 rendering failed")
             return False
@@ -59,19 +59,17 @@ async def generate_3_with_screenshot():
     """Generate Template 3 with screenshot"""
     print("📸 Generating Template 3 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_3_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_3_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "3_output.html")
         image_path = os.path.join(image_dir, "3_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 3 screenshot generated: {image_path}")
         return True
 
@@ -8,15 +8,15 @@ Uses sentiment analysis and trading ratios to identify bearish opportunities
 import os
 import sys
 import asyncio
-import shutil
 from datetime import datetime
 
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from data.database import fetch_trading_opportunities
-from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from content.template_engine import get_template_renderer, save_debug_html
+from content.logo_assets import localize_logos
+from media.screenshot import render_html_to_image
 
 def generate_4_2_output():
     """Generate Template 4.2: Short Call Positions"""
@@ -34,11 +34,6 @@ def generate_4_2_output():
         output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         output_path = os.path.join(output_dir, "07_trading_short_calls_output.html")
 
-        # Fix logo handling - replace nan/null values with placeholder
-        if not short_df.empty:
-            short_df['logo'] = short_df['logo'].fillna('https://via.placeholder.com/40x40?text=?')
-            short_df['logo'] = short_df['logo'].replace('nan', 'https://via.placeholder.com/40x40?text=?')
-
         # Split positions into two columns (5 left, 5 right)
         if not short_df.empty:
             total_positions = len(short_df)
@@ -63,22 +58,14 @@ def generate_4_2_output():
         env = Environment(loader=FileSystemLoader(template_dir))
         template = env.get_template('4_2.html')
 
-        html_content = template.render(**template_data)
+        # Logos render from the local asset cache; missing ones get the local fallback image
+        html_content = template.render(**localize_logos(template_data))
 
-        # Write HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Keep the HTML on disk only when debugging
+        save_debug_html(html_content, output_path, template_dir)
 
-        print(f"✅ Template 4.2 HTML generated: {output_path}")
-
-        # Copy CSS file to output_html directory (always copy to get latest changes)
-        css_source = os.path.join(template_dir, 'style4.css')
-        css_dest = os.path.join(output_dir, 'style4.css')
-        if os.path.exists(css_source):
-            shutil.copy2(css_source, css_dest)
-            print(f"📁 Copied style4.css to output_html directory")
-
-        return True
+        print("✅ Template 4.2 HTML rendered")
+        return html_content
 
     except Exception as e:
         print(f"❌ Template 4.2 generation error: {str(e)}")
@@ -88,19 +75,17 @@ async def generate_4_2_with_screenshot():
     """Generate Template 4.2 with screenshot"""
     print("📸 Generating Template 4.2 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_4_2_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_4_2_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "07_trading_short_calls_output.html")
         image_path = os.path.join(image_dir, "07_trading_short_calls_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 4.2 screenshot generated: {image_path}")
         return True
 
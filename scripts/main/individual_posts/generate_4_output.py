@@ -13,8 +13,8 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from data.database import fetch_trading_opportunities, close_connection
-from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from content.template_engine import get_template_renderer, save_debug_html
+from media.screenshot import render_html_to_image
 
 def generate_4_output():
     """Generate Template 4: Trading Opportunities"""
@@ -36,9 +36,8 @@ def generate_4_output():
 
             output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
             output_path = os.path.join(output_dir, "4_output.html")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(error_html)
-            print(f"✅ Error message written to: {output_path}")
+            if save_debug_html(error_html, output_path):
+                print(f"✅ Error message written to: {output_path}")
             return False
 
         # Get template renderer
@@ -49,11 +48,11 @@ def generate_4_output():
         output_path = os.path.join(output_dir, "4_output.html")
 
         # Render template
-        success = renderer.render_trading_opportunities_page('4.html', long_df, short_df, output_path)
+        html = renderer.render_trading_opportunities_page('4.html', long_df, short_df, output_path)
 
-        if success:
-            print(f"✅ Template 4 HTML generated: {output_path}")
-            return True
+        if html:
+            print("✅ Template 4 HTML rendered")
+            return html
         else:
             print("❌ Template 4 rendering failed")
             return False
@@ -68,19 +67,17 @@ async def generate_4_with_screenshot():
     """Generate Template 4 with screenshot"""
     print("📸 Generating Template 4 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_4_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_4_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "4_output.html")
         image_path = os.path.join(image_dir, "4_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 4 screenshot generated: {image_path}")
         return True
 
@@ -14,7 +14,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from data.database import fetch_global_market_data, fetch_btc_snapshot, close_connection
 from content.template_engine import get_template_renderer
-from media.screenshot import generate_image_from_html
+from media.screenshot import render_html_to_image
 
 def generate_5_output():
     """Generate Template 5: Market Overview"""
@@ -37,11 +37,11 @@ def generate_5_output():
         output_path = os.path.join(output_dir, "5_output.html")
 
         # Render template
-        success = renderer.render_market_overview_page('5.html', global_data, btc_data, output_path)
+        html = renderer.render_market_overview_page('5.html', global_data, btc_data, output_path)
 
-        if success:
-            print(f"✅ Template 5 HTML generated: {output_path}")
-            return True
+        if html:
+            print("✅ Template 5 HTML rendered")
+            return html
         else:
             print("❌ Template 5 rendering failed")
             return False
@@ -56,19 +56,17 @@ async def generate_5_with_screenshot():
     """Generate Template 5 with screenshot"""
     print("📸 Generating Template 5 with screenshot...")
 
-    # Generate HTML
-    html_success = generate_5_output()
-    if not html_success:
+    # Render HTML in memory
+    html = generate_5_output()
+    if not html:
         return False
 
     # Generate screenshot
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "5_output.html")
         image_path = os.path.join(image_dir, "5_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(html, image_path)
         print(f"✅ Template 5 screenshot generated: {image_path}")
         return True
 
@@ -11,12 +11,14 @@ import re
 import asyncio
 from datetime import datetime, timedelta
 from jinja2 import Environment, FileSystemLoader
-from sqlalchemy import create_engine
 
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from content.openrouter_client import create_openrouter_client
+from content.template_engine import save_debug_html
+from content.formatting import register_filters
+from content.logo_assets import localize_logos
 
 # Load environment variables
 try:
@@ -26,24 +28,6 @@ try:
 except ImportError:
     print("⚠️ dotenv not available, using system environment variables")
 
-# Database configuration
-DB_CONFIG = {
-    'host': '34.55.195.199',        # GCP PostgreSQL instance public IP
-    'database': 'dbcp',             # Database name
-    'user': 'yogass09',             # Username
-    'password': 'jaimaakamakhya',   # Password
-    'port': 5432                    # PostgreSQL default port
-}
-
-def get_gcp_engine():
-    """Create and return a SQLAlchemy engine for the GCP PostgreSQL database."""
-    connection_url = f"postgresql+psycopg2://{DB_CONFIG['user']}:{DB_CONFIG['password']}@" \
-                     f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-    return create_engine(connection_url)
-
-# Initialize the GCP engine
-gcp_engine = get_gcp_engine()
-
 def convert_macro_report_to_json_python_parsing(macro_report_text):
     """
     Convert using Python regex parsing instead of LLM
@@ -300,32 +284,12 @@ def generate_6_output_html():
         alerts_result = generate_macro_intelligence_with_json_conversion()
 
         # Step 2: Get BTC snapshot data from database
-        from data.database import fetch_btc_snapshot
-        btc_data_df = fetch_btc_snapshot()
-        if not btc_data_df.empty:
-            btc_snapshots = btc_data_df.to_dict('records')
-            # Add fear_greed_history from DataFrame column to the first record
-            if len(btc_snapshots) > 0:
-                if 'fear_greed_history_json' in btc_snapshots[0] and btc_snapshots[0]['fear_greed_history_json']:
-                    # Parse the JSON string back to list
-                    import ast
-                    try:
-                        btc_snapshots[0]['fear_greed_history'] = ast.literal_eval(btc_snapshots[0]['fear_greed_history_json'])
-                    except:
-                        # Fallback in case of parsing error
-                        btc_snapshots[0]['fear_greed_history'] = [
-                            {'day': i+1, 'value': 50, 'price': 0, 'label': 'Neutral'} for i in range(30)
-                        ]
-                else:
-                    # Fallback: create basic history if not available
-                    btc_snapshots[0]['fear_greed_history'] = [
-                        {'day': i+1, 'value': 50, 'price': 0, 'label': 'Neutral'} for i in range(30)
-                    ]
-                print(f"🔍 Debug: fear_greed_history has {len(btc_snapshots[0]['fear_greed_history'])} entries")
-            # Normalize numeric strings by stripping leading '$'
-            for snap in btc_snapshots:
-                for _k in ('price', 'market_cap', 'volume24h'):
-                    snap[_k] = snap[_k].lstrip('$')
+        from data.database import fetch_btc_snapshot_data
+        btc_snapshot = fetch_btc_snapshot_data()
+        if btc_snapshot is not None:
+            # Structured chart history; an empty history renders the chart without lines
+            btc_snapshots = [btc_snapshot.template_context()]
+            print(f"🔍 Debug: fear_greed_history has {len(btc_snapshot.history)} entries")
         else:
             btc_snapshots = []
 
@@ -346,32 +310,22 @@ def generate_6_output_html():
 
         # Step 4: Setup Jinja2 template
         template_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'base_templates')
-        env = Environment(loader=FileSystemLoader(template_dir))
+        env = register_filters(Environment(loader=FileSystemLoader(template_dir)))
         template = env.get_template('6.html')
 
         # Step 5: Render HTML
-        rendered_html = template.render(**template_data)
+        rendered_html = template.render(**localize_logos(template_data))
 
-        # Step 6: Save to 04_bitcoin_intelligence_output.html
+        # Step 6: Keep 04_bitcoin_intelligence_output.html on disk only when debugging
         output_html_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html', '04_bitcoin_intelligence_output.html')
+        save_debug_html(rendered_html, output_html_path, template_dir)
 
-        with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
-
-        print(f"✅ Successfully generated: {output_html_path}")
-        print(f"📄 HTML file size: {len(rendered_html)} characters")
-
-        # Step 7: Copy the CSS file (always to get latest changes)
-        import shutil
-        css_source = os.path.join(template_dir, 'style6.css')
-        css_dest = os.path.join(os.path.dirname(output_html_path), 'style6.css')
-
-        if os.path.exists(css_source):
-            shutil.copy2(css_source, css_dest)
-            print("📁 Copied style6.css to output_html directory")
+        print(f"✅ Successfully generated Template 6 HTML")
+        print(f"📄 HTML size: {len(rendered_html)} characters")
 
         return {
             'success': True,
+            'html': rendered_html,
             'html_path': output_html_path,
             'alerts_count': len(alerts_result['alerts']) if alerts_result['success'] else 0,
             'data': template_data
@@ -396,14 +350,12 @@ async def generate_6_with_screenshot():
 
     # Generate screenshot
     try:
-        from media.screenshot import generate_image_from_html
+        from media.screenshot import render_html_to_image
 
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "04_bitcoin_intelligence_output.html")
         image_path = os.path.join(image_dir, "04_bitcoin_intelligence_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(result['html'], image_path)
         print(f"✅ Template 6 screenshot generated: {image_path}")
         return True
 
@@ -11,12 +11,12 @@ import re
 import asyncio
 from datetime import datetime, timedelta
 from jinja2 import Environment, FileSystemLoader
-from sqlalchemy import create_engine
 
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from content.openrouter_client import create_openrouter_client
+from content.template_engine import save_debug_html
 
 # Load environment variables
 try:
@@ -26,24 +26,6 @@ try:
 except ImportError:
     print("⚠️ dotenv not available, using system environment variables")
 
-# Database configuration
-DB_CONFIG = {
-    'host': '34.55.195.199',        # GCP PostgreSQL instance public IP
-    'database': 'dbcp',             # Database name
-    'user': 'yogass09',             # Username
-    'password': 'jaimaakamakhya',   # Password
-    'port': 5432                    # PostgreSQL default port
-}
-
-def get_gcp_engine():
-    """Create and return a SQLAlchemy engine for the GCP PostgreSQL database."""
-    connection_url = f"postgresql+psycopg2://{DB_CONFIG['user']}:{DB_CONFIG['password']}@" \
-                     f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-    return create_engine(connection_url)
-
-# Initialize the GCP engine
-gcp_engine = get_gcp_engine()
-
 def convert_macro_report_to_json_python_parsing(macro_report_text):
     """
     Convert using Python regex parsing instead of LLM
@@ -486,27 +468,16 @@ def generate_7_output_html():
         # Step 4: Render HTML
         rendered_html = template.render(**template_data)
 
-        # Step 5: Save to 7_output.html
+        # Step 5: Keep 7_output.html on disk only when debugging
         output_html_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html', '7_output.html')
+        save_debug_html(rendered_html, output_html_path, template_dir)
 
-        with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
-
-        print(f"✅ Successfully generated: {output_html_path}")
-        print(f"📄 HTML file size: {len(rendered_html)} characters")
-
-        # Step 6: Also copy the CSS file if it doesn't exist
-        import shutil
-        css_source = os.path.join(template_dir, 'style7.css')
-        css_dest = os.path.join(os.path.dirname(output_html_path), 'style7.css')
-
-        if not os.path.exists(css_dest):
-            if os.path.exists(css_source):
-                shutil.copy2(css_source, css_dest)
-                print("📁 Copied style7.css to output_html directory")
+        print(f"✅ Successfully generated Template 7 HTML")
+        print(f"📄 HTML size: {len(rendered_html)} characters")
 
         return {
             'success': True,
+            'html': rendered_html,
             'html_path': output_html_path,
             'alerts_count': len(alerts_result['alerts']) if alerts_result['success'] else 0,
             'data': template_data
@@ -531,14 +502,12 @@ async def generate_7_with_screenshot():
 
     # Generate screenshot
     try:
-        from media.screenshot import generate_image_from_html
+        from media.screenshot import render_html_to_image
 
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
-        output_path = os.path.join(output_dir, "7_output.html")
         image_path = os.path.join(image_dir, "7_output.jpg")
 
-        await generate_image_from_html(output_path, image_path)
+        await render_html_to_image(result['html'], image_path)
         print(f"✅ Template 7 screenshot generated: {image_path}")
         return True
 
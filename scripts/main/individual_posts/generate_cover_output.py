@@ -17,8 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 # Load environment variables
 load_dotenv()
 
-from scripts.main.content.template_engine import TemplateRenderer
-from scripts.main.media.screenshot import generate_image_from_html
+from scripts.main.content.template_engine import TemplateRenderer, save_debug_html
+from scripts.main.media.screenshot import render_html_to_image
 from scripts.main.data.database import fetch_btc_snapshot
 
 def get_sentiment_hook(fear_greed_value):
@@ -60,8 +60,8 @@ async def generate_cover_output():
         fear_greed_value = None
         try:
             btc_data = fetch_btc_snapshot()
-            if btc_data and len(btc_data) > 0:
-                fear_greed_value = btc_data[0].get('fear_greed_value')
+            if not btc_data.empty:
+                fear_greed_value = int(btc_data.iloc[0]['fear_greed_index'])
                 print(f"🟠 Fear & Greed Index: {fear_greed_value}")
         except Exception as e:
             print(f"⚠️  Could not fetch Fear & Greed: {e}")
@@ -87,7 +87,6 @@ async def generate_cover_output():
         output_image = Path(__file__).parent.parent.parent.parent / 'output_images' / '01_cover_output.jpg'
 
         # Ensure directories exist
-        output_dir.mkdir(parents=True, exist_ok=True)
         output_image.parent.mkdir(parents=True, exist_ok=True)
 
         # Render template
@@ -97,26 +96,13 @@ async def generate_cover_output():
             print("❌ Failed to render cover template")
             return False
 
-        # Save HTML
-        with open(output_html, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"✅ Cover HTML generated: {output_html}")
-
-        # Copy CSS files to output_html directory (always copy to get latest changes)
-        import shutil
-        base_templates_dir = Path(__file__).parent.parent.parent.parent / 'base_templates'
-        css_files = ['style_cover.css', 'style_base.css']
-
-        for css_file in css_files:
-            css_source = base_templates_dir / css_file
-            css_dest = output_dir / css_file
-            if css_source.exists():
-                shutil.copy2(css_source, css_dest)
-                print(f"📁 Copied {css_file} to output_html directory")
+        # Keep the HTML on disk only when debugging
+        save_debug_html(html_content, str(output_html))
+        print("✅ Cover HTML rendered")
 
         # Generate screenshot
-        await generate_image_from_html(
-            output_html_file=str(output_html),
+        await render_html_to_image(
+            html_content,
             output_image_path=str(output_image)
         )
         print(f"✅ Cover screenshot generated: {output_image}")
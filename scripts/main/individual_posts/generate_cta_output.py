@@ -17,8 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 # Load environment variables
 load_dotenv()
 
-from scripts.main.content.template_engine import TemplateRenderer
-from scripts.main.media.screenshot import generate_image_from_html
+from scripts.main.content.template_engine import TemplateRenderer, save_debug_html
+from scripts.main.media.screenshot import render_html_to_image
 
 async def generate_cta_output():
     """Generate CTA slide with call to action"""
@@ -44,7 +44,6 @@ async def generate_cta_output():
         output_image = Path(__file__).parent.parent.parent.parent / 'output_images' / '14_cta_output.jpg'
 
         # Ensure directories exist
-        output_dir.mkdir(parents=True, exist_ok=True)
         output_image.parent.mkdir(parents=True, exist_ok=True)
 
         # Render template
@@ -54,26 +53,13 @@ async def generate_cta_output():
             print("❌ Failed to render CTA template")
             return False
 
-        # Save HTML
-        with open(output_html, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"✅ CTA HTML generated: {output_html}")
-
-        # Copy CSS files to output_html directory
-        import shutil
-        base_templates_dir = Path(__file__).parent.parent.parent.parent / 'base_templates'
-        css_files = ['style_cta.css', 'style_base.css']
-
-        for css_file in css_files:
-            css_source = base_templates_dir / css_file
-            css_dest = output_dir / css_file
-            if css_source.exists():
-                shutil.copy2(css_source, css_dest)
-                print(f"📁 Copied {css_file} to output_html directory")
+        # Keep the HTML on disk only when debugging
+        save_debug_html(html_content, str(output_html))
+        print("✅ CTA HTML rendered")
 
         # Generate screenshot
-        await generate_image_from_html(
-            output_html_file=str(output_html),
+        await render_html_to_image(
+            html_content,
             output_image_path=str(output_image)
         )
         print(f"✅ CTA screenshot generated: {output_image}")
@@ -17,8 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 # Load environment variables
 load_dotenv()
 
-from scripts.main.content.template_engine import TemplateRenderer
-from scripts.main.media.screenshot import generate_image_from_html
+from scripts.main.content.template_engine import TemplateRenderer, save_debug_html
+from scripts.main.media.screenshot import render_html_to_image
 from scripts.main.data.database import fetch_btc_snapshot, fetch_top_coins
 
 def get_fear_greed_label(value):
@@ -67,11 +67,8 @@ async def generate_index_output():
             btc_row = btc_data.iloc[0]
             fear_greed_value = btc_row.get('fear_greed_index')  # Fixed: column name is 'fear_greed_index' not 'fear_greed_value'
             price_raw = btc_row.get('price', 0)
-            # Convert price to float if it's a string
             try:
-                # Remove '$' if present in the price string
-                price_str = str(price_raw).replace('$', '')
-                price_float = float(price_str)
+                price_float = float(price_raw)
                 btc_price = f"{price_float:,.0f}"
             except (ValueError, TypeError):
                 btc_price = str(price_raw)
@@ -135,7 +132,6 @@ async def generate_index_output():
         output_image = Path(__file__).parent.parent.parent.parent / 'output_images' / '02_index_output.jpg'
 
         # Ensure directories exist
-        output_dir.mkdir(parents=True, exist_ok=True)
         output_image.parent.mkdir(parents=True, exist_ok=True)
 
         # Render template
@@ -145,26 +141,13 @@ async def generate_index_output():
             print("❌ Failed to render index template")
             return False
 
-        # Save HTML
-        with open(output_html, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"✅ Index HTML generated: {output_html}")
-
-        # Copy CSS files to output_html directory
-        import shutil
-        base_templates_dir = Path(__file__).parent.parent.parent.parent / 'base_templates'
-        css_files = ['style_index.css', 'style_base.css']
-
-        for css_file in css_files:
-            css_source = base_templates_dir / css_file
-            css_dest = output_dir / css_file
-            if css_source.exists():
-                shutil.copy2(css_source, css_dest)
-                print(f"📁 Copied {css_file} to output_html directory")
+        # Keep the HTML on disk only when debugging
+        save_debug_html(html_content, str(output_html))
+        print("✅ Index HTML rendered")
 
         # Generate screenshot
-        await generate_image_from_html(
-            output_html_file=str(output_html),
+        await render_html_to_image(
+            html_content,
             output_image_path=str(output_image)
         )
         print(f"✅ Index screenshot generated: {output_image}")
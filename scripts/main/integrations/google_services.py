@@ -2,16 +2,41 @@
 
 import os
 import json
+import threading
 import pandas as pd
 import gspread
+from gspread.exceptions import APIError
+from gspread.urls import SPREADSHEET_URL, SPREADSHEET_VALUES_BATCH_URL
 from oauth2client.service_account import ServiceAccountCredentials
 from googleapiclient.discovery import build
 
+
+def quote_sheet_name(sheet_name):
+    """Quote a worksheet name for use as an A1 range (e.g. 'TopGainer/TopLosers')."""
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+def values_to_dataframe(values):
+    """Build a DataFrame from a header row plus data rows read from a sheet.
+
+    The API drops trailing blank cells, so short rows are padded with empty
+    strings. Every cell keeps the text the sheet displays (as
+    get_all_values() returned it); callers convert the columns they compute
+    with, e.g. pd.to_numeric on a count or a "%"-stripped percentage.
+    """
+    if not values:
+        return pd.DataFrame()
+
+    header = values[0]
+    rows = [row + [''] * (len(header) - len(row)) for row in values[1:]]
+    return pd.DataFrame([row[:len(header)] for row in rows], columns=header, dtype=object)
+
+
 class GoogleServicesManager:
     """Manager for Google Sheets and Drive operations."""
 
-    def __init__(self):
-        """Initialize Google services with credentials from environment."""
+    def __init__(self, gc=None, drive_service=None):
+        """Initialize Google services with credentials from environment, unless clients are given."""
         self.gcp_credentials_json = os.getenv('GCP_CREDENTIALS')
         self.scope = [
             'https://spreadsheets.google.com/feeds',
@@ -19,9 +44,13 @@ class GoogleServicesManager:
             'https://www.googleapis.com/auth/spreadsheets'
         ]
         self.credentials = None
-        self.gc = None
-        self.drive_service = None
-        self._initialize_services()
+        self.gc = gc
+        self.drive_service = drive_service
+        # Loaded DataFrames by (spreadsheet key, revision) -> {sheet name: DataFrame}
+        self._sheet_cache = {}
+        self._cache_lock = threading.Lock()
+        if gc is None:
+            self._initialize_services()
 
     def _initialize_services(self):
         """Initialize Google services with credentials."""
@@ -50,30 +79,84 @@ class GoogleServicesManager:
         """Get Google Drive service instance."""
         return self.drive_service
 
-    def load_spreadsheet_data(self, spreadsheet_key):
-        """Load all sheets from a Google Spreadsheet into DataFrames."""
+    def spreadsheet_revision(self, spreadsheet_key):
+        """Return the Drive version of a spreadsheet, which changes on every edit; None if unknown."""
+        if self.drive_service is None:
+            return None
+        try:
+            metadata = self.drive_service.files().get(
+                fileId=spreadsheet_key, fields='version', supportsAllDrives=True
+            ).execute()
+            return metadata.get('version')
+        except Exception as e:
+            print(f"⚠️  Could not read spreadsheet revision, skipping cache: {e}")
+            return None
+
+    def list_sheet_names(self, spreadsheet_key):
+        """Return the worksheet titles of a spreadsheet in one metadata request."""
+        response = self.gc.request(
+            'get', SPREADSHEET_URL % spreadsheet_key, params={'fields': 'sheets.properties.title'}
+        ).json()
+        return [sheet['properties']['title'] for sheet in response.get('sheets', [])]
+
+    def _batch_get(self, spreadsheet_key, sheet_names):
+        """Read several worksheets with a single values:batchGet request."""
+        response = self.gc.request(
+            'get', SPREADSHEET_VALUES_BATCH_URL % spreadsheet_key,
+            params={'ranges': [quote_sheet_name(name) for name in sheet_names], 'majorDimension': 'ROWS'}
+        ).json()
+        value_ranges = response.get('valueRanges', [])
+        return {name: values_to_dataframe(value_range.get('values', []))
+                for name, value_range in zip(sheet_names, value_ranges)}
+
+    def load_spreadsheet_data(self, spreadsheet_key, sheet_names=None):
+        """Load worksheets of a Google Spreadsheet into DataFrames.
+
+        Only the requested sheets (all sheets when None) are read, in one
+        values:batchGet request. Results are cached by the spreadsheet's
+        revision, so loading again before the sheet changes costs only the
+        revision lookup. Requested sheets that do not exist are left out.
+        """
         try:
-            # Open spreadsheet
-            sh = self.gc.open_by_key(spreadsheet_key)
-
-            # Get all sheet names
-            sheet_names = [sheet.title for sheet in sh.worksheets()]
-            print(f"✅ Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
-
-            # Load each sheet into a DataFrame
-            sheets_data = {}
-            for sheet_name in sheet_names:
-                worksheet = sh.worksheet(sheet_name)
-                data = worksheet.get_all_values()
-                if data:
-                    df = pd.DataFrame(data[1:], columns=data[0])
-                    sheets_data[sheet_name] = df
-                    print(f"✅ Loaded sheet: {sheet_name} ({len(df)} rows)")
-                else:
-                    sheets_data[sheet_name] = pd.DataFrame()
-                    print(f"⚠️  Empty sheet: {sheet_name}")
-
-            print("✅ Spreadsheet data loaded successfully")
+            if sheet_names is None:
+                sheet_names = self.list_sheet_names(spreadsheet_key)
+            sheet_names = list(dict.fromkeys(sheet_names))
+
+            revision = self.spreadsheet_revision(spreadsheet_key)
+            with self._cache_lock:
+                if revision is not None:
+                    # Drop frames from older revisions of this spreadsheet
+                    for key in [key for key in self._sheet_cache if key[0] == spreadsheet_key and key[1] != revision]:
+                        del self._sheet_cache[key]
+                cached = self._sheet_cache.setdefault((spreadsheet_key, revision), {}) if revision is not None else {}
+                missing = [name for name in sheet_names if name not in cached]
+
+            if missing:
+                try:
+                    loaded = self._batch_get(spreadsheet_key, missing)
+                except APIError as e:
+                    # An unknown sheet name fails the whole batch; retry with the sheets that exist
+                    existing = set(self.list_sheet_names(spreadsheet_key))
+                    if all(name in existing for name in missing):
+                        raise
+                    absent = [name for name in missing if name not in existing]
+                    print(f"⚠️  Sheets not found: {', '.join(absent)} ({e})")
+                    missing = [name for name in missing if name in existing]
+                    loaded = self._batch_get(spreadsheet_key, missing) if missing else {}
+
+                for name, df in loaded.items():
+                    if df.empty:
+                        print(f"⚠️  Empty sheet: {name}")
+                    else:
+                        print(f"✅ Loaded sheet: {name} ({len(df)} rows)")
+                with self._cache_lock:
+                    cached.update(loaded)
+            else:
+                print(f"✅ Spreadsheet unchanged (revision {revision}), using cached sheets")
+
+            # Callers add columns to these frames; hand out copies so the cache stays clean
+            sheets_data = {name: cached[name].copy() for name in sheet_names if name in cached}
+            print(f"✅ Spreadsheet data loaded successfully ({len(sheets_data)} sheets)")
             return sheets_data
 
         except Exception as e:
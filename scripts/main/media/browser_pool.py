@@ -0,0 +1,176 @@
+"""Shared Chromium instance for screenshot rendering.
+
+Launching Chromium costs far more than laying out and painting one slide,
+so a run keeps one browser alive and gives every render a fresh, isolated
+browser context instead. Open a session around a batch of renders:
+
+    async with browser_session():
+        await generate_image_from_html(...)   # every call reuses the browser
+
+With ``share=True`` the browser also listens for the Chrome DevTools
+Protocol and its endpoint is exported in SOCIALS_BROWSER_CDP_ENDPOINT, so
+generator subprocesses connect to it instead of launching their own (as
+post_mega_carousel.py does for its 14 slides).
+"""
+
+import asyncio
+import os
+import socket
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+# Environment variable carrying the CDP endpoint of a browser shared by a parent process
+BROWSER_ENDPOINT_ENV_VAR = 'SOCIALS_BROWSER_CDP_ENDPOINT'
+
+
+def _free_port():
+    """Pick an unused local TCP port for the DevTools endpoint."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BrowserPool:
+    """One Chromium per process, handing out a fresh context and page per render."""
+
+    def __init__(self, headless=True, share=False, endpoint=None, playwright_factory=None):
+        """Initialize the pool; the browser starts on first use.
+
+        Args:
+            headless: Launch Chromium without a window
+            share: Expose a CDP endpoint so other processes can connect
+            endpoint: CDP endpoint of a running browser to connect to instead of
+                launching; defaults to SOCIALS_BROWSER_CDP_ENDPOINT
+            playwright_factory: Callable returning a Playwright context manager;
+                defaults to async_playwright
+        """
+        self.headless = headless
+        self.share = share
+        self.endpoint = endpoint if endpoint is not None else os.getenv(BROWSER_ENDPOINT_ENV_VAR)
+        self.cdp_endpoint = None
+        self._playwright_factory = playwright_factory or async_playwright
+        self._playwright = None
+        self._browser = None
+        self._loop = None
+        self._lock = None
+
+        self.launches = 0
+        self.connects = 0
+        self.renders = 0
+
+    async def start(self):
+        """Return the shared browser, launching or connecting on first use."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Playwright objects are bound to the event loop that created them
+            self._playwright = self._browser = None
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await self._playwright_factory().start()
+                self._browser = await self._open_browser()
+        return self._browser
+
+    async def _open_browser(self):
+        """Connect to a shared browser when one is advertised, otherwise launch Chromium."""
+        chromium = self._playwright.chromium
+        if self.endpoint:
+            try:
+                browser = await chromium.connect_over_cdp(self.endpoint)
+                self.connects += 1
+                return browser
+            except Exception as e:
+                print(f"⚠️  Shared browser at {self.endpoint} unavailable, launching a new one: {e}")
+
+        args = []
+        if self.share:
+            port = _free_port()
+            args.append(f'--remote-debugging-port={port}')
+            self.cdp_endpoint = f'http://127.0.0.1:{port}'
+        browser = await chromium.launch(headless=self.headless, args=args)
+        self.launches += 1
+        return browser
+
+    @asynccontextmanager
+    async def page(self, viewport=None, device_scale_factor=1):
+        """Yield a page in a new browser context, closing the context afterwards."""
+        browser = await self.start()
+        context = await browser.new_context(viewport=viewport, device_scale_factor=device_scale_factor)
+        try:
+            page = await context.new_page()
+            self.renders += 1
+            yield page
+        finally:
+            await context.close()
+
+    async def close(self):
+        """Close the browser (or disconnect from a shared one) and stop Playwright."""
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        self.cdp_endpoint = None
+        try:
+            if browser is not None:
+                await browser.close()
+        finally:
+            if playwright is not None:
+                await playwright.stop()
+
+    def stats(self):
+        """Return launch and render counters for reporting."""
+        return {'launches': self.launches, 'connects': self.connects, 'renders': self.renders}
+
+    async def __aenter__(self):
+        """Start the browser when entering an async with block."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Shut the browser down when leaving an async with block."""
+        await self.close()
+
+
+# Pool of the innermost open browser_session(), if any
+_active_pool = None
+
+
+def current_browser_pool():
+    """Return the pool of the open browser session, or None outside a session."""
+    return _active_pool
+
+
+@asynccontextmanager
+async def browser_session(share=False, **kwargs):
+    """Keep one browser alive for every render inside the block, then shut it down.
+
+    Nested sessions reuse the outer pool. With share=True the CDP endpoint is
+    exported in SOCIALS_BROWSER_CDP_ENDPOINT for child processes while the
+    session is open.
+    """
+    global _active_pool
+    if _active_pool is not None:
+        yield _active_pool
+        return
+
+    pool = BrowserPool(share=share, **kwargs)
+    _active_pool = pool
+    previous_endpoint = os.environ.get(BROWSER_ENDPOINT_ENV_VAR)
+    try:
+        await pool.start()
+        if pool.cdp_endpoint:
+            os.environ[BROWSER_ENDPOINT_ENV_VAR] = pool.cdp_endpoint
+        yield pool
+    finally:
+        _active_pool = None
+        if pool.cdp_endpoint:
+            if previous_endpoint is None:
+                os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            else:
+                os.environ[BROWSER_ENDPOINT_ENV_VAR] = previous_endpoint
+        stats = pool.stats()
+        await pool.close()
+        print(f"🖼️  Browser session: {stats['renders']} renders, "
+              f"{stats['launches']} launches, {stats['connects']} connects")
@@ -0,0 +1,94 @@
+"""Render profiles: how each kind of slide is laid out, rasterized and encoded.
+
+Templates are authored at a fixed CSS size (carousel slides at 2160x2700,
+stories at 1080x1920). A profile keeps that layout as the viewport and
+picks the device scale factor that rasterizes it straight at the output
+size, so a carousel slide is painted at 1080x1350 instead of being painted
+at 2160x2700 and downscaled by Instagram. The screenshot is clipped to the
+layout box, so the image is exactly the output size.
+
+Output width, quality and format come from ImageConfig (IMAGE_WIDTH,
+IMAGE_QUALITY, IMAGE_FORMAT); VIEWPORT_SCALE multiplies the output size,
+so VIEWPORT_SCALE=2 reproduces the old 2160x2700 carousel images.
+BROWSER_TIMEOUT bounds the wait for a page to become ready.
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# src.config lives at the repo root (as in render_queue.py)
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from src.config import config
+
+CAROUSEL_PROFILE = 'carousel'
+STORY_PROFILE = 'story'
+
+# CSS size each template family is authored at (see base_templates/style*.css)
+TEMPLATE_LAYOUTS = {
+    CAROUSEL_PROFILE: (2160, 2700),   # 4:5 feed post
+    STORY_PROFILE: (1080, 1920),      # 9:16 story
+}
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Viewport, scale, clip and encoding for one template family."""
+
+    name: str
+    layout_width: int
+    layout_height: int
+    output_width: int
+    quality: int = 95
+    image_type: str = 'jpeg'
+    ready_timeout_ms: int = 60000
+
+    @property
+    def device_scale_factor(self):
+        """Device pixels per CSS pixel that paint the layout at the output width."""
+        return self.output_width / self.layout_width
+
+    @property
+    def output_height(self):
+        """Image height in pixels, keeping the layout's aspect ratio."""
+        return round(self.layout_height * self.device_scale_factor)
+
+    @property
+    def viewport(self):
+        """Viewport in CSS pixels: the size the template is laid out at."""
+        return {'width': self.layout_width, 'height': self.layout_height}
+
+    @property
+    def clip(self):
+        """Screenshot clip covering exactly the layout box."""
+        return {'x': 0, 'y': 0, 'width': self.layout_width, 'height': self.layout_height}
+
+    def screenshot_options(self):
+        """Keyword arguments for page.screenshot()."""
+        options = {'type': self.image_type, 'clip': self.clip}
+        if self.image_type == 'jpeg':
+            options['quality'] = self.quality
+        return options
+
+
+def get_render_profile(profile=CAROUSEL_PROFILE, image_config=None):
+    """Return the RenderProfile for a template family (a profile passes through unchanged)."""
+    if isinstance(profile, RenderProfile):
+        return profile
+    if profile not in TEMPLATE_LAYOUTS:
+        raise ValueError(f"Unknown render profile {profile!r}; expected one of {sorted(TEMPLATE_LAYOUTS)}")
+
+    image_config = image_config or config.image
+    layout_width, layout_height = TEMPLATE_LAYOUTS[profile]
+    return RenderProfile(
+        name=profile,
+        layout_width=layout_width,
+        layout_height=layout_height,
+        output_width=round(image_config.width * image_config.viewport_scale),
+        quality=image_config.quality,
+        image_type='png' if image_config.format.lower() == 'png' else 'jpeg',
+        ready_timeout_ms=image_config.browser_timeout,
+    )
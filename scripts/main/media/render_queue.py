@@ -0,0 +1,128 @@
+"""Bounded-concurrency render queue on one shared browser.
+
+A fixed number of workers (MAX_WORKERS, default 4) pull screenshot jobs
+from a bounded queue and render them as separate pages of the session
+browser. submit() waits while the queue is full, so a producer can never
+hold more than a couple of slides' worth of pages in memory at once:
+
+    async with RenderQueue() as renders:
+        await renders.submit(generate_image_from_html, html_file, image_file)
+    print(renders.failures)
+
+Each job gets BROWSER_TIMEOUT per attempt and is retried through
+playwright_retry_manager, so one hung or crashed page cannot stall the
+batch.
+"""
+
+import asyncio
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from .browser_pool import browser_session
+
+# src.retry_utils imports its siblings as top-level modules, so src/ is needed
+# next to the repo root (as tests/conftest.py does)
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from src.config import config
+from src.retry_utils import playwright_retry_manager
+
+
+class RenderQueue:
+    """Render jobs on at most `workers` pages at a time, with timeout and retry per job."""
+
+    def __init__(self, workers=None, timeout=None, retry_manager=None):
+        """Initialize the queue; workers start when the async with block is entered.
+
+        Args:
+            workers: Pages rendering at once; defaults to AppConfig.max_workers
+            timeout: Seconds per attempt; defaults to ImageConfig.browser_timeout
+            retry_manager: RetryManager used per job; defaults to playwright_retry_manager
+        """
+        self.workers = max(1, workers or config.app.max_workers)
+        self.timeout = timeout if timeout is not None else config.image.browser_timeout / 1000
+        self.retry_manager = retry_manager or playwright_retry_manager
+        self.failures = []
+        self.completed = 0
+        self._queue = None
+        self._tasks = []
+        self._stack = None
+
+    async def __aenter__(self):
+        """Open (or join) the browser session and start the workers."""
+        global _active_queue
+        self._stack = AsyncExitStack()
+        await self._stack.enter_async_context(browser_session())
+        # Room for one waiting job per worker; submit() blocks beyond that
+        self._queue = asyncio.Queue(maxsize=self.workers)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if _active_queue is None:
+            _active_queue = self
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Wait for queued jobs (unless the block failed), then stop the workers."""
+        global _active_queue
+        if _active_queue is self:
+            _active_queue = None
+        try:
+            if exc_type is None:
+                await self._queue.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            await self._stack.aclose()
+
+    async def submit(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs), waiting while every worker is busy and the queue is full.
+
+        Returns:
+            asyncio.Future resolving to True once the job succeeded or False
+            once its retries are exhausted
+        """
+        if self._queue is None:
+            raise RuntimeError("RenderQueue must be entered with 'async with' before submitting jobs")
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, kwargs, done))
+        return done
+
+    async def render_all(self, jobs):
+        """Submit (func, *args) tuples and return their success flags in order."""
+        futures = [await self.submit(*job) for job in jobs]
+        return list(await asyncio.gather(*futures))
+
+    async def _attempt(self, func, args, kwargs):
+        """Run one attempt of a job under the per-job timeout."""
+        return await asyncio.wait_for(func(*args, **kwargs), self.timeout)
+
+    async def _worker(self):
+        """Render queued jobs one at a time until cancelled."""
+        while True:
+            func, args, kwargs, done = await self._queue.get()
+            try:
+                await self.retry_manager.execute_async(self._attempt, func, args, kwargs)
+                self.completed += 1
+                succeeded = True
+            except Exception as e:
+                label = args[-1] if args else getattr(func, '__name__', 'job')
+                print(f"❌ Render failed for {label}: {type(e).__name__}: {e}")
+                self.failures.append((label, e))
+                succeeded = False
+            finally:
+                self._queue.task_done()
+            if not done.done():
+                done.set_result(succeeded)
+
+
+# Queue of the outermost open RenderQueue, if any
+_active_queue = None
+
+
+def current_render_queue():
+    """Return the open render queue, or None outside one."""
+    return _active_queue
@@ -1,54 +1,199 @@
-"""Media processing and screenshot generation module using Playwright."""
+"""Media processing and screenshot generation module using Playwright.
+
+Rendered HTML goes straight to a pooled page with set_content; nothing is
+written to disk. The page's base URL sits under a private origin that a
+route handler maps onto the local filesystem, so relative references such
+as ``style2.css`` or ``../input_images/1.png`` resolve against
+base_templates/ and local logo files are served from memory after the
+first read.
+
+Before the screenshot a page must be ready: web fonts loaded
+(document.fonts.ready), every <img> decoded, and no element left with
+data-ready other than "true". Templates that finish work in script mark
+an element data-ready="false" and set it to "true" when done.
+"""
 
 import asyncio
+import mimetypes
 import os
-from playwright.async_api import async_playwright
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from .browser_pool import BrowserPool, current_browser_pool
+from .render_profiles import CAROUSEL_PROFILE, STORY_PROFILE, get_render_profile
+from .render_queue import RenderQueue, current_render_queue
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+TEMPLATE_DIR = PROJECT_ROOT / 'base_templates'
+
+# Private origin whose paths map onto local files; never reaches the network
+RENDER_ORIGIN = 'http://socials.render'
+# Empty document navigated to first so the page URL (and base URL) sits in the template directory
+BASE_DOCUMENT_NAME = '__render__.html'
+
+# Local file:// URIs (cached logos) are rewritten onto the render origin
+FILE_URI_PATTERN = re.compile(r'file://(?=/)')
+
+# Readiness phases, each awaited in the page
+FONTS_READY_JS = "() => document.fonts.ready.then(() => document.fonts.size)"
+IMAGES_DECODED_JS = "() => Promise.all(Array.from(document.images, img => img.decode().catch(() => null)))"
+READY_FLAG_JS = "() => !document.querySelector('[data-ready]:not([data-ready=\"true\"])')"
+
+# (path, mtime) -> (body, content type) of every asset served so far
+_asset_cache = {}
+
+
+def asset_url(path):
+    """Return the render-origin URL serving a local file or directory."""
+    return RENDER_ORIGIN + Path(path).resolve().as_uri()[len('file://'):]
+
+
+def _read_asset(path):
+    """Return (body, content type) for a local file, reading it only once per modification."""
+    key = (path, os.stat(path).st_mtime_ns)
+    cached = _asset_cache.get(key)
+    if cached is None:
+        with open(path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        cached = _asset_cache[key] = (body, content_type)
+    return cached
+
+
+async def _serve_asset(route):
+    """Fulfil a render-origin request from the filesystem (or an empty base document)."""
+    path = url2pathname(urlsplit(route.request.url).path)
+    if os.path.basename(path) == BASE_DOCUMENT_NAME:
+        await route.fulfill(status=200, body='<!DOCTYPE html>', content_type='text/html')
+        return
+    try:
+        body, content_type = _read_asset(path)
+    except OSError:
+        await route.fulfill(status=404, body='')
+        return
+    await route.fulfill(status=200, body=body, content_type=content_type)
+
+
+@asynccontextmanager
+async def render_page(profile=CAROUSEL_PROFILE):
+    """Yield a fresh page sized for a render profile, from the open browser session or a one-off browser."""
+    profile = get_render_profile(profile)
+    pool = current_browser_pool()
+    if pool is not None:
+        async with pool.page(viewport=profile.viewport, device_scale_factor=profile.device_scale_factor) as page:
+            yield page
+        return
+
+    async with BrowserPool() as pool:
+        async with pool.page(viewport=profile.viewport, device_scale_factor=profile.device_scale_factor) as page:
+            yield page
+
+
+async def load_html(page, html, base_dir=TEMPLATE_DIR):
+    """Load an HTML string into a page, serving its relative and local file references from memory."""
+    await page.route(f"{RENDER_ORIGIN}/**", _serve_asset)
+
+    # Give the document its base URL, then swap in the rendered HTML
+    await page.goto(asset_url(os.path.join(base_dir, BASE_DOCUMENT_NAME)))
+    await page.set_content(FILE_URI_PATTERN.sub(RENDER_ORIGIN, html), wait_until='load')
 
-async def generate_image_from_html(output_html_file, output_image_path):
-    """Launch Playwright, load the HTML file, and save a screenshot of it."""
-    async with async_playwright() as p:
-        # Launch a browser
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
 
-        await page.set_viewport_size({"width": 2160, "height": 2700})
+async def wait_until_ready(page, timeout_ms):
+    """Wait until fonts are loaded, images decoded and data-ready flags set; return each phase in ms.
 
-        # Set device scale factor for even better quality
+    Each phase only takes as long as the page needs. The phases share one
+    deadline timeout_ms from the start; a page still not ready by then
+    raises asyncio.TimeoutError so the render is retried rather than
+    captured half-drawn.
+    """
+    timings = {}
+    phases = (
+        ('fonts', lambda remaining: page.evaluate(FONTS_READY_JS)),
+        ('images', lambda remaining: page.evaluate(IMAGES_DECODED_JS)),
+        ('ready_flag', lambda remaining: page.wait_for_function(READY_FLAG_JS, timeout=remaining * 1000)),
+    )
+    deadline = time.perf_counter() + timeout_ms / 1000
+    for phase, wait in phases:
+        start = time.perf_counter()
+        remaining = deadline - start
+        if remaining <= 0:
+            # Playwright treats timeout=0 as no timeout, so never hand it on
+            raise asyncio.TimeoutError(f"Page not ready within {timeout_ms} ms (waiting for {phase})")
+        await asyncio.wait_for(wait(remaining), remaining)
+        timings[phase] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+async def render_html_to_image(html, output_image_path, profile=CAROUSEL_PROFILE, base_dir=TEMPLATE_DIR):
+    """Render an HTML string in a fresh page and save a screenshot of it.
+
+    Relative stylesheet and image references resolve against base_dir, so
+    templates' CSS is loaded from base_templates/ without copying it anywhere.
+    The profile ('carousel', 'story' or a RenderProfile) sets the viewport,
+    scale and clip, so the image comes out at the configured output size.
+    Returns the time spent in each readiness phase, in milliseconds.
+    """
+    profile = get_render_profile(profile)
+    async with render_page(profile) as page:
         await page.emulate_media(media='screen')
-        await page.evaluate("() => { document.body.style.zoom = '1'; }")
+        await load_html(page, html, base_dir)
+        timings = await wait_until_ready(page, profile.ready_timeout_ms)
+
+        await page.screenshot(path=output_image_path, **profile.screenshot_options())
+
+        waits = ', '.join(f"{phase} {ms:.0f} ms" for phase, ms in timings.items())
+        print(f"Screenshot saved as {output_image_path} (ready after {waits}).")
+        return timings
+
+
+async def generate_image_from_html(output_html_file, output_image_path, profile=CAROUSEL_PROFILE):
+    """Screenshot an HTML file from disk, resolving its relative references next to it.
 
-        # Load the rendered HTML file
-        await page.goto('file://' + os.path.abspath(output_html_file))
+    Inside a browser_session() the page comes from the session's shared
+    browser; otherwise a browser is started for this one image.
+    """
+    with open(output_html_file, encoding='utf-8') as f:
+        html = f.read()
+    return await render_html_to_image(html, output_image_path, profile=profile,
+                                      base_dir=os.path.dirname(os.path.abspath(output_html_file)))
 
-        # Capture the screenshot of the page with high quality settings
-        await page.screenshot(
-            path=output_image_path,
-            type='jpeg',
-            quality=95,
-            full_page=True
-        )
 
-        print(f"Screenshot saved as {output_image_path}.")
+async def queue_screenshot(html, output_image_path, **options):
+    """Hand rendered HTML to the open RenderQueue, or screenshot it right away outside one.
 
-        # Close the browser
-        await browser.close()
+    Inside a queue this returns once the job is queued, so the caller can
+    build its next slide while earlier ones render.
+    """
+    queue = current_render_queue()
+    if queue is None:
+        await render_html_to_image(html, output_image_path, **options)
+        return
+    await queue.submit(render_html_to_image, html, output_image_path, **options)
 
-async def generate_multiple_screenshots(html_files, output_dir):
-    """Generate screenshots for multiple HTML files."""
+async def generate_multiple_screenshots(html_files, output_dir, workers=None):
+    """Generate screenshots for multiple HTML files, at most `workers` pages at a time."""
     os.makedirs(output_dir, exist_ok=True)
 
-    tasks = []
+    jobs = []
     for html_file in html_files:
         if os.path.exists(html_file):
             base_name = os.path.splitext(os.path.basename(html_file))[0]
             output_path = os.path.join(output_dir, f"{base_name}.jpg")
-            tasks.append(generate_image_from_html(html_file, output_path))
+            jobs.append((generate_image_from_html, html_file, output_path))
 
-    if tasks:
-        await asyncio.gather(*tasks)
-        print(f"Generated {len(tasks)} screenshots in {output_dir}")
+    if jobs:
+        # One browser for the whole batch, a bounded number of pages at once
+        async with RenderQueue(workers=workers) as renders:
+            results = await renders.render_all(jobs)
+        print(f"Generated {sum(results)}/{len(jobs)} screenshots in {output_dir}")
+        return results
     else:
         print("No valid HTML files found for screenshot generation")
+        return []
 
 def create_placeholder_image(output_path, slide_number=1, size=(1080, 1080)):
     """Create a placeholder image when content is not available."""
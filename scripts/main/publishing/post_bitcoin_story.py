@@ -16,7 +16,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from jinja2 import Environment, FileSystemLoader
 from data.database import fetch_btc_snapshot
-from media.screenshot import generate_image_from_html
+from content.formatting import format_number, format_usd_units
+from content.logo_assets import localize_logos
+from content.template_engine import save_debug_html
+from media.screenshot import STORY_PROFILE, render_html_to_image
 from publishing.session_manager import InstagramSessionManager
 
 # Load environment variables
@@ -40,28 +43,6 @@ SESSION_FILE = PROJECT_ROOT / "data" / "instagram_session.json"
 HTML_OUTPUT = OUTPUT_HTML_DIR / "bitcoin_story_output.html"
 IMAGE_OUTPUT = OUTPUT_IMAGES_DIR / "bitcoin_story_output.jpg"
 
-def format_large_number(value):
-    """Format large numbers with B/T suffixes"""
-    try:
-        num = float(value)
-        if num >= 1_000_000_000_000:
-            return f"{num / 1_000_000_000_000:.2f}T"
-        elif num >= 1_000_000_000:
-            return f"{num / 1_000_000_000:.2f}B"
-        elif num >= 1_000_000:
-            return f"{num / 1_000_000:.2f}M"
-        return f"{num:.2f}"
-    except (ValueError, TypeError):
-        return str(value)
-
-def format_percentage(value):
-    """Format percentage values"""
-    try:
-        num = float(value)
-        return f"{num:+.2f}"  # Include + for positive values
-    except (ValueError, TypeError):
-        return str(value)
-
 def generate_bitcoin_story_html():
     """Generate Bitcoin Intelligence Story HTML"""
     print("📸 Generating Bitcoin Intelligence Story...")
@@ -77,12 +58,11 @@ def generate_bitcoin_story_html():
     btc_snapshot = btc_snapshot_df.to_dict('records')[0]
 
     # Format data
-    btc_snapshot['price'] = format_large_number(btc_snapshot['price'])
-    btc_snapshot['market_cap'] = format_large_number(btc_snapshot['market_cap'])
-    btc_snapshot['volume24h'] = format_large_number(btc_snapshot['volume24h'])
-    btc_snapshot['percent_change24h'] = format_percentage(btc_snapshot['percent_change24h'])
-    btc_snapshot['percent_change7d'] = format_percentage(btc_snapshot['percent_change7d'])
-    btc_snapshot['percent_change30d'] = format_percentage(btc_snapshot['percent_change30d'])
+    btc_snapshot['price'] = format_number(btc_snapshot['price'])
+    btc_snapshot['market_cap'] = format_usd_units(btc_snapshot['market_cap'], prefix="")
+    btc_snapshot['volume24h'] = format_usd_units(btc_snapshot['volume24h'], prefix="")
+    for key in ('percent_change24h', 'percent_change7d', 'percent_change30d'):
+        btc_snapshot[key] = format_number(btc_snapshot[key], signed=True)
 
     # Current timestamp
     now = datetime.now()
@@ -97,54 +77,22 @@ def generate_bitcoin_story_html():
     # Render template
     env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
     template = env.get_template('bitcoin_story.html')
-    html_content = template.render(**context)
-
-    # Save HTML
-    OUTPUT_HTML_DIR.mkdir(parents=True, exist_ok=True)
-    with open(HTML_OUTPUT, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-
-    print(f"✅ Bitcoin Story HTML generated: {HTML_OUTPUT}")
+    html_content = template.render(**localize_logos(context))
 
-    # Copy CSS to output directory
-    import shutil
-    css_source = TEMPLATES_DIR / "style_bitcoin_story.css"
-    css_dest = OUTPUT_HTML_DIR / "style_bitcoin_story.css"
-    shutil.copy2(css_source, css_dest)
-    print(f"📁 Copied style_bitcoin_story.css to output_html directory")
+    # Keep the HTML on disk only when debugging
+    save_debug_html(html_content, str(HTML_OUTPUT), str(TEMPLATES_DIR))
+    print("✅ Bitcoin Story HTML rendered")
 
-    return HTML_OUTPUT
+    return html_content
 
-async def generate_bitcoin_story_screenshot(html_file):
+async def generate_bitcoin_story_screenshot(html):
     """Generate screenshot from HTML"""
     print("📸 Generating screenshot...")
 
     OUTPUT_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
     # Generate screenshot (1080x1920 for Instagram Story)
-    # First create a custom screenshot function with story dimensions
-    from playwright.async_api import async_playwright
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # Set viewport to Instagram Story size
-        await page.set_viewport_size({"width": 1080, "height": 1920})
-        await page.emulate_media(media='screen')
-
-        # Load HTML
-        await page.goto('file://' + str(html_file.resolve()))
-
-        # Capture screenshot
-        await page.screenshot(
-            path=str(IMAGE_OUTPUT),
-            type='jpeg',
-            quality=95,
-            full_page=True
-        )
-
-        await browser.close()
+    await render_html_to_image(html, str(IMAGE_OUTPUT), profile=STORY_PROFILE)
 
     print(f"✅ Bitcoin Story screenshot generated: {IMAGE_OUTPUT}")
     return IMAGE_OUTPUT
@@ -172,11 +120,11 @@ def post_bitcoin_story_to_instagram(image_path):
 async def main():
     """Main execution flow"""
     try:
-        # Step 1: Generate HTML
-        html_file = generate_bitcoin_story_html()
+        # Step 1: Render HTML
+        html = generate_bitcoin_story_html()
 
         # Step 2: Generate Screenshot
-        image_file = await generate_bitcoin_story_screenshot(html_file)
+        image_file = await generate_bitcoin_story_screenshot(html)
 
         # Step 3: Post to Instagram
         media = post_bitcoin_story_to_instagram(image_file)
@@ -16,6 +16,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from jinja2 import Environment, FileSystemLoader
 from data.database import fetch_trading_opportunities
+from content.logo_assets import localize_logos
+from content.template_engine import save_debug_html
+from media.screenshot import STORY_PROFILE, render_html_to_image
 from publishing.session_manager import InstagramSessionManager
 
 # Load environment variables
@@ -112,27 +115,16 @@ def generate_trading_story_html():
     # Render template
     env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
     template = env.get_template('trading_calls_story.html')
-    html_content = template.render(**context)
+    html_content = template.render(**localize_logos(context))
 
-    # Save HTML
-    OUTPUT_HTML_DIR.mkdir(parents=True, exist_ok=True)
+    # Keep the HTML on disk only when debugging
     html_output = OUTPUT_HTML_DIR / f"{call_type.lower()}_calls_story_output.html"
+    save_debug_html(html_content, str(html_output), str(TEMPLATES_DIR))
+    print(f"✅ {call_type} Calls Story HTML rendered")
 
-    with open(html_output, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    return html_content
 
-    print(f"✅ {call_type} Calls Story HTML generated: {html_output}")
-
-    # Copy CSS to output directory
-    import shutil
-    css_source = TEMPLATES_DIR / "style_trading_calls_story.css"
-    css_dest = OUTPUT_HTML_DIR / "style_trading_calls_story.css"
-    shutil.copy2(css_source, css_dest)
-    print(f"📁 Copied style_trading_calls_story.css to output_html directory")
-
-    return html_output
-
-async def generate_trading_story_screenshot(html_file):
+async def generate_trading_story_screenshot(html):
     """Generate screenshot from HTML"""
     call_type = 'LONG'
     print(f"📸 Generating {call_type} Calls screenshot...")
@@ -141,28 +133,7 @@ async def generate_trading_story_screenshot(html_file):
     image_output = OUTPUT_IMAGES_DIR / f"{call_type.lower()}_calls_story_output.jpg"
 
     # Generate screenshot (1080x1920 for Instagram Story)
-    from playwright.async_api import async_playwright
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # Set viewport to Instagram Story size
-        await page.set_viewport_size({"width": 1080, "height": 1920})
-        await page.emulate_media(media='screen')
-
-        # Load HTML
-        await page.goto('file://' + str(html_file.resolve()))
-
-        # Capture screenshot
-        await page.screenshot(
-            path=str(image_output),
-            type='jpeg',
-            quality=95,
-            full_page=True
-        )
-
-        await browser.close()
+    await render_html_to_image(html, str(image_output), profile=STORY_PROFILE)
 
     print(f"✅ {call_type} Calls Story screenshot generated: {image_output}")
     return image_output
@@ -195,11 +166,11 @@ async def main():
         print(f"Processing LONG CALLS Story")
         print(f"{'='*60}\n")
 
-        # Step 1: Generate HTML
-        html_file = generate_trading_story_html()
+        # Step 1: Render HTML
+        html = generate_trading_story_html()
 
         # Step 2: Generate Screenshot
-        image_file = await generate_trading_story_screenshot(html_file)
+        image_file = await generate_trading_story_screenshot(html)
 
         # Step 3: Post to Instagram
         media = post_trading_story_to_instagram(image_file)
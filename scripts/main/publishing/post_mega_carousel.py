@@ -35,6 +35,10 @@ load_dotenv()
 
 from scripts.main.publishing.session_manager import InstagramSessionManager
 from scripts.main.content.openrouter_client import OpenRouterClient
+from scripts.main.data.database import get_market_snapshot
+from scripts.main.data.market_snapshot import SNAPSHOT_ENV_VAR
+from scripts.main.data.query_cache import apply_cache_flags
+from scripts.main.media.browser_pool import browser_session
 
 # Import all generator functions
 sys.path.insert(0, str(Path(__file__).parent.parent / 'individual_posts'))
@@ -45,6 +49,7 @@ async def generate_all_slides():
     Returns list of image paths in correct order
     """
     import subprocess
+    import tempfile
 
     print("🎬 Generating All 14 Mega-Carousel Slides...")
     print("=" * 70)
@@ -52,6 +57,8 @@ async def generate_all_slides():
     output_images = Path(__file__).parent.parent.parent.parent / 'output_images'
     scripts_dir = Path(__file__).parent.parent / 'individual_posts'
 
+    snapshot_path = Path(tempfile.gettempdir()) / f"market_snapshot_{os.getpid()}.pkl"
+
     # Define generation sequence
     generators = [
         # (slide_number, script_name, output_file, description)
@@ -74,33 +81,41 @@ async def generate_all_slides():
     slides = []
 
     try:
-        for slide_num, script_cmd, output_file, description in generators:
-            print(f"\n[{slide_num}/14] Generating {description}...")
-
-            # Parse script command (handle scripts with arguments)
-            parts = script_cmd.split()
-            script_name = parts[0]
-            args = parts[1:] if len(parts) > 1 else []
-
-            script_path = scripts_dir / script_name
-
-            # Run generator script
-            cmd = ['python', str(script_path)] + args
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                print(f"❌ Error running {script_name}:")
-                print(result.stderr)
-                return None
-
-            # Add slide path
-            slide_path = output_images / output_file
-            if not slide_path.exists():
-                print(f"❌ ERROR: Output file not found: {slide_path}")
-                return None
-
-            slides.append(str(slide_path))
-            print(f"✅ {description} generated")
+        # Load market data once and share it with every generator subprocess
+        snapshot = get_market_snapshot().load_all()
+        snapshot.save(str(snapshot_path))
+        print(f"📦 Market snapshot loaded with {snapshot.query_count} queries")
+
+        # Launch Chromium once; generator subprocesses connect to it over CDP
+        async with browser_session(share=True):
+            generator_env = {**os.environ, SNAPSHOT_ENV_VAR: str(snapshot_path)}
+            for slide_num, script_cmd, output_file, description in generators:
+                print(f"\n[{slide_num}/14] Generating {description}...")
+
+                # Parse script command (handle scripts with arguments)
+                parts = script_cmd.split()
+                script_name = parts[0]
+                args = parts[1:] if len(parts) > 1 else []
+
+                script_path = scripts_dir / script_name
+
+                # Run generator script
+                cmd = ['python', str(script_path)] + args
+                result = subprocess.run(cmd, capture_output=True, text=True, env=generator_env)
+
+                if result.returncode != 0:
+                    print(f"❌ Error running {script_name}:")
+                    print(result.stderr)
+                    return None
+
+                # Add slide path
+                slide_path = output_images / output_file
+                if not slide_path.exists():
+                    print(f"❌ ERROR: Output file not found: {slide_path}")
+                    return None
+
+                slides.append(str(slide_path))
+                print(f"✅ {description} generated")
 
         print("\n" + "=" * 70)
         print(f"✅ All {len(slides)} slides generated successfully!")
@@ -114,6 +129,9 @@ async def generate_all_slides():
         traceback.print_exc()
         return None
 
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+
 def generate_ai_caption(slides_count=14):
     """
     Generate AI caption for mega-carousel using OpenRouter
@@ -254,5 +272,7 @@ async def main():
     return 0 if success else 1
 
 if __name__ == "__main__":
+    # --no-cache / --refresh bypass the on-disk query cache
+    apply_cache_flags()
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
@@ -27,7 +27,7 @@ from scripts.main.data.database import fetch_top_coins, fetch_btc_snapshot
 from scripts.main.publishing.session_manager import InstagramSessionManager
 
 try:
-    from playwright.async_api import async_playwright
+    from scripts.main.media.screenshot import STORY_PROFILE, get_render_profile, load_html, render_page, wait_until_ready
 except ImportError:
     print("Missing playwright. Install with: pip install playwright")
     sys.exit(1)
@@ -38,6 +38,8 @@ except ImportError:
     print("Missing jinja2. Install with: pip install jinja2")
     sys.exit(1)
 
+from scripts.main.content.template_engine import save_debug_html
+
 
 class StoryTeaserPoster:
     """Generate and post Instagram Story teaser"""
@@ -50,7 +52,6 @@ class StoryTeaserPoster:
         self.output_images_dir = self.project_root / 'output_images'
 
         # Create output directories
-        self.output_html_dir.mkdir(exist_ok=True)
         self.output_images_dir.mkdir(exist_ok=True)
 
     def fetch_market_data(self):
@@ -83,10 +84,7 @@ class StoryTeaserPoster:
                 print("❌ No Bitcoin data available")
                 return None
 
-            # Price comes as formatted string like "$123456.78", extract number
-            btc_price_str = btc_data.iloc[0]['price']
-            btc_price_clean = btc_price_str.replace('$', '').replace(',', '')
-            btc_price_float = float(btc_price_clean)
+            btc_price_float = float(btc_data.iloc[0]['price'])
 
             market_data = {
                 'top_gainer_symbol': top_gainer['symbol'],
@@ -150,7 +148,7 @@ class StoryTeaserPoster:
             hook_text: Psychological hook text
 
         Returns:
-            str: Path to generated HTML file
+            str: Rendered story HTML
         """
         print("🎨 Generating story HTML...")
 
@@ -169,12 +167,12 @@ class StoryTeaserPoster:
                 btc_price=market_data['btc_price']
             )
 
-            # Save HTML
+            # Keep the HTML on disk only when debugging
             output_path = self.output_html_dir / 'story_teaser_output.html'
-            output_path.write_text(html_content, encoding='utf-8')
+            save_debug_html(html_content, str(output_path), str(self.templates_dir))
 
-            print(f"✅ Story HTML generated: {output_path}")
-            return str(output_path)
+            print("✅ Story HTML rendered")
+            return html_content
 
         except Exception as e:
             print(f"❌ Error generating HTML: {e}")
@@ -182,12 +180,12 @@ class StoryTeaserPoster:
             traceback.print_exc()
             return None
 
-    async def screenshot_story(self, html_path):
+    async def screenshot_story(self, html):
         """
         Generate Instagram Story screenshot from HTML
 
         Args:
-            html_path: Path to HTML file
+            html: Rendered story HTML
 
         Returns:
             str: Path to generated image
@@ -197,29 +195,20 @@ class StoryTeaserPoster:
         output_path = self.output_images_dir / 'story_teaser_output.jpg'
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page(
-                    viewport={'width': 1080, 'height': 1920},
-                    device_scale_factor=1
-                )
+            profile = get_render_profile(STORY_PROFILE)
+            async with render_page(profile) as page:
+                # Load the rendered HTML
+                await load_html(page, html, self.templates_dir)
 
-                # Load HTML file
-                await page.goto(f'file:///{html_path}')
-
-                # Wait for fonts to load
-                await page.wait_for_timeout(1000)
+                # Wait for fonts, images and the template's data-ready flag
+                await wait_until_ready(page, profile.ready_timeout_ms)
 
                 # Take screenshot (Instagram Story dimensions: 1080x1920)
                 await page.screenshot(
                     path=str(output_path),
-                    type='jpeg',
-                    quality=95,
-                    full_page=False
+                    **profile.screenshot_options()
                 )
 
-                await browser.close()
-
             print(f"✅ Story screenshot generated: {output_path}")
             return str(output_path)
 
@@ -293,14 +282,14 @@ async def main():
     hook_text = poster.select_psychological_hook(market_data)
 
     # Step 3: Generate story HTML
-    html_path = poster.generate_story_html(market_data, hook_text)
+    html = poster.generate_story_html(market_data, hook_text)
 
-    if not html_path:
+    if not html:
         print("\n❌ Failed to generate HTML. Aborting.")
         return 1
 
     # Step 4: Screenshot story
-    image_path = await poster.screenshot_story(html_path)
+    image_path = await poster.screenshot_story(html)
 
     if not image_path:
         print("\n❌ Failed to generate screenshot. Aborting.")
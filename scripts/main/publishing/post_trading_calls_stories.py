@@ -16,6 +16,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from jinja2 import Environment, FileSystemLoader
 from data.database import fetch_trading_opportunities
+from content.formatting import number_series
+from content.logo_assets import localize_logos
+from content.template_engine import save_debug_html
+from media.browser_pool import browser_session
+from media.screenshot import STORY_PROFILE, render_html_to_image
 from publishing.session_manager import InstagramSessionManager
 
 # Load environment variables
@@ -35,26 +40,6 @@ OUTPUT_HTML_DIR = PROJECT_ROOT / "output_html"
 OUTPUT_IMAGES_DIR = PROJECT_ROOT / "output_images"
 SESSION_FILE = PROJECT_ROOT / "data" / "instagram_session.json"
 
-def format_large_number(value):
-    """Format large numbers"""
-    try:
-        num = float(value)
-        if num >= 1_000_000_000:
-            return f"{num / 1_000_000_000:.2f}"
-        elif num >= 1_000_000:
-            return f"{num / 1_000_000:.2f}"
-        return f"{num:.2f}"
-    except (ValueError, TypeError):
-        return str(value)
-
-def format_percentage(value):
-    """Format percentage values"""
-    try:
-        num = float(value)
-        return f"{num:.2f}"
-    except (ValueError, TypeError):
-        return str(value)
-
 def calculate_avg_dmv(positions):
     """Calculate average DMV score"""
     total = 0
@@ -82,15 +67,11 @@ def generate_trading_story_html(call_type):
     if positions_df.empty:
         raise Exception(f"No {call_type} positions found")
 
-    # Convert to list of dicts
+    # Format whole columns, then convert to list of dicts
+    for col in ('price', 'market_cap', 'percent_change24h'):
+        positions_df[col] = number_series(positions_df[col])
     positions = positions_df.to_dict('records')
 
-    # Format data
-    for pos in positions:
-        pos['price'] = format_large_number(pos['price'])
-        pos['market_cap'] = format_large_number(pos['market_cap'])
-        pos['percent_change24h'] = format_percentage(pos['percent_change24h'])
-
     # Calculate stats
     total_positions = len(positions)
     avg_dmv = calculate_avg_dmv(positions)
@@ -111,27 +92,16 @@ def generate_trading_story_html(call_type):
     # Render template
     env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
     template = env.get_template('trading_calls_story.html')
-    html_content = template.render(**context)
+    html_content = template.render(**localize_logos(context))
 
-    # Save HTML
-    OUTPUT_HTML_DIR.mkdir(parents=True, exist_ok=True)
+    # Keep the HTML on disk only when debugging
     html_output = OUTPUT_HTML_DIR / f"{call_type.lower()}_calls_story_output.html"
+    save_debug_html(html_content, str(html_output), str(TEMPLATES_DIR))
+    print(f"✅ {call_type} Calls Story HTML rendered")
 
-    with open(html_output, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-
-    print(f"✅ {call_type} Calls Story HTML generated: {html_output}")
-
-    # Copy CSS to output directory
-    import shutil
-    css_source = TEMPLATES_DIR / "style_trading_calls_story.css"
-    css_dest = OUTPUT_HTML_DIR / "style_trading_calls_story.css"
-    shutil.copy2(css_source, css_dest)
-    print(f"📁 Copied style_trading_calls_story.css to output_html directory")
+    return html_content
 
-    return html_output
-
-async def generate_trading_story_screenshot(html_file, call_type):
+async def generate_trading_story_screenshot(html, call_type):
     """Generate screenshot from HTML"""
     print(f"📸 Generating {call_type} Calls screenshot...")
 
@@ -139,28 +109,7 @@ async def generate_trading_story_screenshot(html_file, call_type):
     image_output = OUTPUT_IMAGES_DIR / f"{call_type.lower()}_calls_story_output.jpg"
 
     # Generate screenshot (1080x1920 for Instagram Story)
-    from playwright.async_api import async_playwright
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # Set viewport to Instagram Story size
-        await page.set_viewport_size({"width": 1080, "height": 1920})
-        await page.emulate_media(media='screen')
-
-        # Load HTML
-        await page.goto('file://' + str(html_file.resolve()))
-
-        # Capture screenshot
-        await page.screenshot(
-            path=str(image_output),
-            type='jpeg',
-            quality=95,
-            full_page=True
-        )
-
-        await browser.close()
+    await render_html_to_image(html, str(image_output), profile=STORY_PROFILE)
 
     print(f"✅ {call_type} Calls Story screenshot generated: {image_output}")
     return image_output
@@ -188,27 +137,28 @@ def post_trading_story_to_instagram(image_path, call_type):
 async def main():
     """Main execution flow"""
     try:
-        # Process both Long and Short calls
-        for call_type in ['LONG', 'SHORT']:
-            print(f"\n{'='*60}")
-            print(f"Processing {call_type} CALLS")
-            print(f"{'='*60}\n")
+        # Process both Long and Short calls, rendering both with one browser
+        async with browser_session():
+            for call_type in ['LONG', 'SHORT']:
+                print(f"\n{'='*60}")
+                print(f"Processing {call_type} CALLS")
+                print(f"{'='*60}\n")
 
-            # Step 1: Generate HTML
-            html_file = generate_trading_story_html(call_type)
+                # Step 1: Render HTML
+                html = generate_trading_story_html(call_type)
 
-            # Step 2: Generate Screenshot
-            image_file = await generate_trading_story_screenshot(html_file, call_type)
+                # Step 2: Generate Screenshot
+                image_file = await generate_trading_story_screenshot(html, call_type)
 
-            # Step 3: Post to Instagram
-            media = post_trading_story_to_instagram(image_file, call_type)
+                # Step 3: Post to Instagram
+                media = post_trading_story_to_instagram(image_file, call_type)
 
-            print(f"🎉 {call_type} Calls Story posted successfully!\n")
+                print(f"🎉 {call_type} Calls Story posted successfully!\n")
 
-            # Wait 5 seconds between stories
-            if call_type == 'LONG':
-                print("⏳ Waiting 5 seconds before posting SHORT story...")
-                await asyncio.sleep(5)
+                # Wait 5 seconds between stories
+                if call_type == 'LONG':
+                    print("⏳ Waiting 5 seconds before posting SHORT story...")
+                    await asyncio.sleep(5)
 
         print("✅ All Trading Calls Stories posted successfully!")
 
@@ -3,7 +3,6 @@
 import asyncio
 import os
 import sys
-import pandas as pd
 
 # Load environment variables from .env file
 try:
@@ -16,20 +15,25 @@ except ImportError:
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from data.database import (
-    fetch_top_coins, fetch_btc_snapshot, fetch_global_market_data,
-    fetch_trading_opportunities, close_connection, gcp_engine
+from data.database import close_connection
+from data.async_database import (
+    load_market_snapshot, fetch_top_coins, fetch_btc_snapshot, fetch_btc_snapshot_data,
+    fetch_global_market_data, fetch_trading_opportunities
 )
-from content.template_engine import get_template_renderer
+from data.query_cache import apply_cache_flags
+from content.template_engine import get_template_renderer, save_debug_html
+from content.formatting import register_filters
+from content.logo_assets import localize_logos
 from generate_macro_news import generate_macro_intelligence_with_json_conversion
-from media.screenshot import generate_image_from_html
+from media.render_queue import RenderQueue
+from media.screenshot import queue_screenshot
 
 async def render_page_1():
     """Render page 1: Top cryptocurrencies (ranks 2-24, excluding Bitcoin)."""
     print("🔄 Rendering Page 1: Top Cryptocurrencies")
 
     # Fetch data for coins 2-24
-    df = fetch_top_coins(2, 24)
+    df = await fetch_top_coins(2, 24)
 
     if df.empty:
         print("❌ No data available for Page 1")
@@ -45,11 +49,11 @@ async def render_page_1():
     image_path = os.path.join(image_dir, "1_output.jpg")
 
     # Render template
-    success = renderer.render_coins_page('1.html', df, output_path)
+    html = renderer.render_coins_page('1.html', df, output_path)
 
-    if success:
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+    if html:
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(html, image_path)
         print("✅ Page 1 completed successfully")
         return True
     else:
@@ -61,7 +65,7 @@ async def render_page_2():
     print("🔄 Rendering Page 2: Extended Cryptocurrencies")
 
     # Fetch data for coins 25-48
-    df = fetch_top_coins(25, 48)
+    df = await fetch_top_coins(25, 48)
 
     if df.empty:
         print("❌ No data available for Page 2")
@@ -77,11 +81,11 @@ async def render_page_2():
     image_path = os.path.join(image_dir, "2_output.jpg")
 
     # Render template
-    success = renderer.render_coins_page('2.html', df, output_path)
+    html = renderer.render_coins_page('2.html', df, output_path)
 
-    if success:
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+    if html:
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(html, image_path)
         print("✅ Page 2 completed successfully")
         return True
     else:
@@ -93,7 +97,7 @@ async def render_page_3():
     print("🔄 Rendering Page 3: Top Gainers and Losers")
 
     # Fetch top 100 coins with additional metrics
-    df = fetch_top_coins(1, 100)
+    df = await fetch_top_coins(1, 100)
 
     if df.empty:
         print("❌ No data available for Page 3")
@@ -111,22 +115,10 @@ async def render_page_3():
         return False
 
     # Get top 4 gainers and losers
-    top_losers = df_clean.nsmallest(4, 'percent_change24h')
-    top_gainers = df_clean.nlargest(4, 'percent_change24h')
-
-    # Fetch DMV scores for gainers & losers
-    slugs = set(list(top_losers['slug']) + list(top_gainers['slug']))
-    slugs_placeholder = ', '.join(f"'{slug}'" for slug in slugs)
-    scores_query = f"""
-        SELECT *
-        FROM "public"."FE_DMV_SCORES"
-        WHERE slug IN ({slugs_placeholder})
-    """
-    scores_df = pd.read_sql_query(scores_query, gcp_engine)
-    top_losers = pd.merge(top_losers, scores_df, on='slug', how='left')
-    top_gainers = pd.merge(top_gainers, scores_df, on='slug', how='left')
-
-    # Round DMV scores to 1 decimal
+    top_losers = df_clean.nsmallest(4, 'percent_change24h').reset_index(drop=True)
+    top_gainers = df_clean.nlargest(4, 'percent_change24h').reset_index(drop=True)
+
+    # DMV scores come joined by fetch_top_coins; round them to 1 decimal
     for col in ['Durability_Score', 'Momentum_Score', 'Valuation_Score']:
         top_losers[col] = top_losers[col].round(1)
         top_gainers[col] = top_gainers[col].round(1)
@@ -141,11 +133,11 @@ async def render_page_3():
     image_path = os.path.join(image_dir, "3_output.jpg")
 
     # Render template
-    success = renderer.render_gainers_losers_page('3.html', top_gainers, top_losers, output_path)
+    html = renderer.render_gainers_losers_page('3.html', top_gainers, top_losers, output_path)
 
-    if success:
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+    if html:
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(html, image_path)
         print("✅ Page 3 completed successfully")
         return True
     else:
@@ -157,8 +149,10 @@ async def render_page_4():
     print("🔄 Rendering Page 4: Trading Opportunities")
 
     # Fetch trading opportunities
-    long_opportunities = fetch_trading_opportunities("long", 15)
-    short_opportunities = fetch_trading_opportunities("short", 15)
+    long_opportunities, short_opportunities = await asyncio.gather(
+        fetch_trading_opportunities("long", 15),
+        fetch_trading_opportunities("short", 15)
+    )
 
     if long_opportunities.empty and short_opportunities.empty:
         print("❌ No trading opportunities data available")
@@ -178,11 +172,11 @@ async def render_page_4():
     image_path = os.path.join(image_dir, "4_output.jpg")
 
     # Render template
-    success = renderer.render_trading_opportunities_page('4.html', top_longs, top_shorts, output_path)
+    html = renderer.render_trading_opportunities_page('4.html', top_longs, top_shorts, output_path)
 
-    if success:
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+    if html:
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(html, image_path)
         print("✅ Page 4 completed successfully")
         return True
     else:
@@ -194,8 +188,10 @@ async def render_page_5():
     print("🔄 Rendering Page 5: Market Overview")
 
     # Fetch global market data and BTC snapshot
-    global_data = fetch_global_market_data()
-    btc_data = fetch_btc_snapshot()
+    global_data, btc_data = await asyncio.gather(
+        fetch_global_market_data(),
+        fetch_btc_snapshot()
+    )
 
     if global_data.empty and btc_data.empty:
         print("❌ No market data available for Page 5")
@@ -211,11 +207,11 @@ async def render_page_5():
     image_path = os.path.join(image_dir, "5_output.jpg")
 
     # Render template
-    success = renderer.render_market_overview_page('5.html', global_data, btc_data, output_path)
+    html = renderer.render_market_overview_page('5.html', global_data, btc_data, output_path)
 
-    if success:
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+    if html:
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(html, image_path)
         print("✅ Page 5 completed successfully")
         return True
     else:
@@ -232,32 +228,11 @@ async def render_page_6():
         alerts_result = generate_macro_intelligence_with_json_conversion()
 
         # Step 2: Get BTC snapshot data from database
-        btc_data_df = fetch_btc_snapshot()
-        if not btc_data_df.empty:
-            btc_snapshots = btc_data_df.to_dict('records')
-            # Add fear_greed_history from DataFrame column to the first record
-            if len(btc_snapshots) > 0:
-                if 'fear_greed_history_json' in btc_snapshots[0] and btc_snapshots[0]['fear_greed_history_json']:
-                    # Parse the JSON string back to list
-                    import ast
-                    try:
-                        btc_snapshots[0]['fear_greed_history'] = ast.literal_eval(btc_snapshots[0]['fear_greed_history_json'])
-                    except:
-                        # Fallback in case of parsing error
-                        btc_snapshots[0]['fear_greed_history'] = [
-                            {'day': i+1, 'value': 50, 'price': 0, 'label': 'Neutral'} for i in range(30)
-                        ]
-                else:
-                    # Fallback: create basic history if not available
-                    btc_snapshots[0]['fear_greed_history'] = [
-                        {'day': i+1, 'value': 50, 'price': 0, 'label': 'Neutral'} for i in range(30)
-                    ]
-                print(f"🔍 Debug: fear_greed_history has {len(btc_snapshots[0]['fear_greed_history'])} entries")
-            # Normalize numeric strings by stripping leading '$'
-            for snap in btc_snapshots:
-                for _k in ('price', 'market_cap', 'volume24h'):
-                    if _k in snap and snap[_k]:
-                        snap[_k] = snap[_k].lstrip('$')
+        btc_snapshot = await fetch_btc_snapshot_data()
+        if btc_snapshot is not None:
+            # Structured chart history; an empty history renders the chart without lines
+            btc_snapshots = [btc_snapshot.template_context()]
+            print(f"🔍 Debug: fear_greed_history has {len(btc_snapshot.history)} entries")
         else:
             print("❌ No BTC data available for Page 6")
             return False
@@ -281,36 +256,25 @@ async def render_page_6():
         # Step 4: Setup Jinja2 template
         from jinja2 import Environment, FileSystemLoader
         template_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'base_templates')
-        env = Environment(loader=FileSystemLoader(template_dir))
+        env = register_filters(Environment(loader=FileSystemLoader(template_dir)))
         template = env.get_template('6.html')
 
         # Step 5: Render HTML
-        rendered_html = template.render(**template_data)
+        rendered_html = template.render(**localize_logos(template_data))
 
-        # Step 6: Save to 6_output.html
+        # Step 6: Prepare output paths (6_output.html is only written with SOCIALS_KEEP_HTML)
         output_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_html')
         image_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'output_images')
         output_path = os.path.join(output_dir, "6_output.html")
         image_path = os.path.join(image_dir, "6_output.jpg")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
+        save_debug_html(rendered_html, output_path, template_dir)
 
-        print(f"✅ Successfully generated: {output_path}")
-        print(f"📄 HTML file size: {len(rendered_html)} characters")
+        print(f"✅ Successfully generated page 6 HTML")
+        print(f"📄 HTML size: {len(rendered_html)} characters")
 
-        # Step 7: Also copy the CSS file if it doesn't exist
-        import shutil
-        css_source = os.path.join(template_dir, 'style6.css')
-        css_dest = os.path.join(output_dir, 'style6.css')
-
-        if not os.path.exists(css_dest):
-            if os.path.exists(css_source):
-                shutil.copy2(css_source, css_dest)
-                print("📁 Copied style6.css to output_html directory")
-
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+        # Step 7: Queue the screenshot of the in-memory HTML
+        await queue_screenshot(rendered_html, image_path)
         print(f"✅ Template 6 screenshot generated: {image_path}")
         print("✅ Page 6 completed successfully")
         return True
@@ -360,23 +324,14 @@ async def render_page_7():
         output_path = os.path.join(output_dir, "7_output.html")
         image_path = os.path.join(image_dir, "7_output.jpg")
 
-        # Save HTML
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
-
-        print(f"✅ Successfully generated: {output_path}")
-        print(f"📄 HTML file size: {len(rendered_html)} characters")
+        # Keep the HTML only when debugging
+        save_debug_html(rendered_html, output_path, template_dir)
 
-        # Copy CSS file if needed
-        import shutil
-        css_source = os.path.join(template_dir, 'style7.css')
-        css_dest = os.path.join(output_dir, 'style7.css')
-        if not os.path.exists(css_dest) and os.path.exists(css_source):
-            shutil.copy2(css_source, css_dest)
-            print("📁 Copied style7.css to output_html directory")
+        print(f"✅ Successfully generated page 7 HTML")
+        print(f"📄 HTML size: {len(rendered_html)} characters")
 
-        # Generate screenshot
-        await generate_image_from_html(output_path, image_path)
+        # Queue the screenshot of the in-memory HTML
+        await queue_screenshot(rendered_html, image_path)
         print(f"✅ Template 7 screenshot generated: {image_path}")
         print(f"✅ Page 7 (L2 AI Market Intelligence) completed successfully")
         print(f"📊 Generated with {len(alerts_result['alerts'])} high-impact alerts")
@@ -395,19 +350,25 @@ async def run_complete_pipeline():
     results = []
 
     try:
-        results.append(await render_page_1())
-        results.append(await render_page_2())
-        results.append(await render_page_3())
-        results.append(await render_page_4())
-        results.append(await render_page_5())
-        results.append(await render_page_6())
-        results.append(await render_page_7())
+        # Load every market table concurrently before the pages derive from it
+        await load_market_snapshot()
+
+        # One Chromium for all seven screenshots; each page's screenshot renders
+        # in the background while the next page is built
+        async with RenderQueue() as renders:
+            results.append(await render_page_1())
+            results.append(await render_page_2())
+            results.append(await render_page_3())
+            results.append(await render_page_4())
+            results.append(await render_page_5())
+            results.append(await render_page_6())
+            results.append(await render_page_7())
 
         # Close database connection
         close_connection()
 
         # Summary
-        successful_pages = sum(results)
+        successful_pages = sum(results) - len(renders.failures)
         total_pages = len(results)
 
         print("\n" + "=" * 60)
@@ -428,4 +389,6 @@ async def run_complete_pipeline():
         return False
 
 if __name__ == "__main__":
+    # --no-cache / --refresh bypass the on-disk query cache
+    apply_cache_flags()
     asyncio.run(run_complete_pipeline())
\ No newline at end of file
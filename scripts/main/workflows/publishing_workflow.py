@@ -78,14 +78,15 @@ class PublishingWorkflow:
         print("🔄 Loading spreadsheet data...")
 
         try:
+            # Only the sheets the workflow uses are read, in one batched request
+            required_sheets = ['Top50Coins', 'BTC_SNAPSHOT', 'MarketOverview',
+                             'ShortOpportunities', 'LongOpportunities']
+
             self.sheets_data = self.google_services.load_spreadsheet_data(
-                self.crypto_spreadsheet_key
+                self.crypto_spreadsheet_key, required_sheets
             )
 
             # Validate required sheets
-            required_sheets = ['Top50Coins', 'BTC_SNAPSHOT', 'MarketOverview',
-                             'ShortOpportunities', 'LongOpportunities']
-
             missing_sheets = self.google_services.validate_required_sheets(
                 self.sheets_data, required_sheets
             )
@@ -21,6 +21,17 @@ class DatabaseConfig:
     ssl_mode: str = field(default_factory=lambda: os.getenv('DB_SSL_MODE', 'prefer'))
     connection_timeout: int = field(default_factory=lambda: int(os.getenv('DB_CONNECTION_TIMEOUT', '30')))
     pool_size: int = field(default_factory=lambda: int(os.getenv('DB_POOL_SIZE', '5')))
+    max_overflow: int = field(default_factory=lambda: int(os.getenv('DB_MAX_OVERFLOW', '5')))
+    pool_recycle: int = field(default_factory=lambda: int(os.getenv('DB_POOL_RECYCLE', '1800')))  # seconds
+    pool_pre_ping: bool = field(default_factory=lambda: bool(int(os.getenv('DB_POOL_PRE_PING', '1'))))
+    statement_timeout: int = field(default_factory=lambda: int(os.getenv('DB_STATEMENT_TIMEOUT', '60000')))  # ms
+    # Local SQLite dump used instead of the remote host (offline development, load tests)
+    fixture_path: str = field(default_factory=lambda: os.getenv('DB_FIXTURE_PATH', ''))
+
+    @property
+    def uses_fixture(self) -> bool:
+        """Whether connections go to the local fixture database."""
+        return bool(self.fixture_path)
 
     def get_connection_url(self, driver: str = 'psycopg2') -> str:
         """Generate SQLAlchemy connection URL with driver."""
@@ -28,11 +39,17 @@ class DatabaseConfig:
 
     def validate(self) -> None:
         """Validate database configuration."""
+        if self.uses_fixture:
+            if not Path(self.fixture_path).is_file():
+                raise ValueError(f"Database fixture not found: {self.fixture_path}")
+            return
         required = [self.host, self.database, self.user, self.password]
         if not all(required):
             raise ValueError("Database configuration incomplete. Missing required environment variables.")
         if self.port < 1 or self.port > 65535:
             raise ValueError(f"Invalid database port: {self.port}")
+        if self.pool_size < 1 or self.max_overflow < 0:
+            raise ValueError(f"Invalid pool settings: pool_size={self.pool_size}, max_overflow={self.max_overflow}")
 
 
 @dataclass
@@ -0,0 +1,194 @@
+"""Tests for the named analytics queries over the market snapshot."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import analytics, database
+from scripts.main.data.analytics import DUCKDB_AVAILABLE, MarketAnalytics
+from scripts.main.data.logo_index import LogoIndex
+from scripts.main.data.market_snapshot import MarketSnapshot
+
+SLUGS = ['bitcoin', 'ethereum', 'tether', 'solana', 'dogecoin', 'pepe']
+
+
+@pytest.fixture
+def snapshot():
+    """Provide a preloaded snapshot with a stablecoin and a missing 24h change."""
+    return MarketSnapshot(frames={
+        'listings': pd.DataFrame({
+            'slug': SLUGS,
+            'cmc_rank': [1, 2, 3, 4, 5, 150],
+            'last_updated': ['2025-01-01'] * 6,
+            'symbol': ['BTC', 'ETH', 'USDT', 'SOL', 'DOGE', 'PEPE'],
+            'price': [50000.0, 3000.0, 1.0, 150.0, 0.1, 0.00001],
+            'percent_change24h': [1.0, -3.0, 0.01, 6.0, None, 9.0],
+            'market_cap': [1.0e12, 3.5e11, 1.0e11, 6.5e10, 1.0e10, 1.0e9],
+            'percent_change7d': [1.0, 2.0, 0.0, 3.0, 4.0, 5.0],
+            'percent_change30d': [1.0, 2.0, 0.0, 3.0, 4.0, 5.0],
+            'percent_change90d': [10.0, 12.0, 0.0, 30.0, 5.0, 50.0],
+        }),
+        'dmv_scores': pd.DataFrame({
+            'slug': SLUGS,
+            'Durability_Score': [80.0, 70.0, 0.0, 60.0, 10.0, 5.0],
+            'Momentum_Score': [50.0, 40.0, 0.0, 30.0, 5.0, 5.0],
+            'Valuation_Score': [20.0, 10.0, 0.0, 0.0, -5.0, 5.0],
+        }),
+        'dmv_all': pd.DataFrame({
+            'id': [1, 2, 3, 4, 5, 6],
+            'slug': SLUGS,
+            'name': ['Bitcoin', 'Ethereum', 'Tether', 'Solana', 'Dogecoin', 'Pepe'],
+            'bullish': [10, 20, 0, 15, 30, 40],
+            'bearish': [5, 2, 0, 8, 1, 0],
+            'neutral': [20, 20, 50, 20, 20, 20],
+        }),
+        'ratios': pd.DataFrame({
+            'slug': SLUGS,
+            'm_rat_alpha': [0.1, 0.2, 0.0, 0.3, 0.4, 0.5],
+            'd_rat_beta': [1.5, None, 0.1, 0.5, 2.0, 3.0],
+            'm_rat_omega': [1.5, 1.2, 0.1, 1.8, 0.5, 1.5],
+        }),
+    })
+
+
+@pytest.fixture
+def logos():
+    """Provide a preloaded logo index; pepe has no logo."""
+    return LogoIndex(logos=dict(zip(SLUGS[:5], ['btc.png', 'eth.png', 'usdt.png', 'sol.png', 'doge.png'])))
+
+
+class TestPandasBackend:
+    """Test the named queries on the pandas backend."""
+
+    def test_top_gainers_skip_missing_changes(self, snapshot, logos):
+        """Test ordering, rank bound and that NULL changes never rank first."""
+        df = MarketAnalytics(snapshot, logos, backend='pandas').top_movers(n=3, rank_max=100)
+
+        assert df['slug'].tolist() == ['solana', 'bitcoin', 'tether']
+        assert df['logo'].iloc[0] == 'sol.png'
+        assert df['Durability_Score'].iloc[0] == 60.0
+
+    def test_top_losers_with_threshold(self, snapshot, logos):
+        """Test that min_pct keeps only moves beyond -min_pct for losers."""
+        df = MarketAnalytics(snapshot, logos, backend='pandas').top_movers(n=15, min_pct=2.0, direction='losers')
+
+        assert df['slug'].tolist() == ['ethereum']
+
+    def test_gainers_without_logo_are_kept(self, snapshot, logos):
+        """Test that a coin without a logo is not dropped."""
+        df = MarketAnalytics(snapshot, logos, backend='pandas').top_movers(n=1, rank_max=300)
+
+        assert df['slug'].tolist() == ['pepe']
+        assert pd.isna(df['logo'].iloc[0])
+
+    def test_long_and_short_candidates(self, snapshot, logos):
+        """Test the beta/omega filters and the signal-count ordering."""
+        market = MarketAnalytics(snapshot, logos, backend='pandas')
+
+        assert market.long_candidates()['slug'].tolist() == ['ethereum', 'bitcoin']
+        assert market.short_candidates()['slug'].tolist() == ['bitcoin', 'ethereum', 'dogecoin']
+
+    def test_alt_season_compares_90d_changes(self, snapshot, logos):
+        """Test that stablecoins are excluded and BTC's 90d change is the benchmark."""
+        result = MarketAnalytics(snapshot, logos, backend='pandas').alt_season_ratio(rank_max=100, threshold=0.5)
+
+        # ethereum and solana beat 10%; dogecoin does not; tether and pepe are excluded
+        assert result['outperformers'] == 2 and result['total'] == 3
+        assert result['ratio'] == 0.6667
+        assert result['is_alt_season']
+
+    def test_unknown_backend_rejected(self, snapshot, logos):
+        """Test that a misconfigured backend fails fast."""
+        with pytest.raises(ValueError, match="Unknown analytics backend"):
+            MarketAnalytics(snapshot, logos, backend='spark')
+
+    def test_default_backend_falls_back_to_pandas(self):
+        """Test that requesting duckdb without it installed uses pandas."""
+        with patch.object(analytics, 'DUCKDB_AVAILABLE', False), \
+             patch.dict('os.environ', {analytics.ANALYTICS_BACKEND_ENV_VAR: 'duckdb'}):
+            assert analytics.default_backend() == 'pandas'
+
+    def test_default_backend_is_duckdb(self):
+        """Test that duckdb runs the queries unless pandas is requested."""
+        with patch.object(analytics, 'DUCKDB_AVAILABLE', True), patch.dict('os.environ', {}, clear=True):
+            assert analytics.default_backend() == 'duckdb'
+        with patch.object(analytics, 'DUCKDB_AVAILABLE', True), \
+             patch.dict('os.environ', {analytics.ANALYTICS_BACKEND_ENV_VAR: 'pandas'}):
+            assert analytics.default_backend() == 'pandas'
+
+
+class TestSharedAnalytics:
+    """Test the database-level accessors built on the analytics queries."""
+
+    def test_fetch_top_movers_formats_like_top_coins(self, snapshot, logos):
+        """Test billions conversion and rounding of the slide columns."""
+        with patch.object(database, '_market_snapshot', snapshot), patch.object(database, '_logo_index', logos):
+            df = database.fetch_top_movers("gainers", n=2, min_pct=2.0)
+
+        assert df['slug'].tolist() == ['solana']
+        assert df['market_cap'].iloc[0] == 65.0
+
+    def test_fetch_top_movers_error_returns_empty_frame(self, snapshot, logos):
+        """Test that a failed query returns an empty DataFrame like the other fetchers."""
+        with patch.object(database, '_market_snapshot', snapshot), patch.object(database, '_logo_index', logos), \
+             patch.object(MarketAnalytics, 'top_movers', side_effect=RuntimeError("boom")):
+            df = database.fetch_top_movers("gainers")
+
+        assert isinstance(df, pd.DataFrame) and df.empty
+
+    def test_analytics_follow_the_snapshot(self, snapshot, logos):
+        """Test that a new snapshot gets a new analytics instance."""
+        with patch.object(database, '_market_snapshot', snapshot), patch.object(database, '_logo_index', logos):
+            first = database.get_market_analytics()
+            assert database.get_market_analytics() is first
+        with patch.object(database, '_market_snapshot', MarketSnapshot(frames={})), \
+             patch.object(database, '_logo_index', logos):
+            assert database.get_market_analytics() is not first
+
+
+@pytest.mark.skipif(not DUCKDB_AVAILABLE, reason="duckdb is not installed")
+class TestDuckDBParity:
+    """Test that the DuckDB backend returns the same rows as pandas."""
+
+    @pytest.mark.parametrize('query, kwargs', [
+        ('top_movers', {'n': 4, 'rank_max': 300}),
+        ('top_movers', {'n': 4, 'min_pct': 2.0, 'direction': 'losers'}),
+        ('long_candidates', {}),
+        ('short_candidates', {}),
+    ])
+    def test_same_rows(self, snapshot, logos, query, kwargs):
+        """Test that both backends return the same frame per named query."""
+        expected = getattr(MarketAnalytics(snapshot, logos, backend='pandas'), query)(**kwargs)
+        market = MarketAnalytics(snapshot, logos, backend='duckdb')
+        try:
+            actual = getattr(market, query)(**kwargs)
+        finally:
+            market.close()
+
+        columns = [column for column in expected.columns if column in actual.columns]
+        assert actual['slug'].tolist() == expected['slug'].tolist()
+        pd.testing.assert_frame_equal(actual[columns], expected[columns])
+
+    def test_same_alt_season(self, snapshot, logos):
+        """Test alt-season parity."""
+        expected = MarketAnalytics(snapshot, logos, backend='pandas').alt_season_ratio()
+        assert MarketAnalytics(snapshot, logos, backend='duckdb').alt_season_ratio() == expected
+
+    def test_concurrent_queries(self, snapshot, logos):
+        """Test that one instance serves queries from several threads at once."""
+        market = MarketAnalytics(snapshot, logos, backend='duckdb')
+        expected = MarketAnalytics(snapshot, logos, backend='pandas')
+        queries = ['long_candidates', 'short_candidates', 'top_movers', 'alt_season_ratio'] * 8
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(lambda query: getattr(market, query)(), queries))
+        finally:
+            market.close()
+
+        for query, result in zip(queries, results):
+            reference = getattr(expected, query)()
+            if query == 'alt_season_ratio':
+                assert result == reference
+            else:
+                assert result['slug'].tolist() == reference['slug'].tolist()
@@ -0,0 +1,87 @@
+"""Tests for the async data-access API."""
+import asyncio
+import threading
+import time
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import async_database, database
+from scripts.main.data.market_snapshot import MarketSnapshot, SNAPSHOT_QUERIES
+
+
+@pytest.fixture
+def empty_snapshot():
+    """Install an engine-backed snapshot with nothing loaded yet."""
+    snapshot = MarketSnapshot(engine=object())
+    with patch.object(database, '_market_snapshot', snapshot):
+        yield snapshot
+
+
+class TestLoadMarketSnapshot:
+    """Test concurrent snapshot preloading."""
+
+    @pytest.mark.asyncio
+    async def test_tables_load_concurrently(self, empty_snapshot):
+        """Test that total wait is close to one query, not the sum of all."""
+        def slow_query(*args, **kwargs):
+            time.sleep(0.2)
+            return pd.DataFrame({'slug': ['bitcoin']})
+
+        with patch('pandas.read_sql_query', side_effect=slow_query):
+            start = time.perf_counter()
+            await async_database.load_market_snapshot()
+            elapsed = time.perf_counter() - start
+
+        assert all(empty_snapshot.is_loaded(name) for name in SNAPSHOT_QUERIES)
+        assert empty_snapshot.query_count == len(SNAPSHOT_QUERIES)
+        assert elapsed < 0.2 * len(SNAPSHOT_QUERIES) / 2
+
+    @pytest.mark.asyncio
+    async def test_failed_table_does_not_abort(self, empty_snapshot):
+        """Test that one failing table leaves the others loaded."""
+        def flaky_query(statement, *args, **kwargs):
+            if 'FE_RATIOS' in str(statement):
+                raise RuntimeError("timeout")
+            return pd.DataFrame({'slug': ['bitcoin']})
+
+        with patch('pandas.read_sql_query', side_effect=flaky_query):
+            await async_database.load_market_snapshot()
+
+        assert not empty_snapshot.is_loaded('ratios')
+        assert empty_snapshot.is_loaded('dmv_scores')
+
+    def test_same_table_loads_once_across_threads(self, empty_snapshot):
+        """Test that concurrent readers of one table share a single query."""
+        def slow_query(*args, **kwargs):
+            time.sleep(0.05)
+            return pd.DataFrame({'slug': ['bitcoin']})
+
+        with patch('pandas.read_sql_query', side_effect=slow_query) as mock_read:
+            threads = [threading.Thread(target=empty_snapshot.table, args=('dmv_scores',)) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_read.call_count == 1
+
+
+class TestAsyncFetchers:
+    """Test that async fetchers return the synchronous results."""
+
+    @pytest.mark.asyncio
+    async def test_fetchers_delegate(self):
+        """Test that each coroutine returns what its database.py counterpart returns."""
+        frame = pd.DataFrame({'slug': ['bitcoin']})
+
+        with patch.object(database, 'fetch_top_coins', return_value=frame) as mock_top, \
+             patch.object(database, 'fetch_trading_opportunities', return_value=frame) as mock_opps:
+            top, opps = await asyncio.gather(
+                async_database.fetch_top_coins(2, 24),
+                async_database.fetch_trading_opportunities("short", 5)
+            )
+
+        mock_top.assert_called_once_with(2, 24)
+        mock_opps.assert_called_once_with("short", 5)
+        assert top is frame and opps is frame
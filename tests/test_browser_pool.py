@@ -0,0 +1,403 @@
+"""Tests for the shared Chromium browser pool and in-memory screenshot rendering."""
+import asyncio
+import os
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from scripts.main.content.template_engine import KEEP_HTML_ENV_VAR, save_debug_html
+from scripts.main.media import browser_pool, screenshot
+from scripts.main.media.browser_pool import BROWSER_ENDPOINT_ENV_VAR, BrowserPool, browser_session
+from scripts.main.media.render_profiles import CAROUSEL_PROFILE, STORY_PROFILE, get_render_profile
+from scripts.main.media.render_queue import RenderQueue, current_render_queue
+from src.config import ImageConfig
+from src.retry_utils import RetryConfig, RetryManager, RetryStrategy
+
+
+class FakePlaywright:
+    """Playwright double whose Chromium hands out mock browsers."""
+
+    def __init__(self):
+        self.chromium = MagicMock()
+        self.chromium.launch = AsyncMock(side_effect=lambda **kwargs: self._browser())
+        self.chromium.connect_over_cdp = AsyncMock(side_effect=lambda endpoint: self._browser())
+        self.stop = AsyncMock()
+        self.contexts = []
+
+    def _browser(self):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.close = AsyncMock()
+
+        async def new_context(**kwargs):
+            context = MagicMock()
+            context.options = kwargs
+            context.new_page = AsyncMock(return_value=AsyncMock())
+            context.close = AsyncMock()
+            self.contexts.append(context)
+            return context
+
+        browser.new_context = new_context
+        return browser
+
+    async def start(self):
+        return self
+
+
+@pytest.fixture
+def playwright():
+    """Provide a fake Playwright and make it the pool's default."""
+    fake = FakePlaywright()
+    with patch.object(browser_pool, 'async_playwright', lambda: fake):
+        yield fake
+
+
+class TestBrowserPool:
+    """Test launch reuse, per-render contexts and shutdown."""
+
+    async def test_one_launch_for_many_pages(self, playwright):
+        """Test that every render gets its own context from a single browser."""
+        pool = BrowserPool(endpoint='')
+
+        for _ in range(3):
+            async with pool.page(viewport={'width': 100, 'height': 100}) as page:
+                assert page is not None
+
+        assert playwright.chromium.launch.await_count == 1
+        assert len(playwright.contexts) == 3
+        assert all(context.close.await_count == 1 for context in playwright.contexts)
+        assert pool.stats() == {'launches': 1, 'connects': 0, 'renders': 3}
+
+        await pool.close()
+        playwright.stop.assert_awaited_once()
+
+    async def test_context_closed_when_render_fails(self, playwright):
+        """Test that a failing render still releases its context."""
+        pool = BrowserPool(endpoint='')
+
+        with pytest.raises(RuntimeError):
+            async with pool.page():
+                raise RuntimeError("render failed")
+
+        assert playwright.contexts[0].close.await_count == 1
+
+    async def test_connects_to_shared_endpoint(self, playwright):
+        """Test that a child process connects over CDP instead of launching."""
+        pool = BrowserPool(endpoint='http://127.0.0.1:9222')
+
+        await pool.start()
+
+        playwright.chromium.connect_over_cdp.assert_awaited_once_with('http://127.0.0.1:9222')
+        assert playwright.chromium.launch.await_count == 0
+
+    async def test_falls_back_to_launch_when_endpoint_is_gone(self, playwright):
+        """Test that a stale endpoint does not fail the render."""
+        playwright.chromium.connect_over_cdp.side_effect = ConnectionError("refused")
+
+        await BrowserPool(endpoint='http://127.0.0.1:9222').start()
+
+        assert playwright.chromium.launch.await_count == 1
+
+
+class TestBrowserSession:
+    """Test the session used around batches of screenshots."""
+
+    async def test_screenshots_share_the_session_browser(self, playwright, tmp_path):
+        """Test that screenshots reuse the open session."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            async with browser_session() as pool:
+                for index in range(4):
+                    await screenshot.render_html_to_image('<html></html>', str(tmp_path / f'{index}.jpg'))
+
+        assert playwright.chromium.launch.await_count == 1
+        assert pool.stats()['renders'] == 4
+        assert browser_pool.current_browser_pool() is None
+
+    async def test_shared_session_exports_endpoint(self, playwright):
+        """Test that share=True advertises the CDP endpoint only while open."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            async with browser_session(share=True) as pool:
+                endpoint = os.environ[BROWSER_ENDPOINT_ENV_VAR]
+                launch_args = playwright.chromium.launch.await_args.kwargs['args']
+            assert BROWSER_ENDPOINT_ENV_VAR not in os.environ
+
+        assert endpoint.startswith('http://127.0.0.1:')
+        assert launch_args == [f"--remote-debugging-port={endpoint.rsplit(':', 1)[1]}"]
+
+    async def test_screenshot_outside_session_uses_one_off_browser(self, playwright, tmp_path):
+        """Test that a lone screenshot still launches and closes its own browser."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            await screenshot.render_html_to_image('<html></html>', str(tmp_path / 'a.jpg'))
+
+        assert playwright.chromium.launch.await_count == 1
+        playwright.stop.assert_awaited_once()
+
+
+def no_delay_retries(attempts):
+    """Retry manager retrying timeouts and runtime errors without sleeping."""
+    return RetryManager(RetryConfig(
+        max_attempts=attempts, base_delay=0, strategy=RetryStrategy.FIXED,
+        retryable_exceptions=[asyncio.TimeoutError, RuntimeError]
+    ), "test")
+
+
+class TestRenderQueue:
+    """Test bounded concurrency, backpressure, timeouts and retries."""
+
+    async def test_concurrency_is_bounded_by_workers(self, playwright):
+        """Test that no more than `workers` jobs render at once."""
+        active = []
+        peak = []
+
+        async def job(name):
+            active.append(name)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(name)
+
+        async with RenderQueue(workers=2, timeout=5) as renders:
+            results = await renders.render_all([(job, index) for index in range(6)])
+
+        assert results == [True] * 6
+        assert max(peak) == 2
+        assert renders.completed == 6
+
+    async def test_submit_waits_while_queue_is_full(self, playwright):
+        """Test that producers block once the workers and the queue are saturated."""
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        async with RenderQueue(workers=1, timeout=5) as renders:
+            await renders.submit(job)
+            await asyncio.sleep(0)  # the worker takes the first job
+            await renders.submit(job)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(renders.submit(job), 0.05)
+            release.set()
+
+        assert renders.completed == 2
+
+    async def test_hung_render_times_out_and_is_retried(self, playwright):
+        """Test that an attempt exceeding the timeout is retried."""
+        attempts = []
+
+        async def job():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(10)
+
+        async with RenderQueue(workers=1, timeout=0.05, retry_manager=no_delay_retries(2)) as renders:
+            results = await renders.render_all([(job,)])
+
+        assert results == [True]
+        assert len(attempts) == 2
+
+    async def test_failed_job_does_not_stop_the_batch(self, playwright):
+        """Test that exhausted retries are reported while other jobs finish."""
+        async def job(name):
+            if name == 'bad.html':
+                raise RuntimeError("page crashed")
+
+        async with RenderQueue(workers=2, timeout=5, retry_manager=no_delay_retries(2)) as renders:
+            results = await renders.render_all([(job, 'good.html'), (job, 'bad.html'), (job, 'other.html')])
+
+        assert results == [True, False, True]
+        assert [label for label, _ in renders.failures] == ['bad.html']
+        assert current_render_queue() is None
+
+    async def test_multiple_screenshots_share_one_browser(self, playwright, tmp_path):
+        """Test that a batch of screenshots launches a single browser."""
+        html_files = []
+        for index in range(5):
+            html_file = tmp_path / f'{index}_output.html'
+            html_file.write_text('<html></html>')
+            html_files.append(str(html_file))
+
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            results = await screenshot.generate_multiple_screenshots(html_files, str(tmp_path / 'images'), workers=2)
+
+        assert results == [True] * 5
+        assert playwright.chromium.launch.await_count == 1
+        assert len(playwright.contexts) == 5
+
+    async def test_queue_screenshot_defers_inside_queue(self, playwright, tmp_path):
+        """Test that queued screenshots finish by the time the queue closes."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            async with RenderQueue(workers=2, timeout=5) as renders:
+                for index in range(3):
+                    await screenshot.queue_screenshot('<html></html>', str(tmp_path / f'{index}.jpg'))
+
+        assert renders.completed == 3
+        assert playwright.chromium.launch.await_count == 1
+
+
+def fake_route(url):
+    """Route double for a request to url."""
+    route = MagicMock()
+    route.request.url = url
+    route.fulfill = AsyncMock()
+    return route
+
+
+class TestInMemoryRender:
+    """Test set_content rendering and the asset route handler."""
+
+    async def test_html_goes_straight_to_the_page(self, playwright):
+        """Test that the HTML is set on a page based in the template directory."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            async with browser_session():
+                async with screenshot.render_page() as page:
+                    await screenshot.load_html(page, '<img src="file:///tmp/logo.webp">')
+
+        base_url = page.goto.await_args.args[0]
+        assert base_url == screenshot.asset_url(screenshot.TEMPLATE_DIR / screenshot.BASE_DOCUMENT_NAME)
+        assert page.set_content.await_args.args[0] == f'<img src="{screenshot.RENDER_ORIGIN}/tmp/logo.webp">'
+        page.route.assert_awaited_once_with(f"{screenshot.RENDER_ORIGIN}/**", screenshot._serve_asset)
+
+    async def test_assets_served_from_disk_once(self, tmp_path):
+        """Test that stylesheets are read on first request and then served from memory."""
+        css = tmp_path / 'style1.css'
+        css.write_text('body { color: red; }')
+
+        first, second = fake_route(screenshot.asset_url(css)), fake_route(screenshot.asset_url(css))
+        await screenshot._serve_asset(first)
+        with patch('builtins.open', side_effect=AssertionError("read twice")):
+            await screenshot._serve_asset(second)
+
+        assert first.fulfill.await_args.kwargs == {'status': 200, 'body': b'body { color: red; }', 'content_type': 'text/css'}
+        assert second.fulfill.await_args.kwargs == first.fulfill.await_args.kwargs
+
+    async def test_missing_asset_and_base_document(self, tmp_path):
+        """Test the 404 for unknown files and the empty base document."""
+        missing = fake_route(screenshot.asset_url(tmp_path / 'missing.css'))
+        base = fake_route(screenshot.asset_url(tmp_path / screenshot.BASE_DOCUMENT_NAME))
+
+        await screenshot._serve_asset(missing)
+        await screenshot._serve_asset(base)
+
+        assert missing.fulfill.await_args.kwargs['status'] == 404
+        assert base.fulfill.await_args.kwargs['content_type'] == 'text/html'
+
+    def test_debug_html_only_when_enabled(self, tmp_path):
+        """Test that rendered HTML reaches disk only with SOCIALS_KEEP_HTML set."""
+        output = tmp_path / 'page.html'
+        html = '<html><head></head><body></body></html>'
+
+        with patch.dict(os.environ, {KEEP_HTML_ENV_VAR: '0'}):
+            assert save_debug_html(html, str(output)) is False
+        assert not output.exists()
+
+        with patch.dict(os.environ, {KEEP_HTML_ENV_VAR: '1'}):
+            assert save_debug_html(html, str(output), str(tmp_path)) is True
+        assert f'<base href="{tmp_path.as_uri()}/">' in output.read_text()
+
+
+class TestRenderProfiles:
+    """Test that slides rasterize straight at the configured output size."""
+
+    def test_carousel_renders_at_output_size(self):
+        """Test the 2160x2700 layout painted at half scale into 1080x1350."""
+        profile = get_render_profile(CAROUSEL_PROFILE, ImageConfig(width=1080, quality=90, format='jpg', viewport_scale=1.0))
+
+        assert profile.viewport == {'width': 2160, 'height': 2700}
+        assert profile.device_scale_factor == 0.5
+        assert (profile.output_width, profile.output_height) == (1080, 1350)
+        assert profile.screenshot_options() == {
+            'type': 'jpeg', 'quality': 90, 'clip': {'x': 0, 'y': 0, 'width': 2160, 'height': 2700}
+        }
+
+    def test_story_and_viewport_scale(self):
+        """Test the story profile and VIEWPORT_SCALE multiplying the output size."""
+        story = get_render_profile(STORY_PROFILE, ImageConfig(width=1080, format='jpg', viewport_scale=1.0))
+        legacy = get_render_profile(CAROUSEL_PROFILE, ImageConfig(width=1080, format='jpg', viewport_scale=2.0))
+
+        assert (story.device_scale_factor, story.output_height) == (1.0, 1920)
+        assert (legacy.output_width, legacy.output_height) == (2160, 2700)
+
+    def test_png_and_unknown_profile(self):
+        """Test that PNG output drops the JPEG quality and unknown names are rejected."""
+        png = get_render_profile(CAROUSEL_PROFILE, ImageConfig(format='png'))
+
+        assert png.screenshot_options()['type'] == 'png'
+        assert 'quality' not in png.screenshot_options()
+        with pytest.raises(ValueError):
+            get_render_profile('banner')
+
+    async def test_screenshot_uses_profile(self, playwright, tmp_path):
+        """Test that the context and screenshot follow the render profile."""
+        profile = get_render_profile(STORY_PROFILE)
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            await screenshot.render_html_to_image('<html></html>', str(tmp_path / 'story.jpg'), profile=STORY_PROFILE)
+
+        context = playwright.contexts[0]
+        assert context.options == {'viewport': profile.viewport, 'device_scale_factor': profile.device_scale_factor}
+        page = context.new_page.return_value
+        page.screenshot.assert_awaited_once_with(path=str(tmp_path / 'story.jpg'), **profile.screenshot_options())
+
+
+class TestReadiness:
+    """Test the wait for fonts, image decodes and data-ready flags."""
+
+    async def test_phases_run_in_order_and_are_timed(self):
+        """Test that every phase is awaited in the page and timed."""
+        page = AsyncMock()
+
+        timings = await screenshot.wait_until_ready(page, timeout_ms=1000)
+
+        assert list(timings) == ['fonts', 'images', 'ready_flag']
+        assert [call.args[0] for call in page.evaluate.await_args_list] == [
+            screenshot.FONTS_READY_JS, screenshot.IMAGES_DECODED_JS
+        ]
+        page.wait_for_function.assert_awaited_once()
+        assert page.wait_for_function.await_args.args == (screenshot.READY_FLAG_JS,)
+        assert 0 < page.wait_for_function.await_args.kwargs['timeout'] <= 1000
+
+    async def test_pending_phase_times_out(self):
+        """Test that a page that never becomes ready fails instead of being captured."""
+        page = AsyncMock()
+
+        async def never_ready(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        page.evaluate.side_effect = never_ready
+
+        with pytest.raises(asyncio.TimeoutError):
+            await screenshot.wait_until_ready(page, timeout_ms=50)
+
+    async def test_phases_share_one_deadline(self):
+        """Test that slow phases together cannot wait longer than the timeout."""
+        page = AsyncMock()
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(0.12)
+
+        page.evaluate.side_effect = slow
+        page.wait_for_function.side_effect = slow
+        start = time.perf_counter()
+
+        # Each phase fits in 200 ms on its own, all three do not
+        with pytest.raises(asyncio.TimeoutError):
+            await screenshot.wait_until_ready(page, timeout_ms=200)
+
+        assert time.perf_counter() - start < 0.3
+
+    async def test_screenshot_waits_before_capture(self, playwright, tmp_path):
+        """Test that the screenshot is taken only after the readiness checks."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(BROWSER_ENDPOINT_ENV_VAR, None)
+            timings = await screenshot.render_html_to_image('<html></html>', str(tmp_path / 'a.jpg'))
+
+        page = playwright.contexts[0].new_page.return_value
+        calls = [name for name, *_ in page.mock_calls if name in ('evaluate', 'wait_for_function', 'screenshot')]
+        assert calls == ['evaluate', 'evaluate', 'wait_for_function', 'screenshot']
+        assert set(timings) == {'fonts', 'images', 'ready_flag'}
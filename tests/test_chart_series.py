@@ -0,0 +1,63 @@
+"""Tests for the date-aligned Fear & Greed / BTC price chart series."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.main.data.chart_series import FearGreedHistory, build_fear_greed_series, scale_fear_greed
+
+
+@pytest.fixture
+def fear_greed_df():
+    """Provide four days of Fear & Greed, newest first as the store returns them."""
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-04', '2025-01-03', '2025-01-02', '2025-01-01']),
+        'fear_greed_index': [80, 60, 40, 20],
+        'sentiment': ['Extreme Greed', 'Greed', 'Fear', 'Extreme Fear'],
+    })
+
+
+class TestBuildFearGreedSeries:
+    """Test alignment and scaling."""
+
+    def test_aligns_by_date_not_position(self, fear_greed_df):
+        """Test that prices attach to their own day, with gaps carried forward."""
+        # Price history is shifted: no close on Jan 1 or Jan 3, an extra day on Jan 5
+        btc_price_df = pd.DataFrame({
+            'timestamp': pd.to_datetime(['2025-01-05', '2025-01-04', '2025-01-02']),
+            'close': [105.0, 104.0, 102.0],
+        })
+
+        history = build_fear_greed_series(fear_greed_df, btc_price_df)
+
+        assert history.date.astype(str).tolist() == ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04']
+        assert history.raw_value.dtype == np.int64 and history.raw_value.tolist() == [20, 40, 60, 80]
+        np.testing.assert_array_equal(history.price, [np.nan, 102.0, 102.0, 104.0])
+        np.testing.assert_array_equal(history.price_pct, [np.nan, 0.0, 0.0, 100.0])
+        assert history.carried_prices == 1
+        assert (history.price_min, history.price_max) == (102.0, 104.0)
+        assert history.latest() == (80, 'Extreme Greed')
+
+    def test_scaling_matches_padded_band(self):
+        """Test that values spread over 20-80 within the padded range."""
+        scaled = scale_fear_greed([20, 80])
+
+        assert scaled.tolist() == pytest.approx([28.57, 71.43], abs=0.01)
+        assert scale_fear_greed([50, 50]).tolist() == [50.0, 50.0]
+
+    def test_missing_price_history(self, fear_greed_df):
+        """Test the default price axis and None prices in template points."""
+        history = build_fear_greed_series(fear_greed_df, pd.DataFrame(columns=['timestamp', 'close']))
+        points = history.points()
+
+        assert (history.price_min, history.price_max) == (0.0, 120000.0)
+        assert len(points) == 4
+        assert points[0] == {'day': 1, 'date': '2025-01-01', 'value': 28, 'raw_value': 20,
+                             'label': 'Extreme Fear', 'price': None, 'price_pct': None}
+
+    def test_missing_fear_greed_history(self):
+        """Test that no Fear & Greed rows give an empty history, not placeholder points."""
+        history = build_fear_greed_series(pd.DataFrame(), pd.DataFrame())
+
+        assert len(history) == 0
+        assert history.points() == [] and history.latest() is None
+        assert isinstance(history, FearGreedHistory)
@@ -0,0 +1,63 @@
+"""Tests for the shared database engine factory."""
+import os
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import engine as engine_module
+from src.config import DatabaseConfig
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+    """Make sure each test starts and ends without a shared engine."""
+    engine_module.dispose_engine()
+    yield
+    engine_module.dispose_engine()
+
+
+class TestEngineFactory:
+    """Test pool configuration and engine sharing."""
+
+    def test_build_engine_uses_config(self):
+        """Test that pool and connection settings come from DatabaseConfig."""
+        db_config = DatabaseConfig(pool_size=3, max_overflow=2, pool_recycle=600,
+                                   pool_pre_ping=True, statement_timeout=1500)
+
+        with patch.object(engine_module, 'create_engine') as mock_create:
+            engine_module.build_engine(db_config)
+
+        args, kwargs = mock_create.call_args
+        assert args[0] == db_config.get_connection_url()
+        assert kwargs['pool_size'] == 3
+        assert kwargs['max_overflow'] == 2
+        assert kwargs['pool_recycle'] == 600
+        assert kwargs['pool_pre_ping'] is True
+        assert kwargs['connect_args']['options'] == "-c statement_timeout=1500"
+        assert kwargs['connect_args']['connect_timeout'] == db_config.connection_timeout
+
+    def test_get_engine_is_shared(self):
+        """Test that every caller receives the same engine."""
+        first = engine_module.get_engine()
+
+        assert engine_module.get_engine() is first
+        assert first.pool.size() == DatabaseConfig().pool_size
+
+    def test_dispose_engine_resets(self):
+        """Test that dispose drops the shared engine so the next call rebuilds it."""
+        first = engine_module.get_engine()
+        engine_module.dispose_engine()
+
+        assert engine_module.get_engine() is not first
+
+    @patch.dict(os.environ, {"DB_POOL_SIZE": "8", "DB_STATEMENT_TIMEOUT": "5000"})
+    def test_pool_settings_from_environment(self):
+        """Test that pool settings are read from environment variables."""
+        db_config = DatabaseConfig()
+
+        assert db_config.pool_size == 8
+        assert db_config.statement_timeout == 5000
+
+    def test_invalid_pool_size(self):
+        """Test validation of pool settings."""
+        with pytest.raises(ValueError, match="Invalid pool settings"):
+            DatabaseConfig(pool_size=0).validate()
@@ -0,0 +1,109 @@
+"""Tests for the local SQLite fixture database mode."""
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import database, engine as engine_module
+from scripts.main.data.fixture_db import FIXTURE_TABLES, dump_fixture
+from scripts.main.data.history_store import HistoryStore
+from scripts.main.data.query_cache import QueryCache
+from src.config import DatabaseConfig
+
+GLOBAL_COLUMNS = [
+    'total_market_cap', 'total_volume24h_reported', 'altcoin_volume24h_reported', 'altcoin_market_cap',
+    'total_market_cap_yesterday_percentage_change', 'total_volume24h_yesterday_percentage_change',
+    'derivatives_volume24h_reported', 'derivatives24h_percentage_change', 'active_crypto_currencies',
+    'total_crypto_currencies', 'active_exchanges', 'total_exchanges', 'stablecoin_volume24h_reported',
+    'stablecoin_market_cap', 'stablecoin24h_percentage_change', 'defi_volume24h_reported', 'defi_market_cap',
+    'defi24h_percentage_change', 'btc_dominance24h_percentage_change', 'eth_dominance24h_percentage_change',
+    'btc_dominance', 'eth_dominance',
+]
+
+
+def source_tables():
+    """Build small copies of every source table."""
+    slugs = ['bitcoin', 'ethereum', 'solana']
+    days = [datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=d) for d in range(5)]
+    return {
+        'crypto_listings_latest_1000': pd.DataFrame({
+            'slug': slugs, 'cmc_rank': [1, 2, 3], 'last_updated': '2025-01-01', 'symbol': ['BTC', 'ETH', 'SOL'],
+            'price': [50000.0, 3000.0, 150.0], 'percent_change24h': [1.0, -2.0, 3.0], 'volume24h': 1e9,
+            'market_cap': [1e12, 3e11, 6e10], 'percent_change7d': 1.0, 'percent_change30d': 2.0,
+            'percent_change90d': 3.0, 'ytd_price_change_percentage': 4.0, 'turnover': 0.1,
+        }),
+        'FE_DMV_ALL': pd.DataFrame({'id': [1, 2, 3], 'slug': slugs, 'name': ['Bitcoin', 'Ethereum', 'Solana'],
+                                    'bullish': [20, 15, 5], 'bearish': [3, 4, 12], 'neutral': [30, 30, 30]}),
+        'FE_DMV_SCORES': pd.DataFrame({'slug': slugs, 'Durability_Score': [80.0, 70.0, 60.0],
+                                       'Momentum_Score': [50.0, 40.0, 30.0], 'Valuation_Score': [20.0, 10.0, 0.0]}),
+        'FE_RATIOS': pd.DataFrame({'slug': slugs, 'm_rat_alpha': 0.1, 'd_rat_beta': [1.5, 2.0, 1.2],
+                                   'm_rat_omega': [1.5, 1.2, 0.5]}),
+        'FE_CC_INFO_URL': pd.DataFrame({'slug': slugs, 'logo': ['btc.png', 'eth.png', 'sol.png']}),
+        'FE_FEAR_GREED_CMC': pd.DataFrame({'timestamp': days, 'fear_greed_index': [60, 55, 50, 45, 40],
+                                           'sentiment': 'Neutral'}),
+        '1K_coins_ohlcv': pd.DataFrame({'timestamp': days, 'slug': 'bitcoin', 'name': 'Bitcoin',
+                                        'close': [50000.0, 49000.0, 48000.0, 47000.0, 46000.0]}),
+        'crypto_global_latest': pd.DataFrame([{column: 1e9 for column in GLOBAL_COLUMNS}]),
+    }
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    """Dump a small source database into a fixture file."""
+    source_path = tmp_path / 'source.sqlite'
+    source = engine_module.build_fixture_engine(str(source_path))
+    with source.begin() as conn:
+        for table, df in source_tables().items():
+            df.to_sql(table, conn, index=False)
+
+    path = tmp_path / 'fixture.sqlite'
+    counts = dump_fixture(source, str(path))
+    source.dispose()
+
+    assert set(counts) == set(FIXTURE_TABLES)
+    return str(path)
+
+
+@pytest.fixture
+def fixture_run(fixture_path, tmp_path):
+    """Point the shared engine at the fixture with fresh run state."""
+    engine_module.dispose_engine()
+    with patch.dict(os.environ, {'DB_FIXTURE_PATH': fixture_path, 'SOCIALS_LOGO_INDEX_DIR': str(tmp_path / 'logos')}), \
+         patch.object(database, '_market_snapshot', None), \
+         patch.object(database, '_logo_index', None), \
+         patch.object(database, '_query_cache', QueryCache(cache_dir=str(tmp_path), enabled=False)), \
+         patch.object(database, '_history_store', HistoryStore(history_dir=str(tmp_path / 'history'), enabled=True)):
+        yield
+    engine_module.dispose_engine()
+
+
+class TestFixtureMode:
+    """Test that database.py runs unchanged against the fixture."""
+
+    def test_config_selects_fixture(self, fixture_path):
+        """Test that DB_FIXTURE_PATH switches the engine to SQLite."""
+        db_config = DatabaseConfig(fixture_path=fixture_path)
+        db_config.validate()
+
+        assert db_config.uses_fixture
+        assert engine_module.build_engine(db_config).dialect.name == 'sqlite'
+
+    def test_missing_fixture_fails_validation(self, tmp_path):
+        """Test that a wrong fixture path is reported."""
+        with pytest.raises(ValueError, match="fixture not found"):
+            DatabaseConfig(fixture_path=str(tmp_path / 'missing.sqlite')).validate()
+
+    def test_fetchers_run_against_fixture(self, fixture_run):
+        """Test the slide fetchers end to end on the local database."""
+        top = database.fetch_top_coins(1, 2)
+        btc = database.fetch_btc_snapshot_data()
+        longs = database.fetch_trading_opportunities("long", 5)
+        global_data = database.fetch_global_market_data()
+
+        assert top['slug'].tolist() == ['bitcoin', 'ethereum']
+        assert btc.row['price'] == 50000.0 and btc.row['logo'] == 'btc.png'
+        assert len(btc.history) == 5 and btc.history.price[-1] == 50000.0
+        assert longs['slug'].tolist() == ['bitcoin', 'ethereum']
+        assert not global_data.empty
@@ -0,0 +1,85 @@
+"""Tests for render-time number formatting and Jinja filters."""
+import numpy as np
+import pandas as pd
+import pytest
+from jinja2 import Environment
+
+from scripts.main.content.formatting import (
+    LARGE_UNIT_BUCKETS, format_number, format_percent, format_usd, format_usd_units,
+    number_series, percent_series, register_filters, usd_series, usd_units_series
+)
+
+
+class TestScalarFormatting:
+    """Test the scalar formatters behind the Jinja filters."""
+
+    @pytest.mark.parametrize("value, expected", [
+        (1.234e12, "$1.23 T"),
+        (3.5e11, "$350.00 B"),
+        (2.5e6, "$2.50 M"),
+        (4500, "$4.50 K"),
+        (12.345, "$12.35"),
+        ("1e9", "$1.00 B"),
+    ])
+    def test_usd_units(self, value, expected):
+        """Test unit bucket selection."""
+        assert format_usd_units(value) == expected
+
+    def test_usd_and_number(self):
+        """Test fixed-decimal price and number formatting."""
+        assert format_usd(50000.123) == "$50000.12"
+        assert format_number(-1.005, 1) == "-1.0"
+        assert format_number(2) == "2.00"
+
+    @pytest.mark.parametrize("value", [None, np.nan, "abc"])
+    def test_missing_values(self, value):
+        """Test that missing or non-numeric values render as N/A."""
+        assert format_usd(value) == "N/A"
+        assert format_usd_units(value) == "N/A"
+        assert format_number(value) == "N/A"
+
+
+class TestSeriesFormatting:
+    """Test that the vectorized column formatters match the scalar ones."""
+
+    @pytest.fixture
+    def listing(self):
+        """Provide a column spanning every unit bucket plus missing values."""
+        values = [1.234e12, 3.5e11, 2.5e6, 4500, 12.345, -7.5, 0.0, None, np.nan, "abc"]
+        return pd.Series(values, index=range(10, 20), dtype=object)
+
+    @pytest.mark.parametrize("buckets", [None, LARGE_UNIT_BUCKETS])
+    def test_usd_units_matches_scalar(self, listing, buckets):
+        """Test usd_units_series against format_usd_units row by row."""
+        kwargs = {'buckets': buckets} if buckets else {}
+        expected = [format_usd_units(value, **kwargs) for value in listing]
+
+        assert usd_units_series(listing, **kwargs).tolist() == expected
+
+    def test_fixed_decimal_series_match_scalar(self, listing):
+        """Test number, percent and usd series against their scalar counterparts."""
+        assert number_series(listing, signed=True).tolist() == [format_number(v, signed=True) for v in listing]
+        assert percent_series(listing, 1).tolist() == [format_percent(v, 1) for v in listing]
+        assert usd_series(listing, 4).tolist() == [format_usd(v, 4) for v in listing]
+
+    def test_index_and_missing_marker(self, listing):
+        """Test that the index is kept and the missing marker is configurable."""
+        result = usd_units_series(listing, missing='')
+
+        assert result.index.equals(listing.index)
+        assert result.loc[17] == '' and result.loc[19] == ''
+
+
+class TestJinjaFilters:
+    """Test filter registration."""
+
+    def test_filters_render_numeric_snapshot(self):
+        """Test that a numeric snapshot renders like the old pre-formatted strings."""
+        env = register_filters(Environment())
+        template = env.from_string(
+            "{{ s.price | usd }} {{ s.market_cap | usd_units }} {{ s.percent_change24h | num }}%"
+        )
+
+        rendered = template.render(s={'price': 50000.1234, 'market_cap': 1.0e12, 'percent_change24h': 2.345})
+
+        assert rendered == "$50000.12 $1.00 T 2.35%"
@@ -0,0 +1,155 @@
+"""Tests for the batched spreadsheet loader in GoogleServicesManager."""
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from gspread.exceptions import APIError
+
+from scripts.main.integrations.google_services import GoogleServicesManager, values_to_dataframe
+
+SHEETS = {
+    'Top50Coins': [['slug', 'cmc_rank', 'pct_1d'], ['bitcoin', '1', '1.50%'], ['ethereum', '2']],
+    'TopGainer/TopLosers': [['tg_slug'], ['solana']],
+    'MarketOverview': [['btc_dominance'], ['55.5']],
+}
+
+
+class FakeSheetsClient:
+    """gspread client double answering the metadata and batchGet endpoints."""
+
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.calls = []
+
+    def request(self, method, url, params=None):
+        self.calls.append(url.rsplit('/', 1)[-1])
+        response = MagicMock()
+        if url.endswith('values:batchGet'):
+            names = [name[1:-1].replace("''", "'") for name in params['ranges']]
+            if any(name not in self.sheets for name in names):
+                error_response = MagicMock(status_code=400)
+                error_response.json.return_value = {'error': {'code': 400, 'message': 'Unable to parse range'}}
+                raise APIError(error_response)
+            response.json.return_value = {'valueRanges': [{'values': self.sheets[name]} for name in names]}
+        else:
+            response.json.return_value = {'sheets': [{'properties': {'title': name}} for name in self.sheets]}
+        return response
+
+
+def fake_drive(version):
+    """Drive service double reporting a spreadsheet version."""
+    drive = MagicMock()
+    drive.files.return_value.get.return_value.execute.side_effect = lambda: {'version': version[0]}
+    return drive
+
+
+@pytest.fixture
+def client():
+    """Provide a sheets client serving the test spreadsheet."""
+    return FakeSheetsClient(SHEETS)
+
+
+class TestBatchedSpreadsheetLoad:
+    """Test one-request loads, dtypes and the revision cache."""
+
+    def test_requested_sheets_in_one_request(self, client):
+        """Test that only the requested sheets are read, in a single batchGet."""
+        manager = GoogleServicesManager(gc=client, drive_service=fake_drive(['1']))
+
+        data = manager.load_spreadsheet_data('key', ['Top50Coins', 'TopGainer/TopLosers'])
+
+        assert list(data) == ['Top50Coins', 'TopGainer/TopLosers']
+        assert client.calls == ['values:batchGet']
+        assert data['TopGainer/TopLosers']['tg_slug'].tolist() == ['solana']
+
+    def test_cells_stay_sheet_text(self):
+        """Test that cells keep the sheet's text and trailing blank cells are padded."""
+        df = values_to_dataframe(SHEETS['Top50Coins'])
+
+        assert df['cmc_rank'].tolist() == ['1', '2']
+        assert df['pct_1d'].tolist() == ['1.50%', '']
+
+    def test_repeat_load_uses_cache_until_revision_changes(self, client):
+        """Test that an unchanged revision skips the read and a new one reloads."""
+        version = ['1']
+        manager = GoogleServicesManager(gc=client, drive_service=fake_drive(version))
+
+        manager.load_spreadsheet_data('key', ['Top50Coins'])
+        first = manager.load_spreadsheet_data('key', ['Top50Coins'])
+        first['Top50Coins']['pct_1d_num'] = 0
+        assert client.calls == ['values:batchGet']
+        assert 'pct_1d_num' not in manager.load_spreadsheet_data('key', ['Top50Coins'])['Top50Coins']
+
+        version[0] = '2'
+        manager.load_spreadsheet_data('key', ['Top50Coins'])
+        assert client.calls == ['values:batchGet', 'values:batchGet']
+
+    def test_missing_sheet_is_skipped(self, client):
+        """Test that an unknown sheet name does not fail the other sheets."""
+        manager = GoogleServicesManager(gc=client, drive_service=fake_drive(['1']))
+
+        data = manager.load_spreadsheet_data('key', ['Top50Coins', 'BTC_SNAPSHOT'])
+
+        assert list(data) == ['Top50Coins']
+        assert manager.validate_required_sheets(data, ['Top50Coins', 'BTC_SNAPSHOT']) == ['BTC_SNAPSHOT']
+
+    def test_all_sheets_when_none_requested(self, client):
+        """Test that omitting names loads every worksheet."""
+        manager = GoogleServicesManager(gc=client)
+
+        assert list(manager.load_spreadsheet_data('key')) == list(SHEETS)
+
+
+# Mixed sheets as the sync writes them: numeric-looking columns next to "%" and "$" text
+MIXED_SHEETS = {
+    'Top50Coins': [['slug', 'cmc_rank', 'symbol', 'pct_1d', 'price_usd'],
+                   ['bitcoin', '1', 'BTC', '1.50%', '$50,000.00'],
+                   ['ethereum', '2', 'ETH', '-3.25%', '$3,000.00'],
+                   ['solana', '3', 'SOL', '6.00%', '$150.00']],
+    'BTC_SNAPSHOT': [['slug', 'cmc_rank', 'symbol', 'price', 'percent_change24h', 'bullish', 'bearish',
+                      'neutral', 'sentiment_diff', 'Trend'],
+                     ['bitcoin', '1', 'BTC', '50000.10', '1.50', '12', '2', '9', '10', 'Bullish+']],
+    'ShortOpportunities': [['slug', 'bearish_count', 'market_cap', 'percent_change24h'],
+                           ['ethereum', '7', '$350B', '-3.25%'], ['dogecoin', '9'], ['solana', '4', '$65B', '6%']],
+    'LongOpportunities': [['slug', 'bullish_count', 'market_cap', 'percent_change24h'],
+                          ['solana', '15', '$65B', '6%'], ['pepe', '40', '$1B', '9%'], ['bitcoin', '10']],
+}
+
+
+@pytest.fixture
+def mixed_sheets():
+    """Provide the mixed sheets loaded through the batched reader."""
+    manager = GoogleServicesManager(gc=FakeSheetsClient(MIXED_SHEETS), drive_service=fake_drive(['1']))
+    return manager, manager.load_spreadsheet_data('key', list(MIXED_SHEETS))
+
+
+class TestProcessSheets:
+    """Test that the processors see the sheet's text, as get_all_values() returned it."""
+
+    def test_top_coins(self, mixed_sheets):
+        """Test gainer and loser picked from "%" strings."""
+        manager, data = mixed_sheets
+
+        _, _, gainer_symbol, gainer_pct, loser_symbol, loser_pct = manager.process_top_coins_data(data)
+
+        assert (gainer_symbol, gainer_pct, loser_symbol, loser_pct) == ('SOL', '6.00%', 'ETH', '-3.25%')
+
+    def test_btc_snapshot(self, mixed_sheets):
+        """Test that numeric-looking cells pass through exactly as displayed."""
+        manager, data = mixed_sheets
+
+        btc = manager.process_btc_snapshot_data(data)
+
+        assert btc['price'] == '50000.10' and btc['percent_change_24h'] == '1.50'
+        assert btc['bullish'] == '12' and btc['rank'] == '1' and btc['trend'] == 'Bullish+'
+
+    def test_trading_opportunities(self, mixed_sheets):
+        """Test ranking by counts with blank padded cells left as text."""
+        manager, data = mixed_sheets
+
+        top_shorts, top_longs = manager.process_trading_opportunities(data)
+
+        assert top_shorts['slug'].tolist() == ['dogecoin', 'ethereum']
+        assert top_shorts['market_cap'].tolist() == ['', '$350B']
+        assert top_longs['slug'].tolist() == ['pepe', 'solana']
+        assert top_longs['percent_change24h'].tolist() == ['9%', '6%']
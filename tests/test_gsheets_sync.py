@@ -0,0 +1,306 @@
+"""Tests for the SheetSync Google Sheets pipeline."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from scripts.main.data.analytics import MarketAnalytics
+from scripts.main.data.gsheets_sync import (
+    SHEETS, GspreadBackend, MemorySheetsBackend, SheetSync, SheetsQuotaExceeded, TokenBucket,
+    dataframe_to_grid, diff_grid
+)
+from scripts.main.data.logo_index import LogoIndex
+from scripts.main.data.market_snapshot import MarketSnapshot
+from src.retry_utils import RetryConfig, RetryManager, RetryStrategy
+
+SLUGS = ['bitcoin', 'ethereum', 'tether', 'solana', 'dogecoin']
+
+
+@pytest.fixture
+def snapshot():
+    """Provide a preloaded snapshot with every table the sheets read."""
+    return MarketSnapshot(frames={
+        'listings': pd.DataFrame({
+            'slug': SLUGS,
+            'cmc_rank': [1, 2, 3, 4, 5],
+            'last_updated': ['2025-01-01'] * 5,
+            'symbol': ['BTC', 'ETH', 'USDT', 'SOL', 'DOGE'],
+            'price': [50000.0, 3000.0, 1.0, 150.0, 0.1],
+            'percent_change24h': [1.0, -3.0, 0.01, 6.0, -1.0],
+            'volume24h': [3.0e10, 1.5e10, 5.0e10, 2.0e9, 1.0e9],
+            'market_cap': [1.0e12, 3.5e11, 1.0e11, 6.5e10, 1.0e10],
+            'percent_change7d': [1.0, 2.0, 0.0, 3.0, 4.0],
+            'percent_change30d': [1.0, 2.0, 0.0, 3.0, 4.0],
+            'percent_change90d': [10.0, 12.0, 0.0, 30.0, 5.0],
+            'ytd_price_change_percentage': [20.0, 10.0, 0.0, 40.0, -5.0],
+            'turnover': [0.03, 0.04, 0.5, 0.03, 0.1],
+        }),
+        'dmv_scores': pd.DataFrame({
+            'slug': SLUGS,
+            'Durability_Score': [80.0, 70.0, 0.0, 60.0, 10.0],
+            'Momentum_Score': [50.0, 40.0, 0.0, 30.0, 5.0],
+            'Valuation_Score': [20.0, 10.0, 0.0, 0.0, -5.0],
+        }),
+        'ratios': pd.DataFrame({
+            'slug': SLUGS,
+            'm_rat_alpha': [0.111, 0.2, 0.0, 0.3, 0.4],
+            'd_rat_beta': [1.5, 1.1, 0.1, 0.5, 2.0],
+            'm_rat_omega': [1.5, 1.2, 0.1, 1.8, 0.5],
+        }),
+        'global': pd.DataFrame({
+            'total_market_cap': [2.5e12],
+            'total_market_cap_yesterday_percentage_change': [1.234],
+            'btc_dominance': [55.5],
+        }),
+    })
+
+
+@pytest.fixture
+def dmv_signals():
+    """Provide raw FE_DMV_ALL rows with signal columns."""
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'slug': SLUGS,
+        'signal_a': [1, 1, 0, -1, -1],
+        'signal_b': [1, 1, 0, -1, 0],
+        'signal_c': [1, -1, 0, -1, 1],
+    })
+
+
+@pytest.fixture
+def sync(snapshot):
+    """Provide a pipeline over the snapshot writing to an in-memory backend."""
+    logos = LogoIndex(logos={slug: f'{slug}.png' for slug in SLUGS})
+    return SheetSync(backend=MemorySheetsBackend(), engine=MagicMock(), snapshot=snapshot,
+                     analytics=MarketAnalytics(snapshot, logos, backend='pandas'), logo_index=logos)
+
+
+class TestSheetSync:
+    """Test building and pushing the worksheets as independent stages."""
+
+    def test_run_pushes_every_sheet(self, sync, dmv_signals):
+        """Test that a full run writes all sheets and reads FE_DMV_ALL once."""
+        with patch('pandas.read_sql_query', return_value=dmv_signals) as mock_read:
+            results = sync.run()
+
+        assert results == {sheet: True for sheet in SHEETS}
+        assert set(sync.backend.sheets) == set(SHEETS)
+        assert mock_read.call_count == 1
+
+    def test_single_sheet_builds_only_that_stage(self, sync):
+        """Test that one sheet is refreshed without computing the others."""
+        with patch('pandas.read_sql_query') as mock_read:
+            assert sync.run(['Top50Coins']) == {'Top50Coins': True}
+
+        top = sync.backend.sheets['Top50Coins']
+        assert list(sync.frames) == ['Top50Coins']
+        assert mock_read.call_count == 0
+        assert top['slug'].tolist() == SLUGS
+        assert top['logo'].iloc[0] == 'bitcoin.png'
+
+    def test_btc_snapshot_counts_signals(self, sync, dmv_signals):
+        """Test the BTC trend from its raw signal columns."""
+        with patch('pandas.read_sql_query', return_value=dmv_signals):
+            btc = sync.build('BTC_SNAPSHOT')
+
+        assert btc['slug'].tolist() == ['bitcoin']
+        assert (btc['bullish'].iloc[0], btc['bearish'].iloc[0]) == (3, 0)
+        assert btc['Trend'].iloc[0] == 'Consolidating'
+
+    def test_opportunities_exclude_stablecoins(self, sync, dmv_signals):
+        """Test signal-count ordering, stablecoin removal and rounded ratios."""
+        with patch('pandas.read_sql_query', return_value=dmv_signals):
+            frames = sync.build_all(['LongOpportunities', 'ShortOpportunities'], parallel=True)
+
+        longs = frames['LongOpportunities']
+        assert 'tether' not in longs['slug'].tolist()
+        assert longs['slug'].iloc[0] == 'bitcoin'
+        assert longs['m_rat_alpha'].iloc[0] == 0.11
+        assert frames['ShortOpportunities']['slug'].iloc[0] == 'solana'
+
+    def test_failed_push_is_reported(self, sync):
+        """Test that a backend error fails one sheet without raising."""
+        sync.backend.write = MagicMock(side_effect=RuntimeError("quota exceeded"))
+
+        assert sync.run(['MarketOverview']) == {'MarketOverview': False}
+        assert sync.frames['MarketOverview']['alt_season'].iloc[0] in ('YES', 'NO')
+
+    def test_unknown_sheet_rejected(self, sync):
+        """Test that a misspelled sheet name fails fast."""
+        with pytest.raises(ValueError, match="Unknown sheet"):
+            sync.build('Top100Coins')
+
+
+class FakeWorksheet:
+    """Worksheet double holding a grid of displayed values."""
+
+    def __init__(self, values, title='Top50Coins'):
+        self.title = title
+        self.values = values
+        self.batch_update = MagicMock()
+        self.clear = MagicMock()
+
+    def get_all_values(self):
+        return self.values
+
+
+class FakeClock:
+    """Clock whose sleep() advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def quota_error():
+    """Build an exception shaped like gspread's APIError for a 429 response."""
+    error = Exception("RESOURCE_EXHAUSTED")
+    error.response = MagicMock(status_code=429)
+    return error
+
+
+def backend_for(*worksheets):
+    """Build a gspread backend whose client serves the worksheets, without real waits."""
+    client = MagicMock()
+    client.open_by_key.return_value.worksheets.return_value = list(worksheets)
+    retry = RetryManager(RetryConfig(max_attempts=3, base_delay=0.0, jitter_range=0.0,
+                                     strategy=RetryStrategy.FIXED, retryable_exceptions=[SheetsQuotaExceeded]), "test")
+    return GspreadBackend(spreadsheet_key='key', client=client, retry_manager=retry,
+                          read_limiter=TokenBucket(1000.0, 1000), write_limiter=TokenBucket(1000.0, 1000))
+
+
+class TestDiffWrites:
+    """Test that only changed cells are written."""
+
+    def test_grid_strings_and_blanks(self):
+        """Test header row, stringified values and blank missing cells."""
+        df = pd.DataFrame({'slug': ['bitcoin', None], 'price': [1.5, float('nan')]})
+
+        assert dataframe_to_grid(df) == [['slug', 'price'], ['bitcoin', '1.5'], ['', '']]
+
+    def test_changed_runs_in_one_batch(self):
+        """Test that changed cells are grouped per row and sent in one call."""
+        worksheet = FakeWorksheet([['slug', 'price', 'pct', 'colour'],
+                                   ['bitcoin', '1', '2%', '/#8DFF7E'],
+                                   ['ethereum', '3']])
+        df = pd.DataFrame({'slug': ['bitcoin', 'ethereum'], 'price': [1.0, 4.0],
+                           'pct': ['-1%', '5%'], 'colour': ['/#FF726D', '/#8DFF7E']})
+
+        stats = backend_for(worksheet).write('Top50Coins', df)
+
+        worksheet.batch_update.assert_called_once_with([
+            {'range': 'C2:D2', 'values': [['-1%', '/#FF726D']]},
+            {'range': 'B3:D3', 'values': [['4.0', '5%', '/#8DFF7E']]},
+        ], value_input_option='USER_ENTERED')
+        worksheet.clear.assert_not_called()
+        assert stats == {'cells_written': 5, 'cells_unchanged': 7, 'full_rewrite': False}
+
+    def test_unchanged_sheet_sends_nothing(self):
+        """Test that identical data makes no write call."""
+        worksheet = FakeWorksheet([['slug', 'price'], ['bitcoin', '50000']])
+        backend = backend_for(worksheet)
+
+        backend.write('Top50Coins', pd.DataFrame({'slug': ['bitcoin'], 'price': [50000.0]}))
+
+        worksheet.batch_update.assert_not_called()
+        assert backend.stats() == {'cells_written': 0, 'cells_unchanged': 4, 'full_rewrites': 0}
+
+    @pytest.mark.parametrize('displayed, written', [
+        ('1/31/2025', '2025-01-31'),
+        ('9:05:03', '09:05:03'),
+        ('1', '1.0'),
+    ])
+    def test_sheet_formatted_values_are_unchanged(self, displayed, written):
+        """Test that dates, times and numbers read back in the sheet's format are not rewritten."""
+        assert diff_grid([['last_updated'], [displayed]], [['last_updated'], [written]]) == ([], 2)
+
+    def test_changed_date_is_written(self):
+        """Test that a new day still rewrites the date cell."""
+        updates, _ = diff_grid([['last_updated'], ['1/30/2025']], [['last_updated'], ['2025-01-31']])
+
+        assert updates == [{'range': 'A2:A2', 'values': [['2025-01-31']]}]
+
+    def test_built_date_cells_survive_read_back(self, sync):
+        """Test that Top50Coins' last_updated matches the sheet's display of the same date."""
+        df = sync.build_top_coins()
+        grid = dataframe_to_grid(df)
+        column = grid[0].index('last_updated')
+        today = date.today()
+        displayed = [row[:] for row in grid]
+        for row in displayed[1:]:
+            row[column] = f"{today.month}/{today.day}/{today.year}"
+
+        assert diff_grid(displayed, grid)[0] == []
+
+    @pytest.mark.parametrize('current', [
+        [],
+        [['slug', 'price']],
+        [['slug', 'price', 'extra'], ['bitcoin', '1', 'x']],
+        [['slug'], ['bitcoin']],
+    ])
+    def test_shape_change_needs_full_rewrite(self, current):
+        """Test that added or removed rows or columns fall back to a rewrite."""
+        assert diff_grid(current, [['slug', 'price'], ['bitcoin', '1']]) is None
+
+
+class TestQuotaAwarePush:
+    """Test rate limiting, 429 retries and concurrent pushes."""
+
+    def test_token_bucket_spaces_requests_after_burst(self):
+        """Test that requests beyond the burst wait for the refill rate."""
+        clock = FakeClock()
+        bucket = TokenBucket.for_quota(60, burst=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        # 58 requests/minute refill after a burst of 2
+        assert clock.sleeps == [pytest.approx(60 / 58)] * 2
+
+    def test_quota_error_is_retried(self):
+        """Test that a 429 is retried and the write then succeeds."""
+        worksheet = FakeWorksheet([['slug'], ['bitcoin']])
+        worksheet.batch_update.side_effect = [quota_error(), None]
+
+        stats = backend_for(worksheet).write('Top50Coins', pd.DataFrame({'slug': ['ethereum']}))
+
+        assert worksheet.batch_update.call_count == 2
+        assert stats['cells_written'] == 1
+
+    def test_other_api_errors_are_not_retried(self):
+        """Test that non-quota errors fail the sheet immediately."""
+        worksheet = FakeWorksheet([['slug'], ['bitcoin']])
+        worksheet.batch_update.side_effect = RuntimeError("permission denied")
+
+        with pytest.raises(RuntimeError):
+            backend_for(worksheet).write('Top50Coins', pd.DataFrame({'slug': ['ethereum']}))
+        assert worksheet.batch_update.call_count == 1
+
+    def test_spreadsheet_opened_once_for_all_sheets(self):
+        """Test that concurrent writes share one open spreadsheet."""
+        worksheets = [FakeWorksheet([['slug'], ['bitcoin']], title=f'Sheet{i}') for i in range(6)]
+        backend = backend_for(*worksheets)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda ws: backend.write(ws.title, pd.DataFrame({'slug': ['ethereum']})), worksheets))
+
+        assert backend._client.open_by_key.call_count == 1
+        assert backend.stats()['cells_written'] == 6
+
+    def test_parallel_run_pushes_every_sheet(self, sync, dmv_signals):
+        """Test that a parallel run builds and pushes all sheets once each."""
+        with patch('pandas.read_sql_query', return_value=dmv_signals) as mock_read:
+            results = sync.run(parallel=True)
+
+        assert results == {sheet: True for sheet in SHEETS}
+        assert list(results) == list(SHEETS)
+        assert mock_read.call_count == 1
@@ -0,0 +1,71 @@
+"""Tests for the local history store with high-water-mark delta sync."""
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data.history_store import EPOCH, HistoryStore
+
+
+def fear_greed_rows(days, start='2025-01-01'):
+    """Build Fear & Greed rows for consecutive days, newest first."""
+    stamps = pd.date_range(start, periods=days, freq='D')[::-1]
+    return pd.DataFrame({
+        'timestamp': stamps,
+        'fear_greed_index': range(days, 0, -1),
+        'sentiment': 'Neutral',
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Provide an enabled store in a temp directory."""
+    return HistoryStore(history_dir=str(tmp_path), sync_interval=3600, enabled=True, refresh=False)
+
+
+class TestHistoryStore:
+    """Test delta syncing and window reads."""
+
+    def test_first_sync_fetches_window_from_epoch(self, store):
+        """Test that an empty series asks for the newest window since the epoch."""
+        with patch('pandas.read_sql_query', return_value=fear_greed_rows(30)) as mock_read:
+            df = store.window('fear_greed', engine=None)
+
+        assert mock_read.call_args.kwargs['params'] == {'since': EPOCH, 'limit': 30}
+        assert len(df) == 30
+        assert df['timestamp'].is_monotonic_decreasing
+        assert store.high_water_mark('fear_greed') == '2025-01-30 00:00:00'
+
+    def test_within_interval_served_locally(self, store):
+        """Test that a fresh series answers without a remote query."""
+        with patch('pandas.read_sql_query', return_value=fear_greed_rows(30)) as mock_read:
+            store.window('fear_greed', engine=None)
+            store.window('fear_greed', engine=None)
+
+        assert mock_read.call_count == 1
+
+    def test_delta_sync_appends_new_rows(self, store):
+        """Test that a later sync starts at the high-water mark and upserts."""
+        with patch('pandas.read_sql_query', return_value=fear_greed_rows(30)):
+            store.sync('fear_greed', engine=None)
+
+        # The last stored day is re-read (updated) plus one new day
+        delta = fear_greed_rows(2, start='2025-01-30')
+        delta['fear_greed_index'] = [99, 98]
+        with patch('pandas.read_sql_query', return_value=delta) as mock_read:
+            store.sync('fear_greed', engine=None, force=True)
+            df = store.window('fear_greed', engine=None)
+
+        assert mock_read.call_args.kwargs['params']['since'] == '2025-01-30 00:00:00'
+        assert df['fear_greed_index'].tolist()[:2] == [99, 98]
+        assert len(df) == 30
+
+    def test_disabled_store_queries_directly(self, tmp_path):
+        """Test that a disabled store reads the window remotely and writes nothing."""
+        store = HistoryStore(history_dir=str(tmp_path / 'history'), enabled=False)
+
+        with patch('pandas.read_sql_query', return_value=fear_greed_rows(3)) as mock_read:
+            df = store.window('btc_ohlcv', engine=None)
+
+        assert mock_read.call_args.kwargs['params'] == {'slug': 'bitcoin', 'since': EPOCH, 'limit': 31}
+        assert len(df) == 3
+        assert not (tmp_path / 'history').exists()
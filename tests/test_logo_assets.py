@@ -0,0 +1,117 @@
+"""Tests for the local logo image cache used at render time."""
+import base64
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from PIL import Image
+
+from scripts.main.content.logo_assets import FALLBACK_DIGEST, IMAGE_FORMAT, LogoAssetCache
+
+
+def png_bytes(size=(200, 100), color=(255, 128, 0, 255)):
+    """Encode a solid test image."""
+    buffer = BytesIO()
+    Image.new('RGBA', size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def fake_session(responses):
+    """Build a session whose get() serves bytes per URL or raises for unknown URLs."""
+    session = MagicMock()
+
+    def get(url, timeout=None):
+        if url not in responses:
+            raise requests.ConnectionError("unreachable")
+        response = MagicMock()
+        response.content = responses[url]
+        response.raise_for_status.return_value = None
+        return response
+
+    session.get.side_effect = get
+    return session
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide a cache serving two logos with identical content."""
+    session = fake_session({'https://cdn/btc.png': png_bytes(), 'https://cdn/btc-copy.png': png_bytes()})
+    return LogoAssetCache(asset_dir=str(tmp_path), inline=False, session=session)
+
+
+class TestLogoAssetCache:
+    """Test downloading, resizing and context rewriting."""
+
+    def test_downloads_once_and_resizes(self, cache):
+        """Test that every size is written as a square and later calls are local."""
+        digest = cache.fetch('https://cdn/btc.png')
+        cache.fetch('https://cdn/btc.png')
+
+        assert cache.session.get.call_count == 1
+        for size in cache.sizes:
+            with Image.open(cache.asset_path(digest, size)) as image:
+                assert image.size == (size, size)
+                assert image.format.lower() == IMAGE_FORMAT
+
+    def test_content_addressed(self, cache):
+        """Test that identical images from different URLs share one asset."""
+        assert cache.fetch('https://cdn/btc.png') == cache.fetch('https://cdn/btc-copy.png')
+
+    def test_manifest_survives_restart(self, cache, tmp_path):
+        """Test that a new process reuses stored assets without downloading."""
+        cache.fetch('https://cdn/btc.png')
+        restarted = LogoAssetCache(asset_dir=str(tmp_path), session=fake_session({}))
+
+        assert restarted.fetch('https://cdn/btc.png') is not None
+        assert restarted.stats() == {'hits': 1, 'downloads': 0, 'failures': 0}
+
+    def test_src_picks_variant_and_file_uri(self, cache):
+        """Test that src points at the smallest variant covering the size."""
+        src = cache.src('https://cdn/btc.png', size=50)
+
+        assert src.startswith('file://') and src.endswith(f'/64.{IMAGE_FORMAT}')
+
+    def test_inline_data_uri(self, cache):
+        """Test that inline mode embeds the resized image."""
+        cache.inline = True
+        src = cache.src('https://cdn/btc.png', size=40)
+
+        prefix, payload = src.split(',', 1)
+        assert prefix == f'data:image/{IMAGE_FORMAT};base64'
+        with Image.open(BytesIO(base64.b64decode(payload))) as image:
+            assert image.size == (40, 40)
+
+    @pytest.mark.parametrize('logo', [None, float('nan'), 'nan', 'https://cdn/missing.png'])
+    def test_missing_logos_use_local_fallback(self, cache, logo):
+        """Test that blank and unreachable logos render the generated fallback."""
+        src = cache.src(logo, size=40)
+
+        assert f'/{FALLBACK_DIGEST}/40.' in src
+
+    def test_failed_download_not_retried(self, cache):
+        """Test that a broken URL is tried once per run."""
+        cache.src('https://cdn/missing.png')
+        cache.src('https://cdn/missing.png')
+
+        assert cache.session.get.call_count == 1
+        assert cache.stats()['failures'] == 1
+
+    def test_localize_rewrites_nested_logos(self, cache):
+        """Test that logo keys are rewritten in nested contexts and other values are kept."""
+        context = {
+            'snaps': {'logo': 'https://cdn/btc.png', 'price': 1.0},
+            'coins': [{'logo': 'https://cdn/btc-copy.png', 'symbol': 'BTC'}, {'logo': None}],
+            'btc_logo': 'data:image/png;base64,AAAA',
+            'title': 'https://example.com/not-a-logo',
+        }
+
+        localized = cache.localize(context, size=96)
+
+        assert localized['snaps']['logo'].startswith('file://')
+        assert localized['snaps']['price'] == 1.0
+        assert localized['coins'][0]['logo'] == localized['snaps']['logo']
+        assert FALLBACK_DIGEST in localized['coins'][1]['logo']
+        assert localized['btc_logo'] == 'data:image/png;base64,AAAA'
+        assert localized['title'] == 'https://example.com/not-a-logo'
+        assert context['coins'][0]['logo'] == 'https://cdn/btc-copy.png'
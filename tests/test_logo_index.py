@@ -0,0 +1,109 @@
+"""Tests for the persistent slug -> logo index."""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from scripts.main.data.logo_index import LogoIndex
+
+
+@pytest.fixture
+def logo_engine(tmp_path):
+    """Provide a SQLite database with a small logo table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.sqlite'}")
+    pd.DataFrame({'slug': ['bitcoin', 'ethereum', 'solana'], 'logo': ['btc.png', 'eth.png', None]}) \
+        .to_sql('FE_CC_INFO_URL', engine, index=False)
+    yield engine
+    engine.dispose()
+
+
+def add_logo(engine, slug, logo):
+    """Insert a logo row, as when a new coin is listed."""
+    pd.DataFrame({'slug': [slug], 'logo': [logo]}).to_sql('FE_CC_INFO_URL', engine, index=False, if_exists='append')
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    """Provide the directory the index persists to."""
+    return str(tmp_path / 'logos')
+
+
+class TestLogoIndex:
+    """Test loading, persistence and incremental refresh."""
+
+    def test_full_load_then_lookups_are_local(self, logo_engine, index_dir):
+        """Test that the table is read once and lookups hit the in-memory map."""
+        index = LogoIndex(logo_engine, index_dir=index_dir, enabled=True, refresh=False)
+
+        assert index.get('bitcoin') == 'btc.png'
+        assert index.map(pd.Series(['ethereum', 'bitcoin', 'ethereum'])).tolist() == ['eth.png', 'btc.png', 'eth.png']
+        assert index.stats()['rows_fetched'] == 2
+        assert index.stats()['hits'] == 3
+
+    def test_persisted_index_skips_database(self, logo_engine, index_dir):
+        """Test that a second run loads the file instead of the table."""
+        LogoIndex(logo_engine, index_dir=index_dir, enabled=True, refresh=False).get('bitcoin')
+
+        second = LogoIndex(engine=None, index_dir=index_dir, enabled=True, refresh=False)
+
+        assert second.get('ethereum') == 'eth.png'
+        assert second.stats()['rows_fetched'] == 0
+
+    def test_new_slugs_fetched_in_one_batch(self, logo_engine, index_dir):
+        """Test that unseen slugs are resolved incrementally and persisted."""
+        index = LogoIndex(logo_engine, index_dir=index_dir, enabled=True, refresh=False)
+        index.get('bitcoin')
+        add_logo(logo_engine, 'pepe', 'pepe.png')
+        add_logo(logo_engine, 'dogecoin', 'doge.png')
+
+        result = index.resolve(['pepe', 'dogecoin', 'unlisted', 'bitcoin'])
+
+        assert result == {'pepe': 'pepe.png', 'dogecoin': 'doge.png', 'unlisted': None, 'bitcoin': 'btc.png'}
+        assert index.stats()['rows_fetched'] == 4
+        with open(os.path.join(index_dir, 'logo_index.json'), encoding='utf-8') as f:
+            assert json.load(f)['logos']['pepe'] == 'pepe.png'
+
+    def test_unknown_slugs_not_requeried(self, logo_engine, index_dir):
+        """Test that a slug without a logo row costs one query per run."""
+        index = LogoIndex(logo_engine, index_dir=index_dir, enabled=True, refresh=False)
+        index.get('unlisted')
+        add_logo(logo_engine, 'unlisted', 'late.png')
+
+        assert index.get('unlisted', default='placeholder.png') == 'placeholder.png'
+        assert index.stats()['misses'] == 2
+
+    def test_stale_index_reloads(self, logo_engine, index_dir):
+        """Test that an index older than the refresh interval is reloaded in full."""
+        LogoIndex(logo_engine, index_dir=index_dir, enabled=True, refresh=False).get('bitcoin')
+        add_logo(logo_engine, 'pepe', 'pepe.png')
+
+        stale = LogoIndex(logo_engine, index_dir=index_dir, refresh_interval=-1, enabled=True, refresh=False)
+
+        assert stale.frame()['slug'].tolist() == ['bitcoin', 'ethereum', 'pepe']
+
+    def test_disabled_index_does_not_write(self, logo_engine, index_dir):
+        """Test that --no-cache keeps the index in memory only."""
+        index = LogoIndex(logo_engine, index_dir=index_dir, enabled=False, refresh=False)
+
+        assert index.get('bitcoin') == 'btc.png'
+        assert not os.path.exists(index_dir)
+
+    def test_preloaded_mapping(self):
+        """Test that a preloaded index needs no database or file."""
+        index = LogoIndex(logos={'bitcoin': 'btc.png'})
+
+        assert index.map(pd.Series(['bitcoin', 'missing'])).tolist()[0] == 'btc.png'
+        assert pd.isna(index.map(pd.Series(['missing'])).iloc[0])
+
+    def test_concurrent_lookups_are_all_counted(self):
+        """Test that hits and misses from worker threads are not lost."""
+        index = LogoIndex(logos={'bitcoin': 'btc.png'})
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: index.resolve(['bitcoin', 'missing']), range(4000)))
+
+        assert index.stats()['hits'] == 4000
+        assert index.stats()['misses'] == 4000
@@ -0,0 +1,148 @@
+"""Tests for the shared market snapshot and the fetchers derived from it."""
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import database
+from scripts.main.data.logo_index import LogoIndex
+from scripts.main.data.market_snapshot import MarketSnapshot, SNAPSHOT_QUERIES
+
+
+@pytest.fixture
+def snapshot_frames():
+    """Provide a small in-memory copy of the snapshot tables."""
+    return {
+        'listings': pd.DataFrame({
+            'slug': ['bitcoin', 'ethereum', 'solana', 'dogecoin'],
+            'cmc_rank': [1, 2, 3, 150],
+            'last_updated': ['2025-01-01'] * 4,
+            'symbol': ['BTC', 'ETH', 'SOL', 'DOGE'],
+            'price': [50000.123, 3000.456, 150.789, 0.1],
+            'percent_change24h': [2.345, -1.234, 5.678, 1.0],
+            'market_cap': [1.0e12, 3.5e11, 6.5e10, 1.0e10],
+            'volume24h': [3.0e10, 1.5e10, 2.0e9, 1.0e9],
+            'percent_change7d': [1.0, 2.0, 3.0, 4.0],
+            'percent_change30d': [1.0, 2.0, 3.0, 4.0],
+            'percent_change90d': [1.0, 2.0, 3.0, 4.0],
+            'ytd_price_change_percentage': [1.0, 2.0, 3.0, 4.0],
+            'turnover': [0.1, 0.2, 0.3, 0.4],
+        }),
+        'dmv_scores': pd.DataFrame({
+            'slug': ['bitcoin', 'ethereum', 'solana', 'dogecoin'],
+            'Durability_Score': [80.0, 70.0, 60.0, 10.0],
+            'Momentum_Score': [50.0, 40.0, 30.0, 5.0],
+            'Valuation_Score': [20.0, 10.0, 0.0, -5.0],
+        }),
+        'dmv_all': pd.DataFrame({
+            'id': [1, 2, 3, 4],
+            'slug': ['bitcoin', 'ethereum', 'solana', 'dogecoin'],
+            'name': ['Bitcoin', 'Ethereum', 'Solana', 'Dogecoin'],
+            'bullish': [10, 20, 15, 30],
+            'bearish': [5, 2, 8, 1],
+            'neutral': [20, 20, 20, 20],
+        }),
+        'ratios': pd.DataFrame({
+            'slug': ['bitcoin', 'ethereum', 'solana', 'dogecoin'],
+            'm_rat_alpha': [0.1, 0.2, 0.3, 0.4],
+            'd_rat_beta': [1.5, None, 0.5, 2.0],
+            'm_rat_omega': [1.5, 1.2, 1.8, 1.5],
+        }),
+    }
+
+
+@pytest.fixture
+def shared_snapshot(snapshot_frames):
+    """Install a preloaded snapshot and logo index as the process-wide ones."""
+    snapshot = MarketSnapshot(frames=snapshot_frames)
+    logos = LogoIndex(logos={'bitcoin': 'btc.png', 'ethereum': 'eth.png', 'solana': 'sol.png', 'dogecoin': 'doge.png'})
+    with patch.object(database, '_market_snapshot', snapshot), patch.object(database, '_logo_index', logos):
+        yield snapshot
+
+
+class TestMarketSnapshot:
+    """Test snapshot loading and persistence."""
+
+    def test_table_loads_once_per_table(self, snapshot_frames):
+        """Test that each table triggers a single database round trip."""
+        snapshot = MarketSnapshot(engine=object())
+
+        with patch('pandas.read_sql_query', return_value=snapshot_frames['dmv_scores']) as mock_read:
+            snapshot.table('dmv_scores')
+            snapshot.table('dmv_scores')
+
+        assert mock_read.call_count == 1
+        assert snapshot.query_count == 1
+
+    def test_table_returns_independent_copies(self, snapshot_frames):
+        """Test that callers cannot mutate the cached frame."""
+        snapshot = MarketSnapshot(frames=snapshot_frames)
+
+        scores = snapshot.table('dmv_scores')
+        scores['Durability_Score'] = 0.0
+
+        assert snapshot.table('dmv_scores')['Durability_Score'].iloc[0] == 80.0
+
+    def test_unknown_and_unloaded_tables(self):
+        """Test error handling for unknown tables and missing engines."""
+        snapshot = MarketSnapshot()
+
+        with pytest.raises(KeyError):
+            snapshot.table('not_a_table')
+        with pytest.raises(RuntimeError):
+            snapshot.table('ratios')
+
+    def test_save_and_load_round_trip(self, snapshot_frames, tmp_path):
+        """Test that a saved snapshot restores without querying."""
+        path = tmp_path / "snapshot.pkl"
+        MarketSnapshot(frames=snapshot_frames).save(str(path))
+
+        restored = MarketSnapshot.load(str(path))
+
+        assert all(restored.is_loaded(name) for name in snapshot_frames)
+        assert restored.query_count == 0
+        pd.testing.assert_frame_equal(restored.table('listings'), snapshot_frames['listings'])
+
+    def test_load_all_covers_every_query(self):
+        """Test that load_all issues one query per snapshot table."""
+        snapshot = MarketSnapshot(engine=object())
+
+        with patch('pandas.read_sql_query', return_value=pd.DataFrame()) as mock_read:
+            snapshot.load_all()
+
+        assert mock_read.call_count == len(SNAPSHOT_QUERIES)
+
+
+class TestSnapshotFetchers:
+    """Test that database fetchers derive their data from the snapshot."""
+
+    def test_fetch_top_coins_by_rank(self, shared_snapshot):
+        """Test rank filtering, DMV scores, logos and rounding."""
+        df = database.fetch_top_coins(2, 3)
+
+        assert list(df['slug']) == ['ethereum', 'solana']
+        assert list(df['logo']) == ['eth.png', 'sol.png']
+        assert list(df['market_cap']) == [350.0, 65.0]
+        assert df['price'].iloc[0] == 3000.46
+        assert 'Durability_Score' in df.columns
+
+    def test_fetch_trading_opportunities_long(self, shared_snapshot):
+        """Test long filters: rank < 100, beta > 1 or null, omega > 1 or null."""
+        df = database.fetch_trading_opportunities("long", 10)
+
+        # solana fails beta, dogecoin fails rank; sorted by bullish desc
+        assert list(df['slug']) == ['ethereum', 'bitcoin']
+        assert 'logo' in df.columns and 'Valuation_Score' in df.columns
+
+    def test_fetch_trading_opportunities_short_limit(self, shared_snapshot):
+        """Test short ordering by bearish and the row limit."""
+        df = database.fetch_trading_opportunities("short", 1)
+
+        assert list(df['slug']) == ['bitcoin']
+
+    def test_fetchers_do_not_hit_database(self, shared_snapshot):
+        """Test that a preloaded snapshot needs no extra queries."""
+        with patch('pandas.read_sql_query') as mock_read:
+            database.fetch_top_coins(1, 100)
+            database.fetch_trading_opportunities("long", 5)
+
+        mock_read.assert_not_called()
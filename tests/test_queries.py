@@ -0,0 +1,93 @@
+"""Tests for the parameterized query layer and latency histogram."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data.queries import (
+    LatencyHistogram, latency_histogram, prepare, query_label, run_query
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_histogram():
+    """Reset the shared histogram around each test."""
+    latency_histogram.reset()
+    yield
+    latency_histogram.reset()
+
+
+class TestLatencyHistogram:
+    """Test latency bucketing and summaries."""
+
+    def test_record_buckets_and_summary(self):
+        """Test that timings land in the right buckets with correct aggregates."""
+        histogram = LatencyHistogram(buckets=(10, 100))
+        histogram.record('q', 5)
+        histogram.record('q', 50)
+        histogram.record('q', 500)
+
+        stats = histogram.summary()['q']
+        assert stats['count'] == 3
+        assert stats['buckets'] == {'10': 1, '100': 1, '+inf': 1}
+        assert stats['max_ms'] == 500
+        assert stats['mean_ms'] == 185.0
+
+    def test_summary_is_a_copy(self):
+        """Test that callers cannot mutate recorded statistics."""
+        histogram = LatencyHistogram()
+        histogram.record('q', 1)
+        histogram.summary()['q']['buckets']['10'] = 99
+
+        assert histogram.summary()['q']['buckets']['10'] == 1
+
+    def test_concurrent_records_are_all_counted(self):
+        """Test that records from worker threads are not lost."""
+        histogram = LatencyHistogram()
+
+        def record_many(_):
+            for _ in range(2000):
+                histogram.record('q', 1)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(record_many, range(8)))
+
+        stats = histogram.summary()['q']
+        assert stats['count'] == 16000
+        assert stats['buckets']['10'] == 16000
+
+
+class TestRunQuery:
+    """Test statement preparation and execution."""
+
+    def test_prepare_reuses_statement(self):
+        """Test that identical SQL compiles to the same text() object."""
+        assert prepare("SELECT 1") is prepare("SELECT 1")
+
+    def test_query_label_uses_table_name(self):
+        """Test that unnamed queries are labelled by their source table."""
+        assert query_label('SELECT * FROM "FE_DMV_SCORES" WHERE slug = :slug') == 'FE_DMV_SCORES'
+        assert query_label('SELECT 1') == 'query'
+
+    def test_run_query_binds_params_and_records(self, sample_crypto_data):
+        """Test that params are passed through and latency is recorded."""
+        sql = 'SELECT * FROM "FE_DMV_SCORES" WHERE slug = ANY(:slugs)'
+
+        with patch('pandas.read_sql_query', return_value=sample_crypto_data) as mock_read:
+            df = run_query(None, sql, {'slugs': ['bitcoin']}, name='dmv')
+
+        args, kwargs = mock_read.call_args
+        assert args[0] is prepare(sql)
+        assert kwargs['params'] == {'slugs': ['bitcoin']}
+        assert 'slugs' in args[0].compile().params
+        pd.testing.assert_frame_equal(df, sample_crypto_data)
+        assert latency_histogram.summary()['dmv']['count'] == 1
+
+    def test_failed_query_still_recorded(self):
+        """Test that latency is recorded even when the query raises."""
+        with patch('pandas.read_sql_query', side_effect=RuntimeError("down")):
+            with pytest.raises(RuntimeError):
+                run_query(None, "SELECT * FROM t", name='broken')
+
+        assert latency_histogram.summary()['broken']['count'] == 1
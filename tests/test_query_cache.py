@@ -0,0 +1,109 @@
+"""Tests for the on-disk query result cache."""
+import os
+import time
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data.query_cache import (
+    QueryCache, apply_cache_flags, make_cache_key, normalize_sql,
+    CACHE_DISABLED_ENV_VAR, CACHE_REFRESH_ENV_VAR
+)
+from scripts.main.data.market_snapshot import MarketSnapshot
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide a cache rooted in a temporary directory."""
+    return QueryCache(cache_dir=str(tmp_path), ttl_seconds=60, enabled=True, refresh=False)
+
+
+class TestCacheKeys:
+    """Test query normalization and key hashing."""
+
+    def test_whitespace_does_not_change_key(self):
+        """Test that reformatted SQL maps to the same key."""
+        assert normalize_sql("SELECT *\n   FROM t ;") == "SELECT * FROM t"
+        assert make_cache_key("SELECT * FROM t") == make_cache_key("  SELECT *\n\tFROM t;")
+
+    def test_params_change_key(self):
+        """Test that bound parameters are part of the key."""
+        assert make_cache_key("SELECT 1", {'a': 1}) != make_cache_key("SELECT 1", {'a': 2})
+
+
+class TestQueryCache:
+    """Test cache hits, misses, TTL and overrides."""
+
+    def test_read_sql_hits_database_once(self, cache, sample_crypto_data):
+        """Test that a second read within the TTL is served from disk."""
+        with patch('pandas.read_sql_query', return_value=sample_crypto_data) as mock_read:
+            first = cache.read_sql("SELECT * FROM coins", engine=None)
+            second = cache.read_sql("SELECT * FROM coins", engine=None)
+
+        assert mock_read.call_count == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['writes'] == 1
+
+    def test_expired_entry_is_a_miss(self, cache, sample_crypto_data):
+        """Test that entries older than the TTL are ignored."""
+        cache.put("SELECT 1", sample_crypto_data)
+        for name in os.listdir(cache.cache_dir):
+            stale = time.time() - 120
+            os.utime(os.path.join(cache.cache_dir, name), (stale, stale))
+
+        assert cache.get("SELECT 1") is None
+        assert cache.misses == 1
+
+    def test_refresh_skips_reads_but_writes(self, tmp_path, sample_crypto_data):
+        """Test that refresh mode repopulates the cache."""
+        refreshing = QueryCache(cache_dir=str(tmp_path), ttl_seconds=60, enabled=True, refresh=True)
+        refreshing.put("SELECT 1", sample_crypto_data)
+
+        assert refreshing.get("SELECT 1") is None
+        assert QueryCache(cache_dir=str(tmp_path), ttl_seconds=60, enabled=True,
+                          refresh=False).get("SELECT 1") is not None
+
+    def test_disabled_cache_never_writes(self, tmp_path, sample_crypto_data):
+        """Test that a disabled cache stores nothing."""
+        disabled = QueryCache(cache_dir=str(tmp_path), enabled=False)
+
+        assert disabled.put("SELECT 1", sample_crypto_data) is False
+        assert os.listdir(tmp_path) == []
+
+    def test_clear_removes_entries(self, cache, sample_crypto_data):
+        """Test that clear deletes all cached results."""
+        cache.put("SELECT 1", sample_crypto_data)
+        cache.put("SELECT 2", sample_crypto_data)
+
+        assert cache.clear() == 2
+        assert cache.get("SELECT 1") is None
+
+    def test_snapshot_uses_cache(self, cache, sample_crypto_data):
+        """Test that a fresh snapshot is served from the cache without querying."""
+        with patch('pandas.read_sql_query', return_value=sample_crypto_data) as mock_read:
+            MarketSnapshot(engine=object(), cache=cache).table('dmv_scores')
+            second = MarketSnapshot(engine=object(), cache=cache)
+            second.table('dmv_scores')
+
+        assert mock_read.call_count == 1
+        assert second.query_count == 0
+
+
+class TestCacheFlags:
+    """Test command-line cache overrides."""
+
+    def test_flags_are_consumed_and_exported(self, monkeypatch):
+        """Test that --no-cache and --refresh set the environment and leave other args."""
+        monkeypatch.setenv(CACHE_DISABLED_ENV_VAR, "0")
+        monkeypatch.setenv(CACHE_REFRESH_ENV_VAR, "0")
+        argv = ['script.py', '--no-cache', 'bitcoin', '--refresh']
+
+        apply_cache_flags(argv)
+
+        assert argv == ['script.py', 'bitcoin']
+        assert os.environ[CACHE_DISABLED_ENV_VAR] == '1'
+        assert os.environ[CACHE_REFRESH_ENV_VAR] == '1'
+        assert QueryCache().enabled is False
+        assert QueryCache().refresh is True
@@ -0,0 +1,59 @@
+"""Tests for vectorized DMV signal aggregation."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.main.data.signals import count_signals, sentiment_labels, signal_columns
+
+
+@pytest.fixture
+def dmv_all():
+    """Provide a FE_DMV_ALL-like frame with identifiers, totals and raw signals."""
+    return pd.DataFrame({
+        'id': [1, 2, 3],
+        'slug': ['bitcoin', 'ethereum', 'solana'],
+        'name': ['Bitcoin', 'Ethereum', 'Solana'],
+        'bullish': [1, 0, 1],
+        'bearish': [1, 1, 0],
+        'neutral': [0, 1, 0],
+        'sig_a': [1, -1, 0],
+        'sig_b': [1, -1, np.nan],
+        'sig_c': [0, 1, -1],
+        'sig_d': [-1, -1, 1],
+    }, index=[10, 11, 12])
+
+
+class TestCountSignals:
+    """Test signal counting and sentiment labelling."""
+
+    def test_signal_columns_exclude_identifiers_and_totals(self, dmv_all):
+        """Test that only raw numeric signals are counted."""
+        assert signal_columns(dmv_all) == ['sig_a', 'sig_b', 'sig_c', 'sig_d']
+
+    def test_counts_and_sentiment(self, dmv_all):
+        """Test all three counts and the label from one pass, NaN ignored."""
+        result = count_signals(dmv_all)
+
+        assert result.index.tolist() == [10, 11, 12]
+        assert result['bullish_count'].tolist() == [2, 1, 1]
+        assert result['bearish_count'].tolist() == [1, 3, 1]
+        assert result['neutral_count'].tolist() == [1, 0, 1]
+        assert result['sentiment'].tolist() == ['Bullish', 'Bearish', 'Neutral']
+
+    def test_falls_back_to_precomputed_totals(self, dmv_all):
+        """Test that narrow snapshot frames use the bullish/bearish/neutral totals."""
+        narrow = dmv_all[['id', 'slug', 'name', 'bullish', 'bearish', 'neutral']]
+
+        result = count_signals(narrow)
+
+        assert result['bullish_count'].tolist() == [1, 0, 1]
+        assert result['sentiment'].tolist() == ['Neutral', 'Bearish', 'Bullish']
+
+    def test_missing_columns(self):
+        """Test that frames without signals or totals raise KeyError."""
+        with pytest.raises(KeyError):
+            count_signals(pd.DataFrame({'slug': ['bitcoin']}))
+
+    def test_sentiment_labels_treat_nan_as_neutral(self):
+        """Test that missing totals label as Neutral."""
+        assert sentiment_labels([np.nan, 3], [1, 3]).tolist() == ['Neutral', 'Neutral']
@@ -0,0 +1,120 @@
+"""Tests for the per-slide SQL layer."""
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from scripts.main.data import database
+from scripts.main.data.history_store import HistoryStore
+from scripts.main.data.logo_index import LogoIndex
+from scripts.main.data.market_snapshot import MarketSnapshot
+from scripts.main.data.queries import prepare
+from scripts.main.data.query_cache import QueryCache
+from scripts.main.data.slide_queries import SLIDE_QUERY_VERSIONS, load_slide_sql
+
+
+@pytest.fixture
+def standalone_run(tmp_path):
+    """Install an empty engine-backed snapshot and a disabled cache, as in a standalone generator run."""
+    with patch.object(database, '_market_snapshot', MarketSnapshot(engine=object())), \
+         patch.object(database, '_query_cache', QueryCache(cache_dir=str(tmp_path), enabled=False)), \
+         patch.object(database, '_history_store', HistoryStore(history_dir=str(tmp_path), enabled=True)), \
+         patch.object(database, '_logo_index', LogoIndex(logos={'bitcoin': 'btc.png'})):
+        yield
+
+
+@pytest.fixture
+def btc_slide_row():
+    """Provide the single row returned by the btc_snapshot slide query."""
+    return pd.DataFrame([{
+        'slug': 'bitcoin', 'cmc_rank': 1, 'last_updated': '2025-01-01', 'symbol': 'BTC',
+        'price': 50000.12, 'percent_change24h': 2.35, 'volume24h': 3.0e10, 'market_cap': 1.0e12,
+        'percent_change7d': 1.0, 'percent_change30d': -3.5, 'ytd_price_change_percentage': 10.0,
+        'bullish': 12, 'bearish': 2, 'neutral': 20,
+    }])
+
+
+@pytest.fixture
+def remote_tables(btc_slide_row):
+    """Route mocked reads to the slide row or the history tables by statement text."""
+    fear_greed = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-02', '2025-01-01']),
+        'fear_greed_index': [70, 40], 'sentiment': ['Greed', 'Fear'],
+    })
+    btc_ohlcv = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-02', '2025-01-01']),
+        'slug': 'bitcoin', 'name': 'Bitcoin', 'close': [51000.0, 49000.0],
+    })
+
+    def read(statement, *args, **kwargs):
+        sql = str(statement)
+        if 'FE_FEAR_GREED_CMC' in sql:
+            return fear_greed
+        if '1K_coins_ohlcv' in sql:
+            return btc_ohlcv
+        return btc_slide_row
+    return read
+
+
+class TestSlideSql:
+    """Test SQL file loading and bind parameters."""
+
+    @pytest.mark.parametrize("name", sorted(SLIDE_QUERY_VERSIONS))
+    def test_pinned_versions_exist(self, name):
+        """Test that every pinned slide query has a SQL file."""
+        assert load_slide_sql(name).strip()
+
+    def test_bind_parameters(self):
+        """Test that casts are not mistaken for bind parameters."""
+        assert set(prepare(load_slide_sql('top_coins')).compile().params) == {'start_rank', 'end_rank'}
+        assert set(prepare(load_slide_sql('btc_snapshot')).compile().params) == {'slug'}
+
+    def test_unknown_slide(self):
+        """Test that unknown slides raise KeyError."""
+        with pytest.raises(KeyError):
+            load_slide_sql('not_a_slide')
+
+
+class TestStandaloneFetchers:
+    """Test that fetchers use one slide query when the snapshot is empty."""
+
+    def test_fetch_top_coins_single_query(self, standalone_run, sample_crypto_data):
+        """Test that top coins come from one bound slide statement with logos from the index."""
+        # The v2 slide SQL returns no logo column
+        slide_rows = sample_crypto_data.drop(columns=['logo'])
+        with patch('pandas.read_sql_query', return_value=slide_rows) as mock_read:
+            df = database.fetch_top_coins(2, 24)
+
+        assert mock_read.call_count == 1
+        assert mock_read.call_args.kwargs['params'] == {'start_rank': 2, 'end_rank': 24}
+        assert len(df) == len(sample_crypto_data)
+        assert df.loc[df['slug'] == 'bitcoin', 'logo'].iloc[0] == 'btc.png'
+
+    def test_fetch_btc_snapshot_single_query(self, standalone_run, remote_tables):
+        """Test that the BTC slide is one row plus histories served by the local store."""
+        with patch('pandas.read_sql_query', side_effect=remote_tables) as mock_read:
+            database.fetch_btc_snapshot()
+            assert mock_read.call_count == 3
+            df = database.fetch_btc_snapshot()
+
+        # Second call: only the slide row; histories come from the store
+        assert mock_read.call_count == 4
+        row = df.iloc[0]
+        assert row['price'] == 50000.12
+        assert row['market_cap'] == 1.0e12
+        assert row['bullish'] == 12 and row['neutral'] == 9
+        assert row['Trend'] == "Bullish+"
+        assert row['fear_greed_index'] == 70
+        assert row['fear_greed_label'] == "Greed"
+        assert row['btc_min_price'] == 49000.0 and row['btc_max_price'] == 51000.0
+        assert row['logo'] == 'btc.png'
+        assert 'fear_greed_history_json' not in df.columns
+
+    def test_fetch_btc_snapshot_data_history(self, standalone_run, remote_tables):
+        """Test that the structured snapshot carries the chart history without parsing."""
+        with patch('pandas.read_sql_query', side_effect=remote_tables):
+            snapshot = database.fetch_btc_snapshot_data()
+
+        context = snapshot.template_context()
+        assert [point['raw_value'] for point in context['fear_greed_history']] == [40, 70]
+        assert [point['price'] for point in context['fear_greed_history']] == [49000.0, 51000.0]
+        assert context['fear_greed_label'] == "Greed"